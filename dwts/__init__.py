@@ -0,0 +1,54 @@
+"""
+Shared analysis code for MCM 2026 Problem C (Dancing with the Stars)
+
+The notebooks in notebooks/ import from this package instead of re-declaring
+loaders, feature derivations and models in every file.
+
+The names below are resolved on first access (PEP 562), so `import dwts`
+costs nothing and `from dwts import load_dwts_data` loads only dwts.data.
+Modules import scipy and sklearn inside the functions that use them, and no
+module imports matplotlib or seaborn.
+"""
+
+import importlib
+
+
+_EXPORTS = {
+    'DATA_PATH': 'dwts.data',
+    'DANCER_PATH': 'dwts.data',
+    'IG_PATH': 'dwts.data',
+    'load_dwts_data': 'dwts.data',
+    'load_instagram_followers': 'dwts.data',
+    'judge_score_columns': 'dwts.data',
+    'week_judge_columns': 'dwts.data',
+    'weekly_total_scores': 'dwts.data',
+    'average_judge_score': 'dwts.data',
+    'read_chunks': 'dwts.streaming',
+    'stream': 'dwts.streaming',
+    'unique_celebrities': 'dwts.streaming',
+    'reshape_long': 'dwts.reshape',
+    'PartnerStatsIndex': 'dwts.partners',
+    'NameIndex': 'dwts.names',
+    'join_by_name': 'dwts.names',
+    'FollowerStore': 'dwts.followers',
+    'season_followers': 'dwts.followers',
+    'popularity_metrics': 'dwts.popularity',
+    'add_popularity': 'dwts.popularity',
+    'correlate': 'dwts.correlation',
+    'significance_table': 'dwts.correlation',
+    'FeatureStore': 'dwts.feature_store',
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'dwts' has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
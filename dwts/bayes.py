@@ -0,0 +1,539 @@
+"""
+Hierarchical Bayesian fan-vote model with a vectorized HMC sampler
+
+fan_votes_estimate is a single number per contestant-week. This model gives
+a posterior over every week's fan shares instead.
+
+Model (non-centered; all z-like parameters are standard normal a priori):
+
+    popularity[c, w] = b . x_c                        log_followers (standardized) + missing flag
+                     + sigma_industry * a[industry_c]
+                     + sigma_pro      * p[partner_c]
+                     + sigma_celeb    * u[celebrity_c]  shared by a celebrity's seasons
+                     + tau * sum_{t <= w} z[c, t]       random walk over the season
+    fan_share[., w]  = softmax(popularity[., w]) over the couples dancing in week w
+
+Likelihood, one term per eliminated couple e:
+
+    percent seasons   P(e) = softmax(-kappa_percent * (judge_pct + fan_share))[e]
+    rank seasons      P(e) = softmax(kappa_rank * (judge_rank + soft_fan_rank))[e]
+                      with soft_fan_rank_i = 1 + sum_j sigmoid((share_j - share_i) / h)
+    judges' save      P(e in the bottom two) under the Plackett-Luce order
+    (season 28+)      implied by the same softmax
+
+The sampler is plain HMC with hand-written gradients, vectorized over a
+batch of chains (leading axis). Warmup tunes per-chain step sizes by dual
+averaging and a diagonal metric. Chain batches run in separate processes.
+The report includes split-R-hat and bulk effective samples per second. On
+one CPU core, 2 chains x 500 iterations over all 34 seasons (3,277
+parameters) take about two minutes.
+
+Usage:
+    python -m dwts.bayes --chains 4 --jobs 2 --warmup 500 --draws 500
+"""
+
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from dwts.combine import JUDGES_SAVE_FROM, RANK_SEASONS, segmented_rank
+from dwts.data import DATA_PATH, IG_PATH, load_dwts_data, load_instagram_followers
+from dwts.reshape import reshape_long
+from dwts.simstate import SeasonArrays
+
+
+DRAWS_PATH = Path(__file__).resolve().parent.parent / '.cache' / 'bayes' / 'fan_draws.npz'
+
+# Likelihood sharpness. Harder walls make the posterior closer to the exact
+# feasible region but slow HMC down sharply (ESS per second drops ~5x
+# going from 30 to 100 on seasons 5, 6 and 28).
+KAPPA_PERCENT = 30.0    # 0.033 of combined percent ~ one unit of log-odds
+KAPPA_RANK = 3.0        # per place of combined rank
+RANK_SOFTNESS = 0.03    # share difference over which the soft fan rank flips
+
+# Half-normal prior scales for sigma_industry, sigma_pro, sigma_celeb, tau
+SIGMA_PRIOR = np.array([1.0, 1.0, 1.0, 0.3])
+
+
+@dataclass
+class FanVoteModel:
+    """
+    Data and index arrays for the posterior; build with from_data()
+
+    Cells are the danced contestant-weeks in SeasonArrays order. Rows are
+    contestant-seasons with at least one danced week. Weeks are padded to
+    the largest week (idx == -1 outside mask).
+    """
+    keys: pd.DataFrame          # season, week, celebrity_name per cell
+    cell_row: np.ndarray
+    nonfirst: np.ndarray        # 0 for a row's first week (no random-walk step)
+    perm: np.ndarray            # cells ordered by row, then week
+    row_starts: np.ndarray      # row segments within perm
+    X: np.ndarray               # (rows, 2) covariates
+    industry: np.ndarray
+    pro: np.ndarray
+    celeb: np.ndarray
+    onehot_industry: np.ndarray
+    onehot_pro: np.ndarray
+    onehot_celeb: np.ndarray
+    idx: np.ndarray             # (weeks, max couples) cell index
+    mask: np.ndarray
+    judge_pct: np.ndarray
+    judge_rank: np.ndarray
+    uses_rank: np.ndarray       # (weeks,)
+    save: np.ndarray            # (weeks,) judges' save applies
+    elim_idx: np.ndarray        # (weeks, max eliminations) slot in the week
+    elim_valid: np.ndarray
+    labels: dict = None         # industry / pro / celeb level names
+    followers_center: float = 0.0
+    followers_scale: float = 1.0
+
+    @classmethod
+    def from_data(cls, df=None, ig_data=None, seasons=None):
+        if df is None:
+            df = load_dwts_data(DATA_PATH)
+        if ig_data is None:
+            ig_data = load_instagram_followers(IG_PATH)
+        long = reshape_long(df, report=False)
+        if seasons is not None:
+            long = long[long['season'].isin(seasons)]
+        arrays = SeasonArrays.from_long(long)
+
+        # Cell -> wide-table row
+        season_of_cell = np.repeat(np.arange(len(arrays.seasons)), np.diff(arrays.season_offsets))
+        df_row = arrays.contestant_rows[arrays.contestant_offsets[season_of_cell] + arrays.cell_contestant]
+        rows, cell_row = np.unique(df_row, return_inverse=True)
+        week_of_cell = np.repeat(arrays.group_week, np.diff(arrays.week_offsets))
+
+        perm = np.lexsort((week_of_cell, cell_row))
+        row_starts = np.flatnonzero(np.r_[True, np.diff(cell_row[perm]) != 0])
+        nonfirst = np.ones(len(cell_row))
+        nonfirst[perm[row_starts]] = 0
+
+        wide = df.iloc[rows].reset_index(drop=True)
+        followers = wide[['celebrity_name']].merge(ig_data, on='celebrity_name', how='left')['follower_count']
+        log_followers = np.log10(followers.to_numpy(np.float64) + 1)
+        missing = np.isnan(log_followers)
+        center, scale = np.nanmean(log_followers), np.nanstd(log_followers)
+        X = np.column_stack([np.where(missing, 0, (log_followers - center) / scale), missing.astype(float)])
+        industry, industries = pd.factorize(wide['celebrity_industry'])
+        pro, pros = pd.factorize(wide['ballroom_partner'])
+        celeb, celebs = pd.factorize(wide['celebrity_name'])
+
+        # Padded week matrices
+        offsets = arrays.week_offsets
+        sizes = np.diff(offsets)
+        n_weeks, width = len(sizes), sizes.max()
+        slot = np.arange(width)
+        mask = slot[None, :] < sizes[:, None]
+        idx = np.where(mask, offsets[:-1, None] + slot[None, :], -1)
+        judge = arrays.judge.astype(np.float64)
+        week_sum = np.add.reduceat(judge, offsets[:-1])
+        judge_pct = np.where(mask, judge[idx] / week_sum[:, None], 0)
+        judge_rank = np.where(mask, segmented_rank(judge, offsets)[idx], 0)
+
+        group_season = np.repeat(arrays.seasons, np.diff(arrays.season_group_offsets))
+        eliminated = np.where(mask, arrays.eliminated()[idx], False)
+        n_elim = eliminated.sum(axis=1)
+        elim_idx = np.zeros((n_weeks, max(n_elim.max(), 1)), dtype=np.int64)
+        elim_valid = np.arange(elim_idx.shape[1])[None, :] < n_elim[:, None]
+        elim_idx[elim_valid] = np.nonzero(eliminated)[1]
+
+        keys = long[long['active']].sort_values(['season', 'week', 'row'])[['season', 'week', 'celebrity_name']]
+        return cls(
+            keys=keys.reset_index(drop=True),
+            cell_row=cell_row, nonfirst=nonfirst, perm=perm, row_starts=row_starts,
+            X=X, industry=industry, pro=pro, celeb=celeb,
+            onehot_industry=np.eye(industry.max() + 1)[industry],
+            onehot_pro=np.eye(pro.max() + 1)[pro],
+            onehot_celeb=np.eye(celeb.max() + 1)[celeb],
+            idx=idx, mask=mask, judge_pct=judge_pct, judge_rank=judge_rank,
+            uses_rank=np.isin(group_season, list(RANK_SEASONS)),
+            save=group_season >= JUDGES_SAVE_FROM,
+            elim_idx=elim_idx, elim_valid=elim_valid,
+            labels={'industry': list(industries), 'pro': list(pros), 'celeb': list(celebs)},
+            followers_center=float(center), followers_scale=float(scale),
+        )
+
+    @property
+    def layout(self):
+        return [
+            ('b', self.X.shape[1]), ('log_sigma', 4), ('a', self.onehot_industry.shape[1]),
+            ('p', self.onehot_pro.shape[1]), ('u', self.onehot_celeb.shape[1]), ('z', len(self.cell_row)),
+        ]
+
+    @property
+    def n_params(self):
+        return sum(size for _, size in self.layout)
+
+    def unpack(self, q):
+        params, start = {}, 0
+        for name, size in self.layout:
+            params[name] = q[:, start:start + size]
+            start += size
+        return params
+
+    def _segcumsum(self, x):
+        """Within-row running sum over weeks, in cell order"""
+        xp = x[:, self.perm]
+        cs = np.cumsum(xp, axis=1)
+        before = np.where(self.row_starts > 0, cs[:, self.row_starts - 1], 0)
+        out = np.empty_like(x)
+        out[:, self.perm] = cs - np.repeat(before, np.diff(np.r_[self.row_starts, xp.shape[1]]), axis=1)
+        return out
+
+    def _rev_segcumsum(self, g):
+        """Adjoint of _segcumsum: within-row sum over this and later weeks"""
+        gp = g[:, self.perm]
+        lengths = np.diff(np.r_[self.row_starts, gp.shape[1]])
+        total = np.add.reduceat(gp, self.row_starts, axis=1)
+        cs = np.cumsum(gp, axis=1)
+        before = np.where(self.row_starts > 0, cs[:, self.row_starts - 1], 0)
+        out = np.empty_like(g)
+        out[:, self.perm] = np.repeat(total + before, lengths, axis=1) - cs + gp
+        return out
+
+    def popularity(self, q):
+        """Latent popularity per cell, plus the pieces the gradient reuses"""
+        P = self.unpack(q)
+        sigma = np.exp(P['log_sigma'])
+        row = (P['b'] @ self.X.T
+               + sigma[:, 0:1] * P['a'] @ self.onehot_industry.T
+               + sigma[:, 1:2] * P['p'] @ self.onehot_pro.T
+               + sigma[:, 2:3] * P['u'] @ self.onehot_celeb.T)
+        walk = self._segcumsum(P['z'] * self.nonfirst)
+        theta = row[:, self.cell_row] + sigma[:, 3:4] * walk
+        return theta, P, sigma, walk
+
+    def _week_shares(self, theta):
+        T = np.where(self.mask, theta[:, self.idx], -np.inf)
+        T = np.exp(T - T.max(axis=-1, keepdims=True))
+        return T / T.sum(axis=-1, keepdims=True)
+
+    def fan_shares(self, q):
+        """(chains, cells) fan shares"""
+        shares = self._week_shares(self.popularity(q)[0])
+        out = np.empty((len(q), len(self.cell_row)))
+        out[:, self.idx[self.mask]] = shares[:, self.mask]
+        return out
+
+    def log_prob_grad(self, q):
+        """Log posterior and its gradient for a (chains, n_params) batch"""
+        from scipy.special import expit
+
+        theta, P, sigma, walk = self.popularity(q)
+        s = self._week_shares(theta)
+        rank_week = self.uses_rank[None, :, None]
+        rank_weeks = np.flatnonzero(self.uses_rank)
+
+        # Soft fan rank (rank weeks only): pair[i, j] compares j's share against i's
+        mask = self.mask[rank_weeks]
+        pair = mask[:, :, None] & mask[:, None, :] & ~np.eye(mask.shape[1], dtype=bool)
+        s_rank = s[:, rank_weeks]
+        flip = expit((s_rank[..., None, :] - s_rank[..., :, None]) / RANK_SOFTNESS)
+        soft_rank = np.zeros_like(s)
+        soft_rank[:, rank_weeks] = 1 + np.where(pair, flip, 0).sum(axis=-1)
+
+        bad = np.where(rank_week, KAPPA_RANK * (self.judge_rank + soft_rank),
+                       -KAPPA_PERCENT * (self.judge_pct + s))
+        logits = np.where(self.mask, bad, -np.inf)
+        logits = logits - logits.max(axis=-1, keepdims=True)
+        p = np.exp(logits)
+        p /= p.sum(axis=-1, keepdims=True)
+        logp = np.where(self.mask, np.log(np.where(self.mask, p, 1)), 0)
+
+        # Plackett-Luce bottom-two pieces for the judges' save
+        one_minus = np.maximum(1 - p, 1e-12)
+        q_odds = np.where(self.mask, p / one_minus, 0)
+        q_slope = np.where(self.mask, p / one_minus ** 2, 0)
+
+        loglik = np.zeros(len(q))
+        g_logits = np.zeros_like(p)
+        weeks = np.arange(self.idx.shape[0])
+        save = self.save[None, :]
+        for k in range(self.elim_idx.shape[1]):
+            e = self.elim_idx[:, k]
+            valid = self.elim_valid[:, k][None, :]
+            onehot = np.zeros(self.mask.shape)
+            onehot[weeks, e] = 1
+            term = logp[:, weeks, e]
+            g = onehot - p
+            S = q_odds.sum(axis=-1) - q_odds[:, weeks, e]
+            slope = q_slope.sum(axis=-1) - q_slope[:, weeks, e]
+            dS = q_slope * (1 - onehot) - p * slope[..., None]
+            term = term + np.where(save, np.log1p(S), 0)
+            g = g + np.where(save[..., None], dS / (1 + S[..., None]), 0)
+            loglik += np.where(valid, term, 0).sum(axis=1)
+            g_logits += np.where(valid[..., None], g, 0)
+        g_logits = np.where(self.mask, g_logits, 0)
+
+        # Back through the combined score to the shares
+        g_s = -KAPPA_PERCENT * g_logits
+        g_rank = KAPPA_RANK * g_logits[:, rank_weeks]
+        D = np.where(pair, flip * (1 - flip) / RANK_SOFTNESS, 0)
+        g_s[:, rank_weeks] = np.einsum('cgi,cgik->cgk', g_rank, D) - g_rank * D.sum(axis=-1)
+        g_T = s * (g_s - (s * g_s).sum(axis=-1, keepdims=True))
+        g_theta = np.zeros_like(theta)
+        g_theta[:, self.idx[self.mask]] = g_T[:, self.mask]
+
+        # Back through the hierarchy
+        g_row = np.add.reduceat(g_theta[:, self.perm], self.row_starts, axis=1)
+        grads = {'b': g_row @ self.X - P['b']}
+        g_log_sigma = np.zeros_like(sigma)
+        for j, (name, onehot) in enumerate(
+                [('a', self.onehot_industry), ('p', self.onehot_pro), ('u', self.onehot_celeb)]):
+            raw = g_row @ onehot
+            grads[name] = sigma[:, j:j + 1] * raw - P[name]
+            g_log_sigma[:, j] = sigma[:, j] * (raw * P[name]).sum(axis=1)
+        g_log_sigma[:, 3] = sigma[:, 3] * (g_theta * walk).sum(axis=1)
+        grads['z'] = self.nonfirst * self._rev_segcumsum(sigma[:, 3:4] * g_theta) - P['z']
+        # Half-normal priors on the scales, with the log-transform Jacobian
+        grads['log_sigma'] = g_log_sigma - sigma ** 2 / SIGMA_PRIOR ** 2 + 1
+
+        log_prior = (-0.5 * sum((P[n] ** 2).sum(axis=1) for n in ('b', 'a', 'p', 'u', 'z'))
+                     + (-0.5 * sigma ** 2 / SIGMA_PRIOR ** 2 + P['log_sigma']).sum(axis=1))
+        grad = np.concatenate([grads[name] for name, _ in self.layout], axis=1)
+        return loglik + log_prior, grad
+
+
+def _adaptation_windows(n_warmup):
+    """Warmup iterations at which the diagonal metric is re-estimated"""
+    first, last = int(0.15 * n_warmup), int(0.9 * n_warmup)
+    return [first + (last - first) // 3, last] if last - first >= 20 else []
+
+
+def _hmc_chains(model, n_chains, n_warmup, n_draws, n_leapfrog, seed, thin=1):
+    """
+    Run a batch of HMC chains, vectorized over the chain axis
+
+    Warmup tunes a per-chain step size by dual averaging and a diagonal
+    metric (posterior variances pooled over the batch) in two windows.
+
+    Returns a dict with shares (chains, kept draws, cells) as float32,
+    scales (chains, kept draws, 4), params (chains, kept draws, every
+    parameter except the random-walk steps), acceptance rate and step sizes.
+    """
+    rng = np.random.default_rng(seed)
+    q = rng.normal(0, 0.1, (n_chains, model.n_params))
+    lp, grad = model.log_prob_grad(q)
+    inv_metric = np.ones(model.n_params)
+    windows = _adaptation_windows(n_warmup)
+    window_start = int(0.15 * n_warmup)
+    window = []
+
+    # Dual-averaging step size adaptation (Hoffman & Gelman 2014)
+    target, gamma, t0, kappa = 0.8, 0.05, 10, 0.75
+    step = np.full(n_chains, 0.02)
+    mu, h_bar, log_step_bar, t = np.log(10 * step), np.zeros(n_chains), np.zeros(n_chains), 0
+
+    n_hier = model.n_params - len(model.cell_row)
+    shares, scales, params, accepted = [], [], [], 0
+    for it in range(n_warmup + n_draws):
+        eps = (step * rng.uniform(0.8, 1.2, n_chains))[:, None]
+        p0 = rng.standard_normal(q.shape) / np.sqrt(inv_metric)
+        q_new, p_new, g_new = q.copy(), p0 + 0.5 * eps * grad, None
+        for i in range(n_leapfrog):
+            q_new = q_new + eps * inv_metric * p_new
+            with np.errstate(over='ignore', invalid='ignore'):
+                # Diverging trajectories overflow; they are rejected below
+                lp_new, g_new = model.log_prob_grad(q_new)
+            if i < n_leapfrog - 1:
+                p_new = p_new + eps * g_new
+        p_new = p_new + 0.5 * eps * g_new
+
+        kinetic = lambda m: 0.5 * (m ** 2 * inv_metric).sum(axis=1)
+        log_ratio = (lp_new - kinetic(p_new)) - (lp - kinetic(p0))
+        accept_prob = np.exp(np.minimum(np.nan_to_num(log_ratio, nan=-np.inf), 0))
+        accept = rng.uniform(size=n_chains) < accept_prob
+        q[accept], lp[accept], grad[accept] = q_new[accept], lp_new[accept], g_new[accept]
+
+        if it < n_warmup:
+            t += 1
+            h_bar = (1 - 1 / (t + t0)) * h_bar + (target - accept_prob) / (t + t0)
+            log_step = mu - np.sqrt(t) / gamma * h_bar
+            eta = t ** -kappa
+            log_step_bar = eta * log_step + (1 - eta) * log_step_bar
+            step = np.exp(log_step if it < n_warmup - 1 else log_step_bar)
+
+            if it >= window_start:
+                window.append(q.copy())
+            if it + 1 in windows:
+                # Regularized variance estimate, then restart step adaptation
+                draws = np.concatenate(window)
+                n = len(draws)
+                inv_metric = n / (n + 5) * draws.var(axis=0) + 1e-3 * 5 / (n + 5)
+                window, window_start = [], it + 1
+                mu, h_bar, log_step_bar, t = np.log(10 * step), np.zeros(n_chains), np.zeros(n_chains), 0
+        else:
+            accepted += accept.mean()
+            if (it - n_warmup) % thin == 0:
+                shares.append(model.fan_shares(q).astype(np.float32))
+                scales.append(np.exp(model.unpack(q)['log_sigma']))
+                params.append(q[:, :n_hier].copy())
+    return {
+        'shares': np.stack(shares, axis=1),
+        'scales': np.stack(scales, axis=1),
+        'params': np.stack(params, axis=1),
+        'accept_rate': accepted / max(n_draws, 1),
+        'step_size': step,
+    }
+
+
+def effective_sample_size(x):
+    """
+    Bulk ESS and split-R-hat per dimension
+
+    Args:
+        x: (chains, draws, dims)
+
+    Returns:
+        (ess, rhat), each of shape (dims,)
+    """
+    half = x.shape[1] // 2
+    x = np.concatenate([x[:, :half], x[:, half:2 * half]], axis=0).astype(np.float64)
+    m, n = x.shape[:2]
+    centered = x - x.mean(axis=1, keepdims=True)
+    f = np.fft.rfft(centered, n=2 * n, axis=1)
+    acov = np.fft.irfft(f * np.conj(f), axis=1)[:, :n] / n
+    within = (acov[:, 0] * n / (n - 1)).mean(axis=0)
+    var_plus = within * (n - 1) / n + x.mean(axis=1).var(axis=0, ddof=1)
+    var_plus = np.maximum(var_plus, 1e-300)
+    rho = 1 - (within - acov.mean(axis=0)) / var_plus
+    rho[0] = 1
+    # Geyer's initial positive sequence over autocorrelation pairs
+    even = n - n % 2
+    pairs = rho[:even:2] + rho[1:even:2]
+    positive = np.cumprod(pairs > 0, axis=0).astype(bool)
+    tau = np.maximum(-1 + 2 * np.where(positive, pairs, 0).sum(axis=0), 1 / np.log10(m * n))
+    return m * n / tau, np.sqrt(var_plus / np.maximum(within, 1e-300))
+
+
+def _chain_task(args):
+    return _hmc_chains(*args)
+
+
+def sample(model, n_chains=4, n_jobs=1, n_warmup=500, n_draws=500, n_leapfrog=32, thin=1, seed=0):
+    """
+    Sample the posterior with chains split across processes
+
+    Returns:
+        dict with shares (chains, draws, cells), scales, params, accept_rate,
+        ess, rhat (per cell share), seconds and ess_per_second (median)
+    """
+    n_jobs = max(1, min(n_jobs, n_chains))
+    batches = np.array_split(np.arange(n_chains), n_jobs)
+    seeds = np.random.SeedSequence(seed).spawn(n_jobs)
+    tasks = [(model, len(b), n_warmup, n_draws, n_leapfrog, s, thin) for b, s in zip(batches, seeds)]
+
+    start = time.perf_counter()
+    if n_jobs == 1:
+        results = [_chain_task(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            results = list(pool.map(_chain_task, tasks))
+    seconds = time.perf_counter() - start
+
+    shares = np.concatenate([r['shares'] for r in results])
+    ess, rhat = effective_sample_size(shares)
+    return {
+        'shares': shares,
+        'scales': np.concatenate([r['scales'] for r in results]),
+        'params': np.concatenate([r['params'] for r in results]),
+        'accept_rate': float(np.mean([r['accept_rate'] for r in results])),
+        'ess': ess,
+        'rhat': rhat,
+        'seconds': seconds,
+        'ess_per_second': float(np.median(ess) / seconds),
+    }
+
+
+def summarize(model, fit):
+    """Posterior mean, sd and 90% interval of every contestant-week's fan share"""
+    draws = fit['shares'].reshape(-1, fit['shares'].shape[-1])
+    out = model.keys.copy()
+    out['fan_share_mean'] = draws.mean(axis=0)
+    out['fan_share_sd'] = draws.std(axis=0)
+    out['fan_share_q05'] = np.quantile(draws, 0.05, axis=0)
+    out['fan_share_q95'] = np.quantile(draws, 0.95, axis=0)
+    out['ess'] = fit['ess']
+    out['rhat'] = fit['rhat']
+    return out
+
+
+def save_draws(model, fit, path=DRAWS_PATH):
+    """
+    Store the posterior draws needed downstream
+
+    Saves flattened share draws (float32) with their cell keys, plus the
+    hierarchy draws (b, sigma, industry / pro / celebrity effects) with
+    level labels and the log_followers standardization, which is what
+    scoring a new season needs.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    params = fit['params'].reshape(-1, fit['params'].shape[-1])
+    parts, start = {}, 0
+    for name, size in model.layout[:-1]:  # everything before the walk steps z
+        parts[name] = params[:, start:start + size]
+        start += size
+    np.savez_compressed(
+        path,
+        shares=fit['shares'].reshape(-1, fit['shares'].shape[-1]),
+        season=model.keys['season'].to_numpy(),
+        week=model.keys['week'].to_numpy(),
+        celebrity_name=model.keys['celebrity_name'].to_numpy().astype(str),
+        b=parts['b'],
+        sigma=np.exp(parts['log_sigma']),
+        industry_effect=parts['a'],
+        pro_effect=parts['p'],
+        celeb_effect=parts['u'],
+        industry=np.array(model.labels['industry'], dtype=str),
+        pro=np.array(model.labels['pro'], dtype=str),
+        celeb=np.array(model.labels['celeb'], dtype=str),
+        followers_center=model.followers_center,
+        followers_scale=model.followers_scale,
+    )
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hierarchical fan-vote posterior")
+    parser.add_argument('--chains', type=int, default=4)
+    parser.add_argument('--jobs', type=int, default=1, help="worker processes")
+    parser.add_argument('--warmup', type=int, default=500)
+    parser.add_argument('--draws', type=int, default=500)
+    parser.add_argument('--leapfrog', type=int, default=32, help="leapfrog steps per iteration")
+    parser.add_argument('--seasons', type=int, nargs='+')
+    parser.add_argument('--output', help="optional CSV path for the posterior summary")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("BAYESIAN FAN VOTE MODEL")
+    print("=" * 80)
+    model = FanVoteModel.from_data(seasons=args.seasons)
+    print(f"{len(model.cell_row)} contestant-weeks, {model.n_params} parameters")
+
+    fit = sample(model, args.chains, args.jobs, args.warmup, args.draws, args.leapfrog)
+    print(f"\nSampling time:        {fit['seconds']:.1f}s")
+    print(f"Acceptance rate:      {fit['accept_rate']:.2f}")
+    print(f"Bulk ESS (min / med): {fit['ess'].min():.0f} / {np.median(fit['ess']):.0f}")
+    print(f"ESS per second (med): {fit['ess_per_second']:.1f}")
+    print(f"Max split-R-hat:      {np.nanmax(fit['rhat']):.3f}")
+    scales = fit['scales'].reshape(-1, 4).mean(axis=0)
+    print("Posterior mean scales: " + ", ".join(
+        f"{name}={value:.2f}" for name, value in zip(['industry', 'pro', 'celeb', 'tau'], scales)))
+
+    path = save_draws(model, fit)
+    print(f"\n✓ Draws saved to: {path}")
+    if args.output:
+        summarize(model, fit).to_csv(args.output, index=False)
+        print(f"✓ Summary saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+"""
+Benchmarks for the analysis hot paths, with regression tracking
+
+Each benchmark times one path of the analysis on the real table scaled up
+`scale` times, by scale_dataset() (every season copied with jittered
+scores) or, with --source synthetic, by synthetic_dataset() (the real
+seasons plus dwts.synthetic seasons):
+
+    csv_load            load_dwts_data on the scaled CSV
+    csv_stream          one chunked pass (dwts.streaming) with the unique
+                        names, weekly totals and partner stats aggregators
+    weekly_totals       weekly_total_scores + average_judge_score
+    eda_weekly_avg      notebook 01's row-wise calculate_weekly_avg loop
+    reshape_long        wide table to contestant-weeks
+    feature_groups      every FeatureStore build function (notebook 02 features)
+    fan_vote_estimate   sequential estimates (dwts.estimation) for every season
+    combine             rank / percent combining and bottom-two selection
+    model_training      random forest on the judge+pro feature set
+
+Slow paths declare a max_scale and are skipped above it (the row-wise
+notebook loop already takes seconds at x1). A run is saved as
+JSON (timings plus python, platform and git commit), and `compare` flags
+every benchmark whose median time grew by more than 10%.
+
+Usage:
+    python -m dwts.benchmarks run --scales 1 10 100 1000
+    python -m dwts.benchmarks run --only combine csv_load --output before.json
+    python -m dwts.benchmarks run --source synthetic --scales 10 100
+    python -m dwts.benchmarks compare before.json after.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from functools import cached_property
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from dwts.data import DATA_PATH, IG_PATH, load_dwts_data, load_instagram_followers
+
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = ROOT / '.cache' / 'benchmarks'
+
+SCALES = [1, 10, 100, 1000]
+THRESHOLD = 0.10   # relative slowdown flagged by compare
+MIN_TIME = 0.5     # seconds of repeated calls per benchmark (after one warm-up)
+MIN_ROUNDS = 3
+MAX_ROUNDS = 50
+
+
+def scale_dataset(df, factor, seed=0):
+    """
+    The wide table with every season copied `factor` times
+
+    Copy k of season s becomes season s + k * max_season, and its celebrity
+    names get a " (k)" suffix so contestants stay distinct. Judge scores of
+    weeks actually danced are jittered by -1 / 0 / +1 (kept at 1 or more);
+    there is no cap at 10, so fractional scores keep their thirds and
+    quarters and bonus scores stay above 10. Zeros (eliminated) and
+    missing weeks are left as they are.
+    """
+    if factor == 1:
+        return df.copy()
+    rng = np.random.default_rng(seed)
+    score_cols = [c for c in df.columns if 'judge' in c and 'score' in c]
+    n_seasons = int(df['season'].max())
+    copies = []
+    for k in range(factor):
+        copy = df.copy()
+        if k:
+            copy['season'] = copy['season'] + k * n_seasons
+            copy['celebrity_name'] = copy['celebrity_name'] + f" ({k})"
+            scores = copy[score_cols].to_numpy(np.float64, copy=True)
+            danced = scores > 0
+            scores[danced] = np.maximum(scores[danced] + rng.integers(-1, 2, danced.sum()), 1)
+            copy[score_cols] = scores
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+def synthetic_dataset(df, factor, seed=0):
+    """
+    The wide table followed by (factor - 1) times as many dwts.synthetic seasons
+
+    Synthetic seasons are numbered after the real ones and fitted to df.
+    """
+    if factor == 1:
+        return df.copy()
+    from dwts.synthetic import SyntheticModel, generate
+
+    n_seasons = int(df['season'].max())
+    frames = [df]
+    for frame in generate(SyntheticModel.from_data(df), (factor - 1) * n_seasons, seed):
+        frames.append(frame.drop(columns='followers').assign(season=frame['season'] + n_seasons))
+    return pd.concat(frames, ignore_index=True)
+
+
+SOURCES = {'scaled': scale_dataset, 'synthetic': synthetic_dataset}
+
+
+class Workload:
+    """The scaled table and the intermediate forms benchmarks start from"""
+
+    def __init__(self, base, scale, tmpdir, source='scaled'):
+        self.base = base
+        self.scale = scale
+        self.tmpdir = Path(tmpdir)
+        self.source = source
+
+    @cached_property
+    def df(self):
+        return SOURCES[self.source](self.base, self.scale)
+
+    @cached_property
+    def csv_path(self):
+        path = self.tmpdir / f"dwts_{self.source}_x{self.scale}.csv"
+        self.df.to_csv(path, index=False)
+        return path
+
+    @cached_property
+    def long(self):
+        from dwts.reshape import reshape_long
+        return reshape_long(self.df, report=False)
+
+
+@dataclass
+class Benchmark:
+    name: str
+    setup: Callable[[Workload], Callable[[], object]]
+    max_scale: int = max(SCALES)
+
+
+BENCHMARKS = {}
+
+
+def benchmark(name, max_scale=max(SCALES)):
+    """Register a setup function returning the zero-argument call to time"""
+    def register(setup):
+        BENCHMARKS[name] = Benchmark(name, setup, max_scale)
+        return setup
+    return register
+
+
+@benchmark('csv_load')
+def _csv_load(work):
+    path = work.csv_path
+    return lambda: load_dwts_data(path)
+
+
+@benchmark('csv_stream')
+def _csv_stream(work):
+    from dwts.streaming import PartnerStats, UniqueNames, WeeklyTotals, stream
+    path = work.csv_path
+    return lambda: stream([UniqueNames(), WeeklyTotals(), PartnerStats()], path)
+
+
+@benchmark('weekly_totals')
+def _weekly_totals(work):
+    from dwts.data import average_judge_score, weekly_total_scores
+    df = work.df
+    return lambda: (weekly_total_scores(df), average_judge_score(df))
+
+
+@benchmark('eda_weekly_avg', max_scale=1)
+def _eda_weekly_avg(work):
+    df = work.df.copy()
+    score_cols = [col for col in df.columns if 'judge' in col and 'score' in col]
+
+    # Notebook 01, cell "Create aggregated score metrics"
+    def calculate_weekly_avg(row, week_num):
+        week_cols = [col for col in score_cols if f'week{week_num}_' in col]
+        scores = row[week_cols].replace(0, np.nan)
+        return scores.mean()
+
+    def run():
+        for week in range(1, 12):
+            df[f'week{week}_avg'] = df.apply(lambda row: calculate_weekly_avg(row, week), axis=1)
+    return run
+
+
+@benchmark('reshape_long')
+def _reshape_long(work):
+    from dwts.reshape import reshape_long
+    df = work.df
+    return lambda: reshape_long(df, report=False)
+
+
+@benchmark('feature_groups', max_scale=100)
+def _feature_groups(work):
+    from dwts.feature_store import FEATURE_GROUPS
+    df = work.df
+    return lambda: [group.build(df) for group in FEATURE_GROUPS.values()]
+
+
+@benchmark('fan_vote_estimate', max_scale=10)
+def _fan_vote_estimate(work):
+    from dwts.estimation import estimate_season
+    from dwts.feasibility import week_problems
+    from dwts.reshape import reshape_long
+
+    # Voting rules follow the season number, so copies reuse the real seasons' problems
+    by_season = {}
+    for problem in week_problems(reshape_long(work.base, report=False)):
+        by_season.setdefault(problem['season'], []).append(problem)
+    seasons = list(by_season.values()) * work.scale
+    return lambda: [estimate_season(problems) for problems in seasons]
+
+
+@benchmark('combine')
+def _combine(work):
+    from dwts.combine import combine_arrays, worst_in_week
+    from dwts.simstate import SeasonArrays
+    arrays = SeasonArrays.from_long(work.long)
+    fan = np.random.default_rng(0).random(len(arrays.judge))
+
+    def run():
+        scores = combine_arrays(arrays, fan)
+        return worst_in_week(scores, arrays.week_offsets, k=2)
+    return run
+
+
+@benchmark('model_training', max_scale=10)
+def _model_training(work):
+    from dwts.evaluation import FEATURE_SETS, add_pro_features, build_contestant_table, make_models, pro_dancer_stats
+    table = build_contestant_table(work.df, load_instagram_followers(IG_PATH))
+    table = add_pro_features(table, pro_dancer_stats(table)).dropna(subset=FEATURE_SETS['judge+pro'])
+    X = table[FEATURE_SETS['judge+pro']].to_numpy()
+    y = table['placement'].to_numpy()
+    return lambda: make_models()['random_forest'].fit(X, y)
+
+
+def time_call(fn, min_time=MIN_TIME, min_rounds=MIN_ROUNDS, max_rounds=MAX_ROUNDS):
+    """Per-call seconds: one warm-up, then repeat until min_time has elapsed"""
+    start = time.perf_counter()
+    fn()
+    first = time.perf_counter() - start
+    rounds = int(min(max_rounds, max(min_rounds, np.ceil(min_time / max(first, 1e-9)))))
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(scales=(1, 10), only=None, min_time=MIN_TIME, source='scaled'):
+    """
+    Time every registered benchmark at each scale
+
+    Args:
+        source: 'scaled' (scale_dataset) or 'synthetic' (synthetic_dataset)
+
+    Returns:
+        dict with run metadata and one result per (benchmark, scale)
+    """
+    names = only or list(BENCHMARKS)
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {sorted(unknown)}")
+    base = load_dwts_data(DATA_PATH)
+    results = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for scale in scales:
+            work = Workload(base, scale, tmpdir, source)
+            for name in names:
+                bench = BENCHMARKS[name]
+                if scale > bench.max_scale:
+                    continue
+                times = time_call(bench.setup(work), min_time)
+                results.append({
+                    'name': name, 'scale': scale, 'rows': len(work.df),
+                    'min': min(times), 'median': statistics.median(times),
+                    'mean': statistics.fmean(times),
+                    'stdev': statistics.stdev(times) if len(times) > 1 else 0.0,
+                    'rounds': len(times),
+                })
+                print(f"  {name:18s} x{scale:<5d} {1000 * results[-1]['median']:10.2f} ms "
+                      f"({len(times)} rounds)")
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'source': source,
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+
+def compare(old, new, threshold=THRESHOLD):
+    """
+    Median-time ratio new / old for every benchmark in both runs
+
+    Returns:
+        DataFrame with name, scale, old_ms, new_ms, ratio and status
+        ('slower' above 1 + threshold, 'faster' below 1 - threshold)
+    """
+    key = ['name', 'scale']
+    before = pd.DataFrame(old['results'])[key + ['median']]
+    after = pd.DataFrame(new['results'])[key + ['median']]
+    table = before.merge(after, on=key, suffixes=('_old', '_new'))
+    table['old_ms'] = 1000 * table.pop('median_old')
+    table['new_ms'] = 1000 * table.pop('median_new')
+    table['ratio'] = table['new_ms'] / table['old_ms']
+    table['status'] = np.select(
+        [table['ratio'] > 1 + threshold, table['ratio'] < 1 - threshold], ['slower', 'faster'], 'same')
+    return table.sort_values(key, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the analysis hot paths")
+    commands = parser.add_subparsers(dest='command', required=True)
+    run = commands.add_parser('run', help="time the benchmarks and save JSON")
+    run.add_argument('--scales', type=int, nargs='+', default=[1, 10])
+    run.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS))
+    run.add_argument('--min-time', type=float, default=MIN_TIME, help="seconds per benchmark")
+    run.add_argument('--source', choices=sorted(SOURCES), default='scaled',
+                     help="copies of the real seasons or dwts.synthetic seasons")
+    run.add_argument('--output', help=f"JSON path (default: {RESULTS_DIR}/<timestamp>.json)")
+    cmp = commands.add_parser('compare', help="flag slowdowns between two runs")
+    cmp.add_argument('old')
+    cmp.add_argument('new')
+    cmp.add_argument('--threshold', type=float, default=THRESHOLD)
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        print("=" * 80)
+        print(f"BENCHMARKS ({args.source}, scales {', '.join(f'x{s}' for s in args.scales)})")
+        print("=" * 80)
+        report = run_benchmarks(args.scales, args.only, args.min_time, args.source)
+        output = Path(args.output) if args.output else (
+            RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}.json")
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2))
+        print(f"\n✓ Results saved to: {output}")
+        return
+
+    old = json.loads(Path(args.old).read_text())
+    new = json.loads(Path(args.new).read_text())
+    if old.get('source', 'scaled') != new.get('source', 'scaled'):
+        print(f"⚠ Runs use different data: {old.get('source', 'scaled')} vs {new.get('source', 'scaled')}")
+    table = compare(old, new, args.threshold)
+    print("=" * 80)
+    print(f"BENCHMARK COMPARISON ({old.get('commit')} -> {new.get('commit')}, "
+          f"threshold {args.threshold:.0%})")
+    print("=" * 80)
+    print(table.round(3).to_string(index=False))
+    slower = table[table['status'] == 'slower']
+    if len(slower):
+        print(f"\n✗ {len(slower)} benchmark(s) slower by more than {args.threshold:.0%}")
+        sys.exit(1)
+    print("\n✓ No slowdowns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+Controversy scan over every contestant-week
+
+STEP_11_QUICKSTART.md hand-picks Jerry Rice, Billy Ray Cyrus, Bristol Palin
+and Bobby Bones. This scan scores every contestant in one vectorized pass
+over SeasonArrays and a set of fan-share draws:
+
+    judge_rank / fan_rank   within-week ranks (1 = best); fan rank from
+                            the posterior mean share
+    rank_gap                judge_rank - fan_rank (> 0: fans rate the couple
+                            above the judges)
+    weeks_survived_last     weeks with an elimination in which the couple
+                            had the judges' lowest score but stayed
+    controversy_score       sum over weeks survived (with an elimination
+                            that week) of how low the judges ranked the
+                            couple, 0 = judges' best, 1 = judges' worst
+    p_survive_<rule>        share of fan draws in which the couple would
+                            also have survived every week they actually
+                            survived under rank / percent / judges' save,
+                            holding each week's field as it really was
+
+Fan draws come from the dwts.bayes posterior, which has to be run first
+(or pass draws to scan() directly).
+
+Usage:
+    python -m dwts.controversy --top 25 --output controversy.csv
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from dwts.bayes import DRAWS_PATH
+from dwts.combine import (
+    JUDGES_SAVE_FROM, RANK_SEASONS, combine, judges_save, segment_ids, segmented_rank, worst_in_week,
+)
+from dwts.data import DATA_PATH, load_dwts_data
+from dwts.reshape import reshape_long
+from dwts.simstate import SeasonArrays
+
+
+RULES = ['rank', 'percent', 'judges_save']
+
+# Cases analyzed by hand in STEP_11_QUICKSTART.md
+KNOWN_CASES = ['Jerry Rice', 'Billy Ray Cyrus', 'Bristol Palin', 'Bobby Bones']
+
+
+def load_fan_draws(keys, path=DRAWS_PATH):
+    """
+    (draws, cells) fan shares aligned with keys (season, week, celebrity_name)
+
+    Draws come from the dwts.bayes posterior. Sequential point estimates are
+    not a substitute: they sit on the boundary of each week's feasible
+    region, where the eliminated couple ties the lowest survivor, so one
+    draw of them makes p_survive 0 for every couple in such a tie.
+
+    Raises:
+        FileNotFoundError: no posterior, or one that misses some of keys
+    """
+    if not path.exists():
+        raise FileNotFoundError(f"No posterior draws at {path}; run `python -m dwts.bayes` first")
+    posterior = np.load(path)
+    source = pd.DataFrame({
+        'season': posterior['season'], 'week': posterior['week'],
+        'celebrity_name': posterior['celebrity_name'], 'col': np.arange(len(posterior['season'])),
+    })
+    cols = keys.merge(source, on=['season', 'week', 'celebrity_name'], how='left')['col']
+    if cols.isna().any():
+        raise FileNotFoundError(
+            f"Posterior at {path} has no draws for {int(cols.isna().sum())} contestant-weeks; "
+            "re-run `python -m dwts.bayes`")
+    return posterior['shares'][:, cols.to_numpy(np.int64)]
+
+
+def eliminated_under(judge, fan, offsets, rule, n_out, seed=0):
+    """
+    (draws, cells) bool: who a rule would send home each week
+
+    Args:
+        judge: (cells,) judge totals
+        fan: (draws, cells) fan shares
+        offsets: week boundaries
+        rule: 'rank', 'percent' or 'judges_save'
+        n_out: (weeks,) couples actually eliminated that week
+        seed: seed for the coin flips of combine.judges_save()
+    """
+    n_weeks = len(offsets) - 1
+    scores = combine(judge, fan, offsets, np.full(n_weeks, rule != 'percent'))
+    k = max(int(n_out.max()), 2)
+    bottom = worst_in_week(scores, offsets, k=k)
+    if bottom.ndim == 2:
+        bottom = bottom[None]
+
+    out = np.zeros(np.atleast_2d(fan).shape, dtype=bool)
+    draws = np.arange(out.shape[0])[:, None]
+    for j in range(k):
+        cell = bottom[:, :, j]
+        hit = (j < n_out)[None, :] & (cell >= 0)
+        if rule == 'judges_save':
+            # Single eliminations are decided by the judges below
+            hit &= (n_out != 1)[None, :]
+        out[np.broadcast_to(draws, cell.shape)[hit], cell[hit]] = True
+
+    if rule == 'judges_save':
+        a, b = bottom[:, :, 0], bottom[:, :, 1]
+        single = (n_out == 1)[None, :] & (a >= 0) & (b >= 0)
+        pick = judges_save(judge, np.atleast_2d(fan), np.maximum(a, 0), np.maximum(b, 0),
+                           np.random.default_rng(seed))
+        out[np.broadcast_to(draws, pick.shape)[single], pick[single]] = True
+    return out
+
+
+def scan(df=None, draws=None, seed=0):
+    """
+    Controversy table for every contestant of every season
+
+    Args:
+        df: wide DWTS table (loaded from DATA_PATH if None)
+        draws: optional (draws, cells) fan shares in SeasonArrays cell order
+        seed: seed for the judges' save coin flips (see combine.judges_save)
+
+    Returns:
+        DataFrame, one row per contestant-season, most controversial first
+    """
+    if df is None:
+        df = load_dwts_data(DATA_PATH)
+    long = reshape_long(df, report=False)
+    arrays = SeasonArrays.from_long(long)
+    cells = long[long['active']].sort_values(['season', 'week', 'row']).reset_index(drop=True)
+    if draws is None:
+        draws = load_fan_draws(cells[['season', 'week', 'celebrity_name']])
+    draws = np.atleast_2d(draws)
+
+    offsets = arrays.week_offsets
+    group = segment_ids(offsets)
+    size = np.diff(offsets)[group]
+    judge = arrays.judge.astype(np.float64)
+    eliminated = arrays.eliminated()
+    withdrew = cells['withdrew_this_week'].to_numpy()
+    n_out = np.add.reduceat(eliminated.astype(int), offsets[:-1])
+
+    judge_rank = segmented_rank(judge, offsets)
+    fan_rank = segmented_rank(draws.mean(axis=0), offsets)
+    judge_last = judge_rank == np.maximum.reduceat(judge_rank, offsets[:-1])[group]
+    survived = ~eliminated & ~withdrew & (n_out[group] > 0)
+    badness = np.where(size > 1, (judge_rank - 1) / np.maximum(size - 1, 1), 0)
+
+    frame = pd.DataFrame({
+        'row': cells['row'], 'judge_rank': judge_rank, 'fan_rank': fan_rank,
+        'rank_gap': judge_rank - fan_rank, 'judge_last': judge_last,
+        'survived_last': judge_last & survived, 'survived_badness': np.where(survived, badness, 0),
+    })
+    table = frame.groupby('row').agg(
+        weeks_danced=('judge_rank', 'size'),
+        mean_judge_rank=('judge_rank', 'mean'),
+        mean_fan_rank=('fan_rank', 'mean'),
+        mean_rank_gap=('rank_gap', 'mean'),
+        weeks_last_by_judges=('judge_last', 'sum'),
+        weeks_survived_last=('survived_last', 'sum'),
+        controversy_score=('survived_badness', 'sum'),
+    )
+
+    # Joint survival over the weeks each couple really survived, per draw
+    rows, row_of_cell = np.unique(cells['row'], return_inverse=True)
+    n_draws = draws.shape[0]
+    flat = (np.arange(n_draws)[:, None] * len(rows) + row_of_cell[None, :])[:, survived].ravel()
+    for rule in RULES:
+        out = eliminated_under(judge, draws, offsets, rule, n_out, seed)
+        hits = np.bincount(flat, weights=out[:, survived].ravel(), minlength=n_draws * len(rows))
+        table[f'p_survive_{rule}'] = pd.Series(
+            (hits.reshape(n_draws, len(rows)) == 0).mean(axis=0), index=rows)
+
+    meta = df[['celebrity_name', 'ballroom_partner', 'season', 'placement']].iloc[table.index]
+    table = pd.concat([meta.set_index(table.index), table], axis=1)
+    season = table['season']
+    table['actual_rule'] = np.where(
+        season >= JUDGES_SAVE_FROM, 'judges_save', np.where(season.isin(list(RANK_SEASONS)), 'rank', 'percent'))
+    table = table.sort_values(['controversy_score', 'weeks_survived_last'], ascending=False)
+    return table.reset_index(drop=True).round(3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank every contestant by judge/fan disagreement")
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--output', help="optional CSV path for the full table")
+    args = parser.parse_args()
+
+    df = load_dwts_data(DATA_PATH)
+    long = reshape_long(df, report=False)
+    keys = long[long['active']].sort_values(['season', 'week', 'row'])[['season', 'week', 'celebrity_name']]
+    try:
+        draws = load_fan_draws(keys.reset_index(drop=True))
+    except FileNotFoundError as e:
+        print(f"✗ {e}")
+        return
+
+    print("=" * 80)
+    print(f"CONTROVERSY SCAN (posterior fan shares, {draws.shape[0]} draws)")
+    print("=" * 80)
+    table = scan(df, draws)
+    columns = ['season', 'celebrity_name', 'placement', 'weeks_survived_last', 'mean_rank_gap',
+               'controversy_score', 'p_survive_rank', 'p_survive_percent', 'p_survive_judges_save']
+    print(table[columns].head(args.top).to_string())
+
+    print("\nHand-picked cases from STEP_11_QUICKSTART.md:")
+    for name in KNOWN_CASES:
+        hit = table.index[table['celebrity_name'] == name]
+        if len(hit):
+            print(f"  {name:18s} ranked {hit[0] + 1} of {len(table)}")
+
+    if args.output:
+        table.to_csv(args.output, index=False)
+        print(f"\n✓ Controversy table saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
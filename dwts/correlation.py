@@ -0,0 +1,66 @@
+"""
+Correlation reporting shared by notebooks 04 and 05
+
+Every "X vs placement" cell computes Pearson and Spearman correlations,
+calls the result significant at p < 0.05 and labels |r| as an effect size.
+scipy.stats is imported on first use only.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+
+ALPHA = 0.05
+
+# |r| thresholds for small / medium / large effects (Cohen)
+EFFECT_SIZES = [(0.1, 'Negligible'), (0.3, 'Small'), (0.5, 'Medium'), (np.inf, 'Large')]
+
+
+class Correlation(NamedTuple):
+    pearson_r: float
+    pearson_p: float
+    spearman_r: float
+    spearman_p: float
+    n: int
+
+
+def correlate(x, y):
+    """Pearson and Spearman correlation over the pairs where both are present"""
+    from scipy.stats import pearsonr, spearmanr
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    keep = ~(np.isnan(x) | np.isnan(y))
+    pearson_r, pearson_p = pearsonr(x[keep], y[keep])
+    spearman_r, spearman_p = spearmanr(x[keep], y[keep])
+    return Correlation(float(pearson_r), float(pearson_p), float(spearman_r), float(spearman_p),
+                       int(keep.sum()))
+
+
+def effect_size_label(r):
+    """Negligible / Small / Medium / Large for a correlation coefficient"""
+    return next(label for limit, label in EFFECT_SIZES if abs(r) < limit)
+
+
+def significance_table(df, features, target='placement', alpha=ALPHA):
+    """
+    Pearson test of each feature against the target
+
+    Returns:
+        DataFrame with Feature, Correlation, P-Value, Significant,
+        Effect Size and Abs Corr, strongest correlation first
+    """
+    rows = []
+    for feature in features:
+        result = correlate(df[feature], df[target])
+        rows.append({
+            'Feature': feature,
+            'Correlation': result.pearson_r,
+            'P-Value': result.pearson_p,
+            'Significant': "✓ SIGNIFICANT" if result.pearson_p < alpha else "✗ NOT SIG",
+            'Effect Size': effect_size_label(result.pearson_r),
+            'Abs Corr': abs(result.pearson_r),
+        })
+    return pd.DataFrame(rows).sort_values('Abs Corr', ascending=False)
@@ -0,0 +1,96 @@
+"""
+Data loading helpers shared by the notebooks and analysis modules
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+DATA_DIR = Path(__file__).resolve().parent.parent / 'data'
+DATA_PATH = DATA_DIR / '2026_MCM_Problem_C_Data.csv'
+DANCER_PATH = DATA_DIR / 'pro_dancer_analysis.csv'
+IG_PATH = DATA_DIR / 'celebrityIG - Sheet1.csv'
+
+NA_VALUES = ['N/A', 'n/a', '']
+N_WEEKS = 11
+N_JUDGES = 4
+
+# US premiere date of each season, for point-in-time joins (dwts.followers)
+SEASON_PREMIERES = {
+    1: '2005-06-01', 2: '2006-01-05', 3: '2006-09-12', 4: '2007-03-19',
+    5: '2007-09-24', 6: '2008-03-17', 7: '2008-09-22', 8: '2009-03-09',
+    9: '2009-09-21', 10: '2010-03-22', 11: '2010-09-20', 12: '2011-03-21',
+    13: '2011-09-19', 14: '2012-03-19', 15: '2012-09-24', 16: '2013-03-18',
+    17: '2013-09-16', 18: '2014-03-17', 19: '2014-09-15', 20: '2015-03-16',
+    21: '2015-09-14', 22: '2016-03-21', 23: '2016-09-12', 24: '2017-03-20',
+    25: '2017-09-18', 26: '2018-04-30', 27: '2018-09-24', 28: '2019-09-16',
+    29: '2020-09-14', 30: '2021-09-20', 31: '2022-09-19', 32: '2023-09-26',
+    33: '2024-09-17', 34: '2025-09-16',
+}
+
+
+def load_dwts_data(path=DATA_PATH):
+    """
+    Load the wide DWTS table (one row per contestant-season)
+
+    Judge score columns are parsed as floats with N/A as NaN. Celebrity names
+    are stripped, since a few source rows carry trailing whitespace.
+    """
+    df = pd.read_csv(path, na_values=NA_VALUES)
+    df['celebrity_name'] = df['celebrity_name'].str.strip()
+    return df
+
+
+def judge_score_columns(df):
+    """Return the weekN_judgeM_score columns in file order"""
+    return [col for col in df.columns if 'judge' in col.lower() and 'score' in col.lower()]
+
+
+def week_judge_columns(df):
+    """
+    Map week number to its judge score columns
+
+    Example: {1: ['week1_judge1_score', ..., 'week1_judge4_score'], 2: [...]}
+    """
+    week_cols = {}
+    for col in judge_score_columns(df):
+        week = int(col.split('_')[0].replace('week', ''))
+        week_cols.setdefault(week, []).append(col)
+    return week_cols
+
+
+def weekly_total_scores(df):
+    """
+    Total judge score per contestant-week as a DataFrame of week{N}_total_score
+
+    Weeks the show did not run stay NaN (rather than summing to 0), and weeks
+    after elimination stay 0, so callers can tell the two apart.
+    """
+    totals = {}
+    for week, cols in sorted(week_judge_columns(df).items()):
+        totals[f'week{week}_total_score'] = df[cols].sum(axis=1, min_count=1)
+    return pd.DataFrame(totals, index=df.index)
+
+
+def average_judge_score(df):
+    """Mean weekly total judge score over the weeks a contestant actually danced"""
+    totals = weekly_total_scores(df)
+    return totals.where(totals > 0).mean(axis=1)
+
+
+def load_instagram_followers(path=IG_PATH, per_season=False):
+    """
+    Load the manually collected follower sheet as (celebrity_name, follower_count)
+
+    The sheet is row-aligned with the main table, so returning celebrities
+    appear once per season. Only the first row per name is kept, unless
+    per_season is set (for dwts.names.join_by_name, which matches repeated
+    names to seasons in order).
+    """
+    ig_data = pd.read_csv(path)
+    ig_data['celebrity_name'] = ig_data['celebrity_name'].str.strip()
+    ig_data['follower_count'] = ig_data['followers'].astype(str).str.replace(',', '').astype(np.int64)
+    ig_data = ig_data[['celebrity_name', 'follower_count']]
+    return ig_data if per_season else ig_data.drop_duplicates('celebrity_name')
@@ -0,0 +1,290 @@
+"""
+Sequential fan-share estimator with per-week dependency tracking
+
+Each week's fan shares are the point closest to the previous week's shares
+(renormalized over the couples still dancing; uniform in week 1) that
+still reproduces the observed outcome:
+
+    - percent seasons: a small QP, min ||f - prior||^2 subject to the
+      feasibility.percent_constraints rows, sum(f) = 1, f >= 0
+    - rank seasons: the fan ordering closest to the prior's ordering is
+      chosen with the feasibility.rank_constraints ILP, then the same QP is
+      solved with f constrained to that ordering
+
+Both keep the couples of every implied pair feasibility.TIE_MARGIN apart,
+so an estimate never lands on a tie the outcome rules out.
+
+Week w therefore depends on weeks 1..w of its season and nothing else.
+EstimateStore hashes the inputs of every (season, week), and after an edit
+to the data file re-estimates only the edited seasons, from the first
+changed week onward, with each QP warm-started from the stored solution.
+Each season is its own CSV file, so unaffected seasons stay byte for byte
+identical.
+
+Usage:
+    python -m dwts.estimation --jobs 4
+    python -m dwts.estimation --export fan_votes_sequential.csv   (with fan_votes_min / max)
+"""
+
+import argparse
+import hashlib
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from dwts.combine import segmented_rank
+from dwts.data import DATA_PATH, load_dwts_data
+from dwts.feasibility import (
+    TIE_MARGIN, add_intervals, fan_vote_bounds, percent_constraints, rank_constraints, week_problems,
+)
+from dwts.reshape import reshape_long
+
+
+ESTIMATE_DIR = Path(__file__).resolve().parent.parent / '.cache' / 'estimates'
+
+# Bump when the estimator changes so every stored season is recomputed
+ESTIMATOR_VERSION = 2
+
+ESTIMATE_COLUMNS = ['season', 'week', 'celebrity_name', 'fan_share', 'fan_votes_estimate', 'status']
+
+
+def week_hash(problem):
+    """Hash of everything a week's estimate reads from the data"""
+    payload = json.dumps([
+        problem['rule'], problem['judges_save'], problem['names'],
+        problem['judge'].tolist(), problem['eliminated'],
+        [(int(w), int(b)) for w, b in problem['pairs']],
+    ])
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+def _closest_shares(prior, x0, A_ub=None, b_ub=None):
+    """min ||f - prior||^2 s.t. A_ub f <= b_ub, sum(f) = 1, 0 <= f <= 1"""
+    from scipy.optimize import minimize
+
+    constraints = [{'type': 'eq', 'fun': lambda f: f.sum() - 1, 'jac': lambda f: np.ones_like(f)}]
+    if A_ub is not None and len(A_ub):
+        constraints.append({'type': 'ineq', 'fun': lambda f: b_ub - A_ub @ f, 'jac': lambda f: -A_ub})
+    res = minimize(
+        lambda f: np.sum((f - prior) ** 2), x0, jac=lambda f: 2 * (f - prior),
+        bounds=[(0, 1)] * len(prior), constraints=constraints, method='SLSQP',
+        options={'ftol': 1e-12, 'maxiter': 500})
+    return np.clip(res.x, 0, 1), 'ok' if res.success else 'not_converged'
+
+
+def estimate_week(problem, prior, x0=None):
+    """
+    Fan shares for one week
+
+    Args:
+        problem: one entry of feasibility.week_problems()
+        prior: shares the estimate is pulled toward (sums to 1)
+        x0: warm start for the QP (defaults to prior)
+
+    Returns:
+        (shares, status)
+    """
+    from scipy.optimize import Bounds, milp
+
+    judge, pairs = problem['judge'], problem['pairs']
+    n = len(judge)
+    x0 = prior if x0 is None else x0
+    if not pairs:
+        return prior.copy(), 'unconstrained'
+
+    if problem['rule'] == 'percent':
+        A, b = percent_constraints(judge, pairs)
+        return _closest_shares(prior, x0, A, b)
+
+    # Ordering closest to the prior's ordering, then shares respecting it
+    constraints, n_vars = rank_constraints(judge, pairs, problem['eliminated'], problem['judges_save'])
+    prior_rank = segmented_rank(prior, [0, n])
+    cost = np.zeros(n_vars)
+    cost[:n * n] = np.abs(np.arange(1, n + 1)[None, :] - prior_rank[:, None]).ravel()
+    res = milp(cost, constraints=constraints, integrality=np.ones(n_vars), bounds=Bounds(0, 1))
+    if res.status != 0:
+        return prior.copy(), 'infeasible'
+    fan_rank = res.x[:n * n].reshape(n, n).argmax(axis=1)
+    order = np.argsort(fan_rank)
+    A = np.zeros((n - 1, n))
+    A[np.arange(n - 1), order[1:]] = 1
+    A[np.arange(n - 1), order[:-1]] = -1
+    return _closest_shares(prior, x0, A, np.full(n - 1, -TIE_MARGIN))
+
+
+def estimate_season(problems, previous=None, start=0):
+    """
+    Estimate one season's weeks in order
+
+    Args:
+        problems: the season's week_problems() entries, in week order
+        previous: stored estimates for the season (ESTIMATE_COLUMNS), used as
+            the starting state before `start` and as warm starts after it
+        start: index of the first week to re-estimate
+
+    Returns:
+        DataFrame with ESTIMATE_COLUMNS for every week
+    """
+    old = {}
+    if previous is not None:
+        for week, frame in previous.groupby('week'):
+            old[week] = frame.set_index('celebrity_name')['fan_share']
+
+    frames, last = [], None
+    for k, problem in enumerate(problems):
+        week, names = problem['week'], problem['names']
+        if k < start:
+            shares = old[week].reindex(names).to_numpy()
+            status = previous.loc[previous['week'] == week, 'status'].tolist()
+        else:
+            if last is None:
+                prior = np.full(len(names), 1 / len(names))
+            else:
+                prior = last.reindex(names).fillna(0).to_numpy()
+                prior = prior / prior.sum() if prior.sum() > 0 else np.full(len(names), 1 / len(names))
+            warm = old[week].reindex(names).to_numpy() if week in old else None
+            if warm is not None and np.isnan(warm).any():
+                warm = None
+            shares, week_status = estimate_week(problem, prior, warm)
+            status = [week_status] * len(names)
+        last = pd.Series(shares, index=names)
+        frames.append(pd.DataFrame({
+            'season': problem['season'], 'week': week, 'celebrity_name': names,
+            'fan_share': shares, 'fan_votes_estimate': shares * 100, 'status': status,
+        }))
+    return pd.concat(frames, ignore_index=True)[ESTIMATE_COLUMNS]
+
+
+def _estimate_task(args):
+    problems, previous, start = args
+    return estimate_season(problems, previous, start)
+
+
+class EstimateStore:
+    """
+    Per-season estimate files plus a manifest of week input hashes
+
+    Layout:
+        <root>/season_<NN>.csv
+        <root>/manifest.json   (estimator version, per-season week hashes)
+    """
+
+    def __init__(self, root=ESTIMATE_DIR):
+        self.root = Path(root)
+
+    def _path(self, season):
+        return self.root / f"season_{season:02d}.csv"
+
+    def _manifest(self):
+        path = self.root / 'manifest.json'
+        manifest = json.loads(path.read_text()) if path.exists() else {}
+        if manifest.get('version') != ESTIMATOR_VERSION:
+            return {'version': ESTIMATOR_VERSION, 'seasons': {}}
+        return manifest
+
+    def plan(self, problems_by_season):
+        """
+        Season -> index of the first week to re-estimate (absent = reuse)
+
+        A season is redone from its first week whose hash differs from the
+        stored one (or from the first new week if weeks were added).
+        """
+        stored = self._manifest()['seasons']
+        todo = {}
+        for season, problems in problems_by_season.items():
+            hashes = [week_hash(p) for p in problems]
+            old = stored.get(str(season), {}).get('weeks')
+            if old is None or not self._path(season).exists():
+                todo[season] = 0
+                continue
+            changed = [k for k, (a, b) in enumerate(zip(hashes, old)) if a != b]
+            if changed:
+                todo[season] = changed[0]
+            elif len(hashes) != len(old):
+                todo[season] = min(len(hashes), len(old))
+        return todo
+
+    def update(self, df=None, n_jobs=1):
+        """
+        Bring the stored estimates in line with the data
+
+        Args:
+            df: wide DWTS table (loaded from DATA_PATH if None)
+            n_jobs: worker processes for the seasons that need work
+
+        Returns:
+            dict season -> first re-estimated week number (seasons reused
+            unchanged are not listed)
+        """
+        if df is None:
+            df = load_dwts_data(DATA_PATH)
+        problems_by_season = {}
+        for problem in week_problems(reshape_long(df, report=False)):
+            problems_by_season.setdefault(problem['season'], []).append(problem)
+
+        todo = self.plan(problems_by_season)
+        tasks = []
+        for season, start in todo.items():
+            path = self._path(season)
+            previous = pd.read_csv(path) if path.exists() else None
+            tasks.append((problems_by_season[season], previous, start))
+
+        if n_jobs == 1:
+            results = [_estimate_task(t) for t in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+                results = list(pool.map(_estimate_task, tasks))
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        manifest = self._manifest()
+        for season, frame in zip(todo, results):
+            frame.to_csv(self._path(season), index=False, float_format='%.10g')
+        for season, problems in problems_by_season.items():
+            manifest['seasons'][str(season)] = {'weeks': [week_hash(p) for p in problems]}
+        for stale in set(manifest['seasons']) - {str(s) for s in problems_by_season}:
+            del manifest['seasons'][stale]
+            self._path(int(stale)).unlink(missing_ok=True)
+        (self.root / 'manifest.json').write_text(json.dumps(manifest, indent=2))
+        return {season: problems_by_season[season][start]['week'] for season, start in todo.items()}
+
+    def load(self, seasons=None):
+        """Stored estimates for all (or some) seasons as one table"""
+        seasons = seasons or sorted(int(s) for s in self._manifest()['seasons'])
+        return pd.concat([pd.read_csv(self._path(s)) for s in seasons], ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental sequential fan-share estimates")
+    parser.add_argument('--data', default=str(DATA_PATH), help="wide DWTS CSV")
+    parser.add_argument('--jobs', type=int, default=1, help="worker processes")
+    parser.add_argument('--export', help="optional CSV path for all estimates")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("SEQUENTIAL FAN VOTE ESTIMATES")
+    print("=" * 80)
+    store = EstimateStore()
+    redone = store.update(load_dwts_data(args.data), n_jobs=args.jobs)
+    if redone:
+        for season, week in sorted(redone.items()):
+            print(f"  Season {season:2d}: re-estimated from week {week}")
+    else:
+        print("  All seasons up to date")
+
+    estimates = store.load()
+    print(f"\n{len(estimates)} contestant-weeks, status counts:")
+    print(estimates['status'].value_counts().to_string())
+
+    if args.export:
+        # The feasible interval goes next to each point estimate
+        long = reshape_long(load_dwts_data(args.data), report=False)
+        estimates = add_intervals(estimates, fan_vote_bounds(long, n_jobs=args.jobs))
+        estimates.to_csv(args.export, index=False)
+        print(f"\n✓ Estimates saved to: {args.export}")
+
+
+if __name__ == "__main__":
+    main()
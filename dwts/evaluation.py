@@ -0,0 +1,346 @@
+"""
+Season-grouped cross-validation for placement prediction
+
+The notebooks score every model on the rows it was trained on
+(rf_model.score(X, y)), which says little about how well placement can be
+predicted for a season the model has never seen. This module rebuilds the
+notebook 04/05 feature columns per fold, with pro-dancer statistics computed
+from the training seasons only, and scores each candidate model on held-out
+seasons.
+
+Usage:
+    python -m dwts.evaluation --scheme loso --jobs 4
+    python -m dwts.evaluation --scheme group_kfold --splits 5
+"""
+
+import argparse
+import hashlib
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from dwts.data import (
+    DATA_PATH, IG_PATH, average_judge_score, load_dwts_data, load_instagram_followers,
+)
+
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / '.cache' / 'cv'
+
+# Bump when the fold feature construction changes so stale caches are ignored
+FEATURE_VERSION = 2
+
+PRO_FEATURES = ['pro_dancer_quality', 'appearances', 'win_rate', 'top3_rate']
+
+FEATURE_SETS = {
+    'judge': ['judge_score'],
+    'judge+pro': ['judge_score'] + PRO_FEATURES,
+    'judge+pro+popularity': ['judge_score'] + PRO_FEATURES + ['celeb_appearances', 'log_followers'],
+}
+
+
+class OrdinalRegressor:
+    """
+    Cumulative-threshold ordinal model for placements
+
+    Fits one logistic classifier per threshold k for P(placement > k) and
+    predicts the expected placement. Placement is ordered but not interval
+    scaled, which the regressors above ignore.
+
+    Implements get_params / set_params itself rather than subclassing
+    sklearn's BaseEstimator, so importing this module does not load sklearn.
+    """
+
+    def __init__(self, C=1.0):
+        self.C = C
+
+    def get_params(self, deep=True):
+        return {'C': self.C}
+
+    def set_params(self, **params):
+        for key, value in params.items():
+            setattr(self, key, value)
+        return self
+
+    def fit(self, X, y):
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.preprocessing import StandardScaler
+
+        y = np.asarray(y)
+        self.levels_ = np.unique(y)
+        self.scaler_ = StandardScaler().fit(X)
+        Xs = self.scaler_.transform(X)
+        self.models_ = []
+        for k in self.levels_[:-1]:
+            target = (y > k).astype(int)
+            if target.min() == target.max():
+                # Every training row falls on one side of this threshold
+                self.models_.append(float(target[0]))
+                continue
+            model = LogisticRegression(C=self.C, max_iter=1000)
+            self.models_.append(model.fit(Xs, target))
+        return self
+
+    def predict(self, X):
+        Xs = self.scaler_.transform(X)
+        exceed = np.column_stack([
+            np.full(len(Xs), m) if isinstance(m, float) else m.predict_proba(Xs)[:, 1]
+            for m in self.models_
+        ])
+        # P(y > k) must not increase with k
+        exceed = np.minimum.accumulate(exceed, axis=1)
+        steps = np.diff(self.levels_)
+        return self.levels_[0] + exceed @ steps
+
+
+def make_models():
+    """Candidate models, with the hyperparameters used in notebooks 02 and 04"""
+    from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+    from sklearn.linear_model import LinearRegression
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    return {
+        'linear': make_pipeline(StandardScaler(), LinearRegression()),
+        'random_forest': RandomForestRegressor(n_estimators=100, random_state=42, max_depth=10),
+        'gradient_boosting': GradientBoostingRegressor(
+            n_estimators=100, random_state=42, max_depth=5, learning_rate=0.1),
+        'ordinal': OrdinalRegressor(),
+    }
+
+
+def build_contestant_table(df=None, ig_data=None):
+    """
+    One row per contestant-season with the fold-independent columns
+
+    Returns celebrity_name, ballroom_partner, season, placement, judge_score
+    and log_followers. Pro-dancer columns and celeb_appearances depend on
+    which seasons are in the training fold and are added by
+    add_pro_features and add_celeb_appearances.
+    """
+    if df is None:
+        df = load_dwts_data(DATA_PATH)
+    if ig_data is None:
+        ig_data = load_instagram_followers(IG_PATH)
+
+    table = df[['celebrity_name', 'ballroom_partner', 'season', 'placement']].copy()
+    table['judge_score'] = average_judge_score(df)
+
+    table = table.merge(ig_data, on='celebrity_name', how='left')
+    table['log_followers'] = np.log10(table['follower_count'] + 1)
+    table = table.drop(columns='follower_count')
+    return table.dropna(subset=['placement', 'judge_score']).reset_index(drop=True)
+
+
+def pro_dancer_stats(train):
+    """Pro-dancer columns as in notebook 03, from training rows only"""
+    stats = train.groupby('ballroom_partner').agg(
+        pro_dancer_quality=('judge_score', 'mean'),
+        appearances=('placement', 'size'),
+        wins=('placement', lambda p: (p == 1).sum()),
+        top3=('placement', lambda p: (p <= 3).sum()),
+    )
+    stats['win_rate'] = stats['wins'] / stats['appearances']
+    stats['top3_rate'] = stats['top3'] / stats['appearances']
+    return stats[PRO_FEATURES]
+
+
+def add_pro_features(rows, stats):
+    """Join pro stats; pros unseen in training get the training-wide mean"""
+    out = rows.join(stats, on='ballroom_partner')
+    out[PRO_FEATURES] = out[PRO_FEATURES].fillna(stats.mean())
+    return out
+
+
+def add_celeb_appearances(rows, train, held_out):
+    """
+    celeb_appearances: the celebrity's seasons in train, plus the row's own
+    season when held_out (a test row is not in train)
+    """
+    counts = train['celebrity_name'].value_counts()
+    own = 1 if held_out else 0
+    return rows.assign(celeb_appearances=rows['celebrity_name'].map(counts).fillna(0).astype(np.int64) + own)
+
+
+def season_folds(seasons, scheme='loso', n_splits=5):
+    """
+    Split seasons into held-out groups
+
+    Args:
+        seasons: iterable of season numbers
+        scheme: 'loso' (leave one season out) or 'group_kfold'
+        n_splits: number of folds for group_kfold; seasons are dealt
+            round-robin so each fold spans early and late seasons
+
+    Returns:
+        list of sorted test-season lists
+    """
+    seasons = sorted(set(int(s) for s in seasons))
+    if scheme == 'loso':
+        return [[s] for s in seasons]
+    if scheme == 'group_kfold':
+        return [seasons[i::n_splits] for i in range(n_splits)]
+    raise ValueError(f"Unknown CV scheme: {scheme!r}")
+
+
+def _table_hash(table):
+    return hashlib.sha1(pd.util.hash_pandas_object(table, index=False).values.tobytes()).hexdigest()
+
+
+def build_fold(table, test_seasons, features, cache_dir=CACHE_DIR):
+    """
+    Build (or load from cache) the feature matrices for one fold
+
+    Matrices are stored as .npz files keyed by the table contents, the
+    held-out seasons and the feature list, so every model and every rerun
+    reuses the same fold instead of rebuilding it.
+
+    Returns:
+        path to the .npz file holding X_train, y_train, X_test, y_test and
+        test_seasons (the season of each test row)
+    """
+    key = json.dumps([FEATURE_VERSION, _table_hash(table), test_seasons, features])
+    path = Path(cache_dir) / f"fold_{hashlib.sha1(key.encode()).hexdigest()[:16]}.npz"
+    if path.exists():
+        return path
+
+    is_test = table['season'].isin(test_seasons)
+    train, test = table[~is_test], table[is_test]
+    stats = pro_dancer_stats(train)
+    train = add_celeb_appearances(add_pro_features(train, stats), train, held_out=False)
+    test = add_celeb_appearances(add_pro_features(test, stats), train, held_out=True)
+
+    fill = train[features].mean()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez(
+        path,
+        X_train=train[features].fillna(fill).to_numpy(np.float64),
+        y_train=train['placement'].to_numpy(np.float64),
+        X_test=test[features].fillna(fill).to_numpy(np.float64),
+        y_test=test['placement'].to_numpy(np.float64),
+        test_seasons=test['season'].to_numpy(np.int64),
+    )
+    return path
+
+
+def _fit_fold(model_name, fold_path):
+    """Worker: fit one model on one cached fold and return test predictions"""
+    from sklearn.base import clone
+
+    fold = np.load(fold_path)
+    model = clone(make_models()[model_name])
+    model.fit(fold['X_train'], fold['y_train'])
+    return model.predict(fold['X_test'])
+
+
+def score_fold(y_true, y_pred, seasons):
+    """
+    Fold metrics
+
+    within_season_spearman averages the rank correlation between predicted
+    and actual placement inside each held-out season, which is what matters
+    for predicting the order of a new season.
+    """
+    from scipy.stats import spearmanr
+
+    rhos = []
+    for season in np.unique(seasons):
+        mask = seasons == season
+        if mask.sum() > 2:
+            rhos.append(spearmanr(y_pred[mask], y_true[mask])[0])
+    return {
+        'rmse': float(np.sqrt(np.mean((y_pred - y_true) ** 2))),
+        'mae': float(np.mean(np.abs(y_pred - y_true))),
+        'within_season_spearman': float(np.nanmean(rhos)) if rhos else np.nan,
+    }
+
+
+def cross_validate(table=None, scheme='loso', n_splits=5, feature_sets=None, models=None,
+                   n_jobs=1, cache_dir=CACHE_DIR):
+    """
+    Run every (feature set, model, fold) combination across a process pool
+
+    Args:
+        table: output of build_contestant_table (built from the data files if None)
+        scheme: 'loso' or 'group_kfold'
+        n_splits: folds for group_kfold
+        feature_sets: dict name -> feature columns (default FEATURE_SETS)
+        models: list of model names from make_models() (default: all)
+        n_jobs: worker processes; 1 runs serially in-process
+        cache_dir: where fold matrices are cached
+
+    Returns:
+        DataFrame with one row per (feature_set, model, fold)
+    """
+    if table is None:
+        table = build_contestant_table()
+    feature_sets = feature_sets or FEATURE_SETS
+    models = models or list(make_models())
+    folds = season_folds(table['season'], scheme, n_splits)
+
+    tasks = []
+    for set_name, features in feature_sets.items():
+        for fold_idx, test_seasons in enumerate(folds):
+            fold_path = build_fold(table, test_seasons, features, cache_dir)
+            for model_name in models:
+                tasks.append((set_name, model_name, fold_idx, fold_path))
+
+    if n_jobs == 1:
+        predictions = [_fit_fold(model_name, path) for _, model_name, _, path in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            predictions = list(pool.map(
+                _fit_fold, [t[1] for t in tasks], [t[3] for t in tasks]))
+
+    records = []
+    for (set_name, model_name, fold_idx, fold_path), y_pred in zip(tasks, predictions):
+        fold = np.load(fold_path)
+        records.append({
+            'feature_set': set_name,
+            'model': model_name,
+            'fold': fold_idx,
+            'n_test': len(y_pred),
+            **score_fold(fold['y_test'], y_pred, fold['test_seasons']),
+        })
+    return pd.DataFrame(records)
+
+
+def comparison_table(fold_results):
+    """Average fold metrics per (feature_set, model), best RMSE first"""
+    summary = fold_results.groupby(['feature_set', 'model']).agg(
+        rmse=('rmse', 'mean'),
+        rmse_std=('rmse', 'std'),
+        mae=('mae', 'mean'),
+        within_season_spearman=('within_season_spearman', 'mean'),
+        folds=('fold', 'nunique'),
+    )
+    return summary.sort_values('rmse').round(3).reset_index()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Season-grouped CV for placement models")
+    parser.add_argument('--scheme', choices=['loso', 'group_kfold'], default='loso')
+    parser.add_argument('--splits', type=int, default=5, help="folds for group_kfold")
+    parser.add_argument('--jobs', type=int, default=1, help="worker processes")
+    parser.add_argument('--models', nargs='+', choices=list(make_models()))
+    parser.add_argument('--output', help="optional CSV path for the comparison table")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"PLACEMENT MODEL CROSS-VALIDATION ({args.scheme})")
+    print("=" * 80)
+
+    fold_results = cross_validate(
+        scheme=args.scheme, n_splits=args.splits, models=args.models, n_jobs=args.jobs)
+    table = comparison_table(fold_results)
+    print(table.to_string(index=False))
+
+    if args.output:
+        table.to_csv(args.output, index=False)
+        print(f"\n✓ Comparison table saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
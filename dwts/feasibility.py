@@ -0,0 +1,299 @@
+"""
+Exact fan-vote bounds from the observed eliminations
+
+All we observe each week is who went home (and, in the final, the finishing
+order). Under the percent rule (seasons 3-27) that is a set of linear
+constraints on the week's fan shares f:
+
+    f >= 0, sum(f) = 1
+    judge_pct[e] + f[e] < judge_pct[s] + f[s]    eliminated e, survivor s
+
+so the tightest min / max share of each couple is a pair of linear programs
+(scipy linprog, HiGHS), with the strict inequality held TIE_MARGIN apart.
+Under the rank rule (seasons 1-2, 28-34) the fan ranks are a permutation,
+and the eliminated couple must have the worst judge_rank + fan_rank (fan
+rank breaks ties). Fan-rank bounds come from an assignment ILP (scipy
+milp), whose integer ranks are strict already; from season 28 the judges'
+save only requires the eliminated couple to be in the bottom two. A fan
+rank r means a share of at most 1/r, and only a forced fan rank of 1
+implies a share of at least 1/n.
+
+Weeks are independent, so they are solved in a process pool.
+
+Usage:
+    python -m dwts.feasibility --jobs 4 --output fan_vote_bounds.csv
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from dwts.combine import JUDGES_SAVE_FROM, segmented_rank, voting_rule
+from dwts.data import DATA_PATH, load_dwts_data
+from dwts.reshape import reshape_long
+
+
+BOUND_COLUMNS = ['fan_share_min', 'fan_share_max', 'fan_rank_min', 'fan_rank_max', 'status']
+
+# Combined-score gap (as a share of the week's votes) the worse couple of a
+# pair must trail by. The outcome rules out ties, and without a gap the
+# solvers stop on the tie boundary.
+TIE_MARGIN = 1e-4
+
+
+def week_problems(long):
+    """
+    One constraint problem per (season, week)
+
+    Returns a list of dicts with season, week, rule, judges_save, names,
+    judge (totals), and `pairs`: (worse, better) index pairs that the
+    observed outcome implies, where worse must have the worse combined score.
+    Couples who withdrew that week are left unconstrained.
+    """
+    cells = long[long['active']].sort_values(['season', 'week', 'row'])
+    problems = []
+    for (season, week), wk in cells.groupby(['season', 'week'], sort=True):
+        eliminated = np.flatnonzero(wk['eliminated_this_week'].to_numpy())
+        stayed = np.flatnonzero(~(wk['eliminated_this_week'] | wk['withdrew_this_week']).to_numpy())
+        pairs = [(e, s) for e in eliminated for s in stayed]
+
+        if wk['final_week'].iat[0]:
+            # Finishing order of the couples still dancing in the final
+            place = wk['placement'].to_numpy(np.float64)
+            pairs += [(w, b) for w in stayed for b in stayed if place[b] < place[w]]
+
+        problems.append({
+            'season': int(season),
+            'week': int(week),
+            'rule': voting_rule(season),
+            'judges_save': int(season) >= JUDGES_SAVE_FROM and not wk['final_week'].iat[0],
+            'names': wk['celebrity_name'].tolist(),
+            'judge': wk['judge_total'].to_numpy(np.float64),
+            'eliminated': eliminated.tolist(),
+            'pairs': pairs,
+        })
+    return problems
+
+
+def percent_constraints(judge, pairs, margin=TIE_MARGIN):
+    """A_ub, b_ub with A_ub @ f <= b_ub for the percent-rule pairs"""
+    pct = judge / judge.sum()
+    A = np.zeros((len(pairs), len(judge)))
+    b = np.empty(len(pairs))
+    for k, (worse, better) in enumerate(pairs):
+        # pct[w] + f[w] <= pct[b] + f[b] - margin
+        A[k, worse], A[k, better] = 1, -1
+        b[k] = pct[better] - pct[worse] - margin
+    return A, b
+
+
+def percent_bounds(judge, pairs):
+    """
+    Min / max fan share per couple under the percent rule
+
+    A bound the solver could not find (iteration limit, numerical trouble)
+    is left NaN and the status is 'not_converged'.
+    """
+    from scipy.optimize import linprog
+
+    n = len(judge)
+    if not pairs:
+        return np.zeros(n), np.ones(n), 'unconstrained'
+
+    A, b = percent_constraints(judge, pairs)
+    lo, hi = np.full(n, np.nan), np.full(n, np.nan)
+    status = 'ok'
+    for i in range(n):
+        for sign, out in ((1, lo), (-1, hi)):
+            c = np.zeros(n)
+            c[i] = sign
+            res = linprog(c, A_ub=A, b_ub=b, A_eq=np.ones((1, n)), b_eq=[1],
+                          bounds=(0, 1), method='highs')
+            if res.status == 2:
+                return lo, hi, 'infeasible'
+            if res.status != 0:
+                # Iteration limit or numerical trouble: no solution, bound stays NaN
+                status = 'not_converged'
+                continue
+            out[i] = res.x[i]
+    return lo, hi, status
+
+
+def rank_constraints(judge, pairs, eliminated=(), judges_save=False):
+    """
+    Assignment-ILP constraints for the rank rule
+
+    Variables are x[i, r] (n * n binaries, couple i has fan rank r + 1)
+    followed by one z binary per judges'-save pair. For each (worse, better)
+    pair, worse needs a higher judge_rank + fan_rank, or an equal sum and a
+    worse fan rank; with (n + 1) * sum + fan_rank as the sort key that is one
+    linear inequality. With the judges' save, one survivor per eliminated
+    couple may escape its inequality (z = 1), i.e. the eliminated couple
+    only has to be in the bottom two.
+
+    Returns:
+        LinearConstraint and the number of variables
+    """
+    from scipy.optimize import LinearConstraint
+
+    n = len(judge)
+    judge_rank = segmented_rank(judge, [0, n])
+    ranks = np.arange(1, n + 1)
+    save_pairs = [k for k, (w, _) in enumerate(pairs) if judges_save and w in eliminated]
+    n_x, n_z = n * n, len(save_pairs)
+
+    rows, lb, ub = [], [], []
+
+    def constrain(row, low, high):
+        rows.append(row)
+        lb.append(low)
+        ub.append(high)
+
+    for i in range(n):
+        # One rank per couple, one couple per rank
+        row = np.zeros(n_x + n_z)
+        row[i * n:(i + 1) * n] = 1
+        constrain(row, 1, 1)
+        col = np.zeros(n_x + n_z)
+        col[i:n_x:n] = 1
+        constrain(col, 1, 1)
+
+    big = (n + 2) * n + (n + 1) * n + 1
+    for k, (worse, better) in enumerate(pairs):
+        # (n + 2) * (R_w - R_b) >= (n + 1) * (jr_b - jr_w) + 1
+        row = np.zeros(n_x + n_z)
+        row[worse * n:(worse + 1) * n] += (n + 2) * ranks
+        row[better * n:(better + 1) * n] -= (n + 2) * ranks
+        if k in save_pairs:
+            row[n_x + save_pairs.index(k)] = big
+        constrain(row, (n + 1) * (judge_rank[better] - judge_rank[worse]) + 1, np.inf)
+    for e in eliminated if judges_save else ():
+        row = np.zeros(n_x + n_z)
+        for z, k in enumerate(save_pairs):
+            if pairs[k][0] == e:
+                row[n_x + z] = 1
+        constrain(row, -np.inf, 1)
+
+    return LinearConstraint(np.array(rows), lb, ub), n_x + n_z
+
+
+def rank_bounds(judge, pairs, eliminated=(), judges_save=False):
+    """Min / max fan rank per couple under the rank rule (see rank_constraints)"""
+    from scipy.optimize import Bounds, milp
+
+    n = len(judge)
+    if not pairs:
+        return np.ones(n), np.full(n, float(n)), 'unconstrained'
+
+    constraints, n_vars = rank_constraints(judge, pairs, eliminated, judges_save)
+    ranks = np.arange(1, n + 1)
+    lo, hi = np.full(n, np.nan), np.full(n, np.nan)
+    status = 'ok'
+    for i in range(n):
+        for sign, out in ((1, lo), (-1, hi)):
+            c = np.zeros(n_vars)
+            c[i * n:(i + 1) * n] = sign * ranks
+            res = milp(c, constraints=constraints, integrality=np.ones(n_vars), bounds=Bounds(0, 1))
+            if res.status == 2:
+                return lo, hi, 'infeasible'
+            if res.status != 0:
+                status = 'not_converged'
+                continue
+            out[i] = round(sign * res.fun)
+    return lo, hi, status
+
+
+def solve_week(problem):
+    """Bounds table for one week (module-level so it pickles to workers)"""
+    judge, pairs, n = problem['judge'], problem['pairs'], len(problem['judge'])
+    frame = pd.DataFrame({
+        'season': problem['season'], 'week': problem['week'],
+        'celebrity_name': problem['names'], 'rule': problem['rule'],
+    })
+    if problem['rule'] == 'percent':
+        lo, hi, status = percent_bounds(judge, pairs)
+        frame['fan_share_min'], frame['fan_share_max'] = lo, hi
+        frame['fan_rank_min'] = frame['fan_rank_max'] = np.nan
+    else:
+        lo, hi, status = rank_bounds(judge, pairs, problem['eliminated'], problem['judges_save'])
+        frame['fan_rank_min'], frame['fan_rank_max'] = lo, hi
+        frame['fan_share_min'] = np.where(hi == 1, 1 / n, 0.0)
+        frame['fan_share_max'] = 1 / lo
+    frame['status'] = status
+    return frame
+
+
+def fan_vote_bounds(long=None, n_jobs=1, seasons=None):
+    """
+    Tightest fan share (and fan rank) interval for every contestant-week
+
+    Args:
+        long: reshape_long() table (built from the data file if None)
+        n_jobs: worker processes; 1 solves in-process
+        seasons: optional subset of seasons
+
+    Returns:
+        DataFrame keyed by season, week, celebrity_name with rule and
+        BOUND_COLUMNS
+    """
+    if long is None:
+        long = reshape_long(load_dwts_data(DATA_PATH), report=False)
+    if seasons is not None:
+        long = long[long['season'].isin(seasons)]
+    problems = week_problems(long)
+
+    if n_jobs == 1:
+        frames = [solve_week(p) for p in problems]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            frames = list(pool.map(solve_week, problems, chunksize=8))
+    return pd.concat(frames, ignore_index=True)
+
+
+def add_intervals(estimates, bounds):
+    """
+    Attach fan_votes_min / fan_votes_max to a fan_votes_estimated table
+
+    fan_votes_estimate is a percent of the week's votes, so the share bounds
+    are scaled by 100.
+    """
+    keys = ['season', 'week', 'celebrity_name']
+    scaled = bounds[keys + ['status']].assign(
+        fan_votes_min=bounds['fan_share_min'] * 100,
+        fan_votes_max=bounds['fan_share_max'] * 100,
+    ).rename(columns={'status': 'fan_votes_bound_status'})
+    out = estimates.merge(scaled, on=keys, how='left')
+    # Keep the interval next to the point estimate
+    cols = list(estimates.columns)
+    at = cols.index('fan_votes_estimate') + 1 if 'fan_votes_estimate' in cols else len(cols)
+    new = ['fan_votes_min', 'fan_votes_max', 'fan_votes_bound_status']
+    return out[cols[:at] + new + cols[at:]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fan-vote bounds implied by the eliminations")
+    parser.add_argument('--jobs', type=int, default=1, help="worker processes")
+    parser.add_argument('--seasons', type=int, nargs='+')
+    parser.add_argument('--output', help="optional CSV path for the bounds table")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("FAN VOTE FEASIBILITY BOUNDS")
+    print("=" * 80)
+    bounds = fan_vote_bounds(n_jobs=args.jobs, seasons=args.seasons)
+    weeks = bounds.drop_duplicates(['season', 'week'])
+    print(weeks.groupby(['rule', 'status']).size().rename('weeks').to_string())
+
+    tight = (bounds['fan_share_min'] > 0) | (bounds['fan_share_max'] < 1)
+    print(f"\nContestant-weeks with a share bound tighter than [0, 1]: "
+          f"{tight.sum()} of {len(bounds)}")
+
+    if args.output:
+        bounds.to_csv(args.output, index=False)
+        print(f"\n✓ Bounds saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
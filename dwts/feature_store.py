@@ -0,0 +1,273 @@
+"""
+Point-in-time feature store keyed by (celebrity_name, season, week)
+
+Notebooks 02-05 each rebuild week{N}_total_judge_score, cumulative scores,
+partner_encoded, log_followers and popularity_tier in memory. Here each
+feature group is built once, written to a Parquet file and versioned by a
+hash of its code and its input data files, so a group is rebuilt only when
+either changes. The code hashed is the source of the build function's module
+and of every dwts module it uses, directly or through others (helpers such
+as reshape_long or PartnerStatsIndex included), plus FEATURE_VERSION.
+
+Weekly features at week w only use information available after week w's show
+(week totals, running sums), and contestant-level features are stored at
+week 0. Reads push column selection and the as-of-week filter down to the
+Parquet reader, so a slice never loads future weeks or unrequested columns.
+
+Requires pyarrow (pip install pyarrow).
+
+Usage:
+    store = FeatureStore()
+    store.materialize_all()
+    X = store.get(['judge_weekly', 'popularity'],
+                  columns=['total_judge_score', 'log_followers'], as_of_week=4)
+"""
+
+import hashlib
+import inspect
+import json
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from dwts.data import (
+    DATA_PATH, IG_PATH, N_JUDGES, load_dwts_data, load_instagram_followers,
+)
+from dwts.partners import PartnerStatsIndex
+from dwts.popularity import add_popularity
+from dwts.reshape import reshape_long
+
+
+STORE_DIR = Path(__file__).resolve().parent.parent / '.cache' / 'feature_store'
+KEY_COLUMNS = ['celebrity_name', 'season', 'week']
+
+# Bump when stored groups go stale for reasons the code hash cannot see
+# (e.g. a pandas upgrade changing a build's output)
+FEATURE_VERSION = 2
+
+
+def _dwts_modules(module):
+    """module and every dwts module reachable through module-level names"""
+    seen, todo = {}, [module]
+    while todo:
+        module = todo.pop()
+        if module is None or module.__name__ in seen or not module.__name__.startswith('dwts'):
+            continue
+        seen[module.__name__] = module
+        for value in vars(module).values():
+            todo.append(value if inspect.ismodule(value) else inspect.getmodule(value))
+    return [seen[name] for name in sorted(seen)]
+
+
+@dataclass(frozen=True)
+class FeatureGroup:
+    """
+    A set of features built together from the wide DWTS table
+
+    grain is 'week' for per-contestant-week features or 'contestant' for
+    features known before the season starts (stored at week 0).
+    """
+    name: str
+    build: Callable[[pd.DataFrame], pd.DataFrame]
+    grain: str
+    inputs: tuple = field(default=(DATA_PATH,))
+
+    def version(self, data_path=DATA_PATH):
+        """Hash of FEATURE_VERSION, the build's dwts code and every input file"""
+        digest = hashlib.sha1(str(FEATURE_VERSION).encode())
+        for module in _dwts_modules(sys.modules[self.build.__module__]):
+            digest.update(inspect.getsource(module).encode())
+        for path in self.inputs:
+            path = data_path if path == DATA_PATH else path
+            digest.update(Path(path).read_bytes())
+        return digest.hexdigest()[:12]
+
+
+FEATURE_GROUPS = {}
+
+
+def feature_group(name, grain='week', inputs=(DATA_PATH,)):
+    """Decorator registering a build function as a feature group"""
+    def register(build):
+        FEATURE_GROUPS[name] = FeatureGroup(name, build, grain, tuple(inputs))
+        return build
+    return register
+
+
+def _weekly_judge_long(df):
+    """Judge features for the weeks each contestant actually danced"""
+    long = reshape_long(df, report=False)
+    long = long[long['active']].reset_index(drop=True)
+    scores = long[[f'judge{j}_score' for j in range(1, N_JUDGES + 1)]]
+    out = long[['celebrity_name', 'season', 'week']].copy()
+    out['total_judge_score'] = long['judge_total']
+    out['avg_judge_score'] = long['judge_mean']
+    out['judge_std'] = scores.std(axis=1)
+    out['judge_min'] = scores.min(axis=1)
+    out['judge_max'] = scores.max(axis=1)
+    out['judge_range'] = out['judge_max'] - out['judge_min']
+    return out.sort_values(KEY_COLUMNS, ignore_index=True)
+
+
+@feature_group('judge_weekly')
+def build_judge_weekly(df):
+    """week{N}_total/avg_judge_score, judge_std/min/max/range as in notebook 02"""
+    return _weekly_judge_long(df)
+
+
+@feature_group('judge_cumulative')
+def build_judge_cumulative(df):
+    """Running totals through each week (no look-ahead to later weeks)"""
+    long = _weekly_judge_long(df)[KEY_COLUMNS + ['total_judge_score']]
+    by_row = long.groupby(['celebrity_name', 'season'])['total_judge_score']
+    long['weeks_competed'] = by_row.cumcount() + 1
+    long['cumulative_judge_score'] = by_row.cumsum()
+    long['avg_cumulative_judge_score'] = long['cumulative_judge_score'] / long['weeks_competed']
+    first = by_row.transform('first')
+    long['judge_score_trend'] = np.where(
+        long['weeks_competed'] > 1,
+        (long['total_judge_score'] - first) / (long['weeks_competed'] - 1).clip(lower=1),
+        0.0)
+    return long.drop(columns='total_judge_score')
+
+
+@feature_group('partner', grain='contestant')
+def build_partner(df):
+    """partner_encoded and partner stats from seasons before the contestant's own"""
+    out = df[['celebrity_name', 'season']].copy()
+    out['week'] = 0
+    out['partner_encoded'] = pd.factorize(df['ballroom_partner'])[0]
+    index = PartnerStatsIndex.from_frame(df)
+    return pd.concat([out, index.point_in_time_features(df)], axis=1).reset_index(drop=True)
+
+
+@feature_group('popularity', grain='contestant', inputs=(DATA_PATH, IG_PATH))
+def build_popularity(df):
+    """follower_count, log_followers, normalized_followers, popularity_tier as in notebook 05"""
+    out = df[['celebrity_name', 'season']].copy()
+    out['week'] = 0
+    out = add_popularity(out, load_instagram_followers(IG_PATH, per_season=True))
+    out['popularity_tier'] = out['popularity_tier'].astype(object)
+    return out
+
+
+class FeatureStore:
+    """
+    Materialized feature groups on disk, one Parquet file per group version
+
+    Layout:
+        <root>/<group>/<version>.parquet
+        <root>/manifest.json   (current version, columns and row count per group)
+    """
+
+    def __init__(self, root=STORE_DIR, data_path=DATA_PATH, groups=None):
+        self.root = Path(root)
+        self.data_path = Path(data_path)
+        self.groups = groups or FEATURE_GROUPS
+        self._df = None
+
+    @property
+    def df(self):
+        if self._df is None:
+            self._df = load_dwts_data(self.data_path)
+        return self._df
+
+    def _path(self, name):
+        return self.root / name / f"{self.groups[name].version(self.data_path)}.parquet"
+
+    def _manifest(self):
+        path = self.root / 'manifest.json'
+        return json.loads(path.read_text()) if path.exists() else {}
+
+    def materialize(self, name, force=False):
+        """Build and write one group unless its current version already exists"""
+        path = self._path(name)
+        if path.exists() and not force:
+            return path
+        group = self.groups[name]
+        frame = group.build(self.df)
+        missing = [c for c in KEY_COLUMNS if c not in frame.columns]
+        if missing:
+            raise ValueError(f"Feature group {name!r} is missing key columns {missing}")
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        for stale in path.parent.glob('*.parquet'):
+            stale.unlink()
+        frame.sort_values(KEY_COLUMNS).to_parquet(path, index=False)
+
+        manifest = self._manifest()
+        manifest[name] = {
+            'version': path.stem,
+            'grain': group.grain,
+            'columns': [c for c in frame.columns if c not in KEY_COLUMNS],
+            'rows': len(frame),
+        }
+        (self.root / 'manifest.json').write_text(json.dumps(manifest, indent=2))
+        return path
+
+    def materialize_all(self, force=False):
+        return {name: self.materialize(name, force) for name in self.groups}
+
+    def read(self, name, columns=None, as_of_week: Optional[int] = None, seasons=None):
+        """
+        Load one group, materializing it first if needed
+
+        Args:
+            name: feature group name
+            columns: feature columns to load (keys are always included)
+            as_of_week: only rows for weeks <= this week
+            seasons: only these seasons
+        """
+        path = self.materialize(name)
+        filters = []
+        if as_of_week is not None:
+            filters.append(('week', '<=', as_of_week))
+        if seasons is not None:
+            filters.append(('season', 'in', list(seasons)))
+        load = None if columns is None else KEY_COLUMNS + [c for c in columns if c not in KEY_COLUMNS]
+        return pd.read_parquet(path, columns=load, filters=filters or None)
+
+    def get(self, names, columns=None, as_of_week=None, seasons=None):
+        """
+        Join several groups into one frame at contestant-week grain
+
+        Contestant-level groups are broadcast onto every week. Requested
+        columns are routed to the group that owns them via the manifest.
+        """
+        if isinstance(names, str):
+            names = [names]
+        for name in names:
+            self.materialize(name)
+        manifest = self._manifest()
+
+        weekly, static = None, None
+        for name in names:
+            owned = None if columns is None else [c for c in columns if c in manifest[name]['columns']]
+            if owned == []:
+                continue
+            frame = self.read(name, owned, as_of_week, seasons)
+            if self.groups[name].grain == 'contestant':
+                frame = frame.drop(columns='week')
+                static = frame if static is None else static.merge(
+                    frame, on=['celebrity_name', 'season'], how='outer')
+            else:
+                weekly = frame if weekly is None else weekly.merge(frame, on=KEY_COLUMNS, how='outer')
+
+        if weekly is None:
+            return static
+        if static is None:
+            return weekly
+        return weekly.merge(static, on=['celebrity_name', 'season'], how='left')
+
+
+if __name__ == "__main__":
+    store = FeatureStore()
+    print("=" * 80)
+    print("FEATURE STORE")
+    print("=" * 80)
+    for name, path in store.materialize_all().items():
+        print(f"  {name:20s} -> {path.relative_to(store.root)}")
@@ -0,0 +1,289 @@
+"""
+Append-only follower time series
+
+Each scraper run used to overwrite its CSV with today's counts, so the
+history was lost and notebooks could only use the current count, even for
+a contestant from 2005. FollowerStore keeps every observed change instead:
+
+    celebrity_id  name_key() of the canonical name from dwts.names
+    timestamp     when the count was observed
+    followers     follower count
+    verified      account verified flag (missing if the source has none)
+    source        where the count came from (scraper, manual sheet, ...)
+
+Snapshots are written as Parquet partitions, one directory per month
+(month=2026-01/part-<time>-<id>.parquet), and never rewritten in place.
+A snapshot whose followers and verified flag equal the value already
+stored for that celebrity and source at that time is skipped, so
+re-running a scraper on unchanged accounts adds nothing. compact()
+merges a month's small parts into one file.
+
+as_of() answers "followers at time t" with a backward merge_asof over the
+rows that could match (celebrity and time filters pushed down to the
+Parquet reader); season_followers() uses it with SEASON_PREMIERES.
+
+Requires pyarrow (pip install pyarrow).
+
+Usage:
+    python -m dwts.followers ingest "data/celebrityIG - Sheet1.csv" --timestamp 2026-01-20
+    python -m dwts.followers ingest instagram_followers_httpx.csv --source httpx
+    python -m dwts.followers as-of --season 20
+    python -m dwts.followers compact
+"""
+
+import argparse
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from dwts.data import DATA_DIR, SEASON_PREMIERES
+from dwts.names import NameIndex
+
+
+STORE_DIR = DATA_DIR / 'followers'
+KEY = ['celebrity_id', 'source']
+COLUMNS = ['celebrity_id', 'timestamp', 'followers', 'verified', 'source']
+TIME_UNIT = 'datetime64[us]'
+
+
+class FollowerStore:
+    """
+    Follower snapshots partitioned by month under root
+
+    Names are resolved to celebrity ids through a NameIndex of the main
+    table (built on first use), so counts from different scrapers and
+    spellings land on the same series.
+    """
+
+    def __init__(self, root=STORE_DIR, index=None):
+        self.root = Path(root)
+        self._index = index
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = NameIndex.from_data()
+        return self._index
+
+    def _parts(self):
+        return sorted(self.root.glob('month=*/*.parquet'))
+
+    def history(self, ids=None, start=None, end=None, sources=None):
+        """
+        Stored snapshots, oldest first
+
+        Args:
+            ids: only these celebrity ids
+            start, end: only timestamps in [start, end]
+            sources: only these sources
+        """
+        if not self._parts():
+            return pd.DataFrame({c: pd.Series(dtype=t) for c, t in zip(COLUMNS, [
+                'str', TIME_UNIT, np.int64, 'boolean', 'str'])})
+        filters = []
+        if ids is not None:
+            filters.append(('celebrity_id', 'in', list(ids)))
+        if sources is not None:
+            filters.append(('source', 'in', list(sources)))
+        if start is not None:
+            filters.append(('timestamp', '>=', pd.Timestamp(start)))
+        if end is not None:
+            filters.append(('timestamp', '<=', pd.Timestamp(end)))
+        frame = pd.read_parquet(self.root, columns=COLUMNS, filters=filters or None)
+        frame = frame.astype({'timestamp': TIME_UNIT, 'verified': 'boolean'})
+        return frame.sort_values(['timestamp'] + KEY, kind='stable', ignore_index=True)
+
+    def append(self, snapshots, source=None):
+        """
+        Add snapshots, skipping those that repeat the stored value
+
+        Args:
+            snapshots: DataFrame with celebrity_name (or celebrity_id),
+                timestamp and followers; verified and source are optional.
+                Rows without a follower count are ignored, and of several
+                rows for one celebrity, source and time the first is kept
+                (as in ProfileStore.record).
+            source: source for rows that do not carry one
+
+        Returns:
+            number of snapshots written
+        """
+        new = snapshots.copy()
+        if 'celebrity_id' not in new.columns:
+            new['celebrity_id'] = self.index.celebrity_ids(new['celebrity_name'])
+        if 'source' not in new.columns:
+            new['source'] = source
+        if 'verified' not in new.columns:
+            new['verified'] = pd.NA
+        new = new.dropna(subset=['followers', 'source'])
+        new = new.assign(
+            timestamp=pd.to_datetime(new['timestamp']).astype(TIME_UNIT),
+            followers=new['followers'].astype(np.int64),
+            verified=new['verified'].astype('boolean'),
+        )[COLUMNS].drop_duplicates(KEY + ['timestamp'], keep='first')
+        if new.empty:
+            return 0
+
+        # Interleave with the stored series of the same keys and keep a new
+        # row only where the value differs from the one before it
+        old = self.history(ids=new['celebrity_id'].unique(), sources=new['source'].unique())
+        merged = pd.concat([old.assign(_new=False), new.assign(_new=True)], ignore_index=True)
+        merged = merged.sort_values(KEY + ['timestamp', '_new'], kind='stable', ignore_index=True)
+        value = pd.DataFrame({'followers': merged['followers'],
+                              'verified': merged['verified'].astype('Int8').fillna(-1)})
+        repeat = (merged[KEY] == merged[KEY].shift()).all(axis=1) & (value == value.shift()).all(axis=1)
+        keep = merged[merged['_new'] & ~repeat].drop(columns='_new')
+        if keep.empty:
+            return 0
+
+        stamp = f"{datetime.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        for month, part in keep.groupby(keep['timestamp'].dt.strftime('%Y-%m')):
+            path = self.root / f"month={month}" / f"part-{stamp}.parquet"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            part.sort_values(['celebrity_id', 'timestamp']).to_parquet(path, index=False)
+        return len(keep)
+
+    def compact(self):
+        """Merge each month's parts into one file; returns months compacted"""
+        compacted = 0
+        for month in sorted({p.parent for p in self._parts()}):
+            parts = sorted(month.glob('*.parquet'))
+            if len(parts) < 2:
+                continue
+            frame = pd.concat([pd.read_parquet(p, columns=COLUMNS) for p in parts], ignore_index=True)
+            merged = month / f"part-{datetime.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}.parquet"
+            frame.sort_values(['celebrity_id', 'timestamp']).to_parquet(merged, index=False)
+            for part in parts:
+                part.unlink()
+            compacted += 1
+        return compacted
+
+    def latest(self):
+        """Most recent snapshot per celebrity and source"""
+        return self.history().drop_duplicates(KEY, keep='last').reset_index(drop=True)
+
+    def as_of(self, queries, sources=None, direction='backward'):
+        """
+        Follower count at given times
+
+        Args:
+            queries: DataFrame with celebrity_name (or celebrity_id) and
+                timestamp
+            sources: only use these sources (default: any, latest wins)
+            direction: 'backward' for the last snapshot at or before each
+                time; 'nearest' also accepts a later one when none precede
+
+        Returns:
+            DataFrame with followers, verified, source and snapshot_time,
+            indexed like queries (NaN where nothing matches)
+        """
+        ids = (queries['celebrity_id'] if 'celebrity_id' in queries.columns
+               else self.index.celebrity_ids(queries['celebrity_name']))
+        left = pd.DataFrame({
+            'celebrity_id': ids.to_numpy(),
+            'timestamp': pd.to_datetime(queries['timestamp']).astype(TIME_UNIT).to_numpy(),
+            '_row': np.arange(len(queries)),
+        })
+        end = None if direction != 'backward' else left['timestamp'].max()
+        right = self.history(ids=left['celebrity_id'].unique(), end=end, sources=sources)
+        right = right.rename(columns={'timestamp': 'snapshot_time'})
+        right['timestamp'] = right['snapshot_time']
+        known = left.dropna(subset=['timestamp']).sort_values('timestamp')
+        found = pd.merge_asof(known, right, on='timestamp', by='celebrity_id', direction=direction)
+        out = left[['_row']].merge(found.drop(columns=['celebrity_id', 'timestamp']), on='_row', how='left')
+        out = out.sort_values('_row').drop(columns='_row')
+        out.index = queries.index
+        return out[['followers', 'verified', 'source', 'snapshot_time']]
+
+
+def season_followers(df, store=None, direction='backward'):
+    """
+    Follower count of each contestant as of their season's premiere
+
+    Args:
+        df: table with celebrity_name and season
+        store: FollowerStore (default location if None)
+        direction: as in FollowerStore.as_of; 'nearest' fills seasons that
+            predate the history with its earliest snapshot
+
+    Returns:
+        Series of follower counts indexed like df
+    """
+    store = store or FollowerStore()
+    queries = pd.DataFrame({
+        'celebrity_name': df['celebrity_name'],
+        'timestamp': pd.to_datetime(df['season'].map(SEASON_PREMIERES)),
+    }, index=df.index)
+    return store.as_of(queries, direction=direction)['followers']
+
+
+def read_snapshots(path, timestamp=None, source=None):
+    """
+    Snapshots from a scraper CSV or the manual follower sheet
+
+    Follower counts are taken from follower_count or followers (commas
+    allowed), rows marked found=False are dropped, and the timestamp comes
+    from collection_date, else the timestamp argument, else the file's
+    modification time.
+    """
+    path = Path(path)
+    frame = pd.read_csv(path)
+    counts = frame['follower_count'] if 'follower_count' in frame.columns else frame['followers']
+    if 'found' in frame.columns:
+        counts = counts.where(frame['found'].astype(str).str.lower() != 'false')
+    if 'collection_date' in frame.columns:
+        stamps = pd.to_datetime(frame['collection_date'])
+    else:
+        stamps = pd.Timestamp(timestamp) if timestamp else pd.Timestamp(path.stat().st_mtime, unit='s')
+    snapshots = pd.DataFrame({
+        'celebrity_name': frame['celebrity_name'],
+        'timestamp': stamps,
+        'followers': pd.to_numeric(counts.astype(str).str.replace(',', ''), errors='coerce'),
+    })
+    if 'verified' in frame.columns:
+        snapshots['verified'] = frame['verified'].map({True: True, False: False, 'True': True, 'False': False})
+    snapshots['source'] = source or path.stem
+    return snapshots
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Follower time-series store")
+    parser.add_argument('--root', default=str(STORE_DIR))
+    commands = parser.add_subparsers(dest='command', required=True)
+    ingest = commands.add_parser('ingest', help="append snapshots from scraper CSVs or the sheet")
+    ingest.add_argument('paths', nargs='+')
+    ingest.add_argument('--source', help="source label (default: file name)")
+    ingest.add_argument('--timestamp', help="for files without collection_date")
+    as_of = commands.add_parser('as-of', help="followers at a season premiere or a date")
+    when = as_of.add_mutually_exclusive_group(required=True)
+    when.add_argument('--season', type=int)
+    when.add_argument('--date')
+    as_of.add_argument('--nearest', action='store_true', help="accept later snapshots")
+    commands.add_parser('compact', help="merge each month's parts")
+    args = parser.parse_args()
+
+    store = FollowerStore(args.root)
+    if args.command == 'ingest':
+        for path in args.paths:
+            snapshots = read_snapshots(path, args.timestamp, args.source)
+            written = store.append(snapshots)
+            print(f"✓ {Path(path).name}: {written} of {len(snapshots)} snapshots new")
+    elif args.command == 'compact':
+        print(f"✓ Compacted {store.compact()} month(s)")
+    else:
+        when = pd.Timestamp(SEASON_PREMIERES[args.season] if args.season else args.date)
+        latest = store.latest().drop_duplicates('celebrity_id', keep='last')
+        counts = store.as_of(latest[['celebrity_id']].assign(timestamp=when),
+                             direction='nearest' if args.nearest else 'backward')
+        table = pd.concat([latest[['celebrity_id']], counts], axis=1).dropna(subset=['followers'])
+        print("=" * 80)
+        print(f"FOLLOWERS AS OF {when:%Y-%m-%d}: {len(table)} celebrities")
+        print("=" * 80)
+        print(table.sort_values('followers', ascending=False).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
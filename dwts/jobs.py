@@ -0,0 +1,294 @@
+"""
+Leased job queue for spreading scraper runs over several workers
+
+One Instagram login behind one IP limits a scraper to about one
+celebrity every few seconds. JobQueue lets any number of worker
+processes, on this machine or on others sharing the database file, pull
+celebrities from one SQLite queue:
+
+    jobs      one row per celebrity (job_id = name_key), enqueued at most
+              once; a worker leases a few at a time for `visibility`
+              seconds, and a lease that runs out without complete() or
+              fail() puts the job back for any other worker to take
+    sessions  the accounts (login + proxy) workers run under; each worker
+              claims one exclusively, so a session is only ever used from
+              its own proxy and never from two workers at once
+
+Workers pull jobs whenever they are idle, so a fast worker simply takes
+more of them and a dead one's jobs are picked up when its leases expire.
+complete() only writes when the caller still holds the lease (matched on
+a per-lease token), so a result is stored exactly once even if an expired
+lease was re-run elsewhere; record() copies the results into the profile
+store, which skips rows it already has.
+
+Usage:
+    python -m dwts.jobs enqueue                 (every contestant)
+    python -m dwts.jobs status
+    python -m dwts.jobs record --source instagrapi
+    python scraping/queue_worker.py --workers 4 --backend fake
+"""
+
+import argparse
+import json
+import sqlite3
+import time
+import uuid
+from pathlib import Path
+from typing import NamedTuple
+
+import pandas as pd
+
+from dwts.data import DATA_DIR, DATA_PATH
+from dwts.names import name_key
+
+
+JOB_DB = DATA_DIR / 'jobs.sqlite'
+VISIBILITY = 300        # seconds a lease lasts unless extended
+SESSION_TIMEOUT = 600   # seconds without a heartbeat before a session is free again
+MAX_ATTEMPTS = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    celebrity_name TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    token TEXT,
+    lease_until REAL,
+    result TEXT,
+    error TEXT,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, lease_until);
+
+CREATE TABLE IF NOT EXISTS sessions (
+    name TEXT PRIMARY KEY,
+    proxy TEXT,
+    worker TEXT,
+    heartbeat REAL
+);
+"""
+
+
+class Job(NamedTuple):
+    job_id: str
+    celebrity_name: str
+    token: str
+    attempts: int
+
+
+class JobQueue:
+    """
+    SQLite job queue (WAL mode; every state change is one short write
+    transaction, so many processes can share the file)
+
+    Example:
+        queue = JobQueue()
+        queue.enqueue(names)
+        for job in queue.lease('worker-1', n=5):
+            queue.complete(job, {'handle': '@x', 'followers': 10, ...})
+    """
+
+    def __init__(self, path=JOB_DB, max_attempts=MAX_ATTEMPTS):
+        self.path = Path(path)
+        self.max_attempts = max_attempts
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        # WAL stays consistent without an fsync per commit; a crash can only
+        # lose the last few lease updates, which then expire and rerun
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def _write(self, statements):
+        """Run (sql, params) pairs in one IMMEDIATE transaction"""
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            cursors = [self.conn.execute(sql, params) for sql, params in statements]
+            counts = [c.rowcount for c in cursors]
+            self.conn.execute('COMMIT')
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+        return counts
+
+    def enqueue(self, names):
+        """Add celebrities not queued before; returns the number added"""
+        names = pd.Series(list(names), dtype=str).str.strip().drop_duplicates()
+        rows = list(zip(names.map(name_key), names))
+        self.conn.execute('BEGIN IMMEDIATE')
+        before = self.conn.total_changes
+        self.conn.executemany("INSERT OR IGNORE INTO jobs (job_id, celebrity_name) VALUES (?, ?)", rows)
+        added = self.conn.total_changes - before
+        self.conn.execute('COMMIT')
+        return added
+
+    def lease(self, worker, n=1, visibility=VISIBILITY):
+        """
+        Lease up to n jobs: queued ones first, then ones whose lease expired
+
+        Jobs that already used max_attempts leases are marked failed
+        instead of being handed out again.
+        """
+        now = time.time()
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            self.conn.execute(
+                "UPDATE jobs SET status = 'failed', error = COALESCE(error, 'lease expired') "
+                "WHERE status = 'leased' AND lease_until < ? AND attempts >= ?", (now, self.max_attempts))
+            rows = self.conn.execute(
+                "SELECT job_id, celebrity_name, attempts FROM jobs "
+                "WHERE status = 'queued' OR (status = 'leased' AND lease_until < ?) "
+                "ORDER BY status DESC, attempts, job_id LIMIT ?", (now, n)).fetchall()
+            jobs = [Job(job_id, name, uuid.uuid4().hex, attempts + 1) for job_id, name, attempts in rows]
+            self.conn.executemany(
+                "UPDATE jobs SET status = 'leased', worker = ?, token = ?, lease_until = ?, "
+                "attempts = attempts + 1 WHERE job_id = ?",
+                [(worker, job.token, now + visibility, job.job_id) for job in jobs])
+            self.conn.execute("UPDATE sessions SET heartbeat = ? WHERE worker = ?", (now, worker))
+            self.conn.execute('COMMIT')
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+        return jobs
+
+    def extend(self, job, visibility=VISIBILITY):
+        """Push a held lease's deadline out; False if the lease was lost"""
+        count, = self._write([(
+            "UPDATE jobs SET lease_until = ? WHERE job_id = ? AND token = ? AND status = 'leased'",
+            (time.time() + visibility, job.job_id, job.token))])
+        return count == 1
+
+    def complete(self, job, result):
+        """
+        Store a job's result if the lease is still held
+
+        Returns:
+            False when the lease had expired and the job was re-leased or
+            finished by someone else (the result is dropped)
+        """
+        count, = self._write([(
+            "UPDATE jobs SET status = 'done', result = ?, error = NULL, finished_at = ?, lease_until = NULL "
+            "WHERE job_id = ? AND token = ? AND status = 'leased'",
+            (json.dumps(result), time.time(), job.job_id, job.token))])
+        return count == 1
+
+    def fail(self, job, error, retry=True):
+        """Give a job back (retry) or mark it failed; False if the lease was lost"""
+        status = 'queued' if retry and job.attempts < self.max_attempts else 'failed'
+        count, = self._write([(
+            "UPDATE jobs SET status = ?, error = ?, lease_until = NULL "
+            "WHERE job_id = ? AND token = ? AND status = 'leased'",
+            (status, str(error)[:200], job.job_id, job.token))])
+        return count == 1
+
+    def release(self, job):
+        """Give a job back without using up an attempt (e.g. rate limited)"""
+        count, = self._write([(
+            "UPDATE jobs SET status = 'queued', attempts = attempts - 1, lease_until = NULL "
+            "WHERE job_id = ? AND token = ? AND status = 'leased'", (job.job_id, job.token))])
+        return count == 1
+
+    def claim_session(self, worker, sessions):
+        """
+        Claim the first session no live worker holds
+
+        Args:
+            sessions: list of (name, proxy) pairs
+        Returns:
+            the claimed (name, proxy), or None if all are taken
+        """
+        now = time.time()
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            self.conn.executemany("INSERT OR IGNORE INTO sessions (name, proxy) VALUES (?, ?)", sessions)
+            for name, proxy in sessions:
+                claimed = self.conn.execute(
+                    "UPDATE sessions SET worker = ?, proxy = ?, heartbeat = ? WHERE name = ? "
+                    "AND (worker IS NULL OR worker = ? OR heartbeat < ?)",
+                    (worker, proxy, now, name, worker, now - SESSION_TIMEOUT)).rowcount
+                if claimed:
+                    self.conn.execute('COMMIT')
+                    return name, proxy
+            self.conn.execute('COMMIT')
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+        return None
+
+    def release_session(self, worker):
+        self._write([("UPDATE sessions SET worker = NULL, heartbeat = NULL WHERE worker = ?", (worker,))])
+
+    def pending(self):
+        """Jobs not yet done or failed"""
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE status IN ('queued', 'leased')").fetchone()[0]
+
+    def status(self):
+        """Job counts by status and per worker"""
+        return pd.read_sql_query(
+            "SELECT status, worker, COUNT(*) AS jobs, SUM(attempts) AS attempts "
+            "FROM jobs GROUP BY status, worker ORDER BY status, worker", self.conn)
+
+    def results(self):
+        """Finished jobs as a scraper results dict {name: {'handle', ...}}"""
+        rows = self.conn.execute(
+            "SELECT celebrity_name, result FROM jobs WHERE status = 'done' ORDER BY job_id").fetchall()
+        return {name: json.loads(result) for name, result in rows}
+
+    def record(self, store, source, platform='instagram'):
+        """Copy finished results into a ProfileStore; returns new observations"""
+        results = self.results()
+        return store.record(results, source=source, platform=platform) if results else 0
+
+    def reset(self, failed_only=False):
+        """Requeue failed jobs (or every job) for another run"""
+        where = "WHERE status = 'failed'" if failed_only else ""
+        self._write([(f"UPDATE jobs SET status = 'queued', attempts = 0, worker = NULL, token = NULL, "
+                      f"lease_until = NULL, result = NULL, error = NULL {where}", ())])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Leased scraping job queue")
+    parser.add_argument('--db', default=str(JOB_DB))
+    commands = parser.add_subparsers(dest='command', required=True)
+    enqueue = commands.add_parser('enqueue', help="queue celebrities (default: every contestant)")
+    enqueue.add_argument('names', nargs='*')
+    commands.add_parser('status', help="job counts by status and worker")
+    record = commands.add_parser('record', help="copy finished results into the profile store")
+    record.add_argument('--source', required=True)
+    reset = commands.add_parser('reset', help="requeue jobs")
+    reset.add_argument('--failed', action='store_true', help="only failed jobs")
+    args = parser.parse_args()
+
+    with JobQueue(args.db) as queue:
+        if args.command == 'enqueue':
+            names = args.names or pd.read_csv(DATA_PATH, usecols=['celebrity_name'])['celebrity_name']
+            print(f"✓ {queue.enqueue(names)} jobs added, {queue.pending()} pending")
+        elif args.command == 'record':
+            from dwts.followers import FollowerStore
+            from dwts.profiles import ProfileStore
+            with ProfileStore(history=FollowerStore()) as store:
+                print(f"✓ {queue.record(store, args.source)} new observations recorded in {store.path.name}")
+        elif args.command == 'reset':
+            queue.reset(failed_only=args.failed)
+            print(f"✓ {queue.pending()} jobs pending")
+        else:
+            print("=" * 80)
+            print(f"JOB QUEUE: {queue.pending()} pending")
+            print("=" * 80)
+            print(queue.status().to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
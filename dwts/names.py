@@ -0,0 +1,321 @@
+"""
+Celebrity name resolution across the data files
+
+The follower sheet, the estimate exports and scraper output all carry a
+celebrity_name that is supposed to equal the one in the main table, but
+spellings drift (non-breaking spaces, "D.L." vs "DL", accents, "Mike" vs
+"Michael") and returning celebrities appear once per season. Joining on
+the raw string either drops rows or, with repeated names on both sides,
+multiplies them (2026_MCM_with_instagram.csv had 447 rows for 421
+contestants).
+
+NameIndex maps any spelling to one canonical name per identity:
+
+    exact       the stripped string is a known spelling
+    normalized  same key after Unicode folding, punctuation / suffix
+                removal, joined initials and nickname expansion
+    initial     same surname and first name or its initial against a
+                single indexed name ("J. Smith" or "John Q. Smith" for
+                "John Smith", "Apolo Ohno" for "Apolo Anton Ohno")
+    fuzzy       best trigram Dice similarity among the names sharing a
+                trigram with the query (the blocking step), if at least
+                THRESHOLD
+
+A query whose two best candidates score within MARGIN of each other is
+reported as ambiguous and left unresolved.
+
+Usage:
+    python -m dwts.names
+    python -m dwts.names scraped_followers.csv
+"""
+
+import argparse
+import re
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import NamedTuple
+
+import pandas as pd
+
+from dwts.data import DATA_DIR, DATA_PATH, load_dwts_data
+
+
+THRESHOLD = 0.75
+MARGIN = 0.05
+INITIAL_SCORE = 0.9
+
+SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv'}
+
+# Short forms mapped to the name used for the key; both sides of a match go
+# through the same table, so only consistency matters
+NICKNAMES = {
+    'alex': 'alexander', 'andy': 'andrew', 'bill': 'william', 'billy': 'william',
+    'bob': 'robert', 'bobby': 'robert', 'chris': 'christopher', 'dan': 'daniel',
+    'danny': 'daniel', 'dave': 'david', 'ed': 'edward', 'eddie': 'edward',
+    'jim': 'james', 'jimmy': 'james', 'joe': 'joseph', 'joey': 'joseph',
+    'jon': 'jonathan', 'kate': 'katherine', 'kathy': 'katherine', 'ken': 'kenneth',
+    'liz': 'elizabeth', 'matt': 'matthew', 'mike': 'michael', 'nick': 'nicholas',
+    'pam': 'pamela', 'rob': 'robert', 'ron': 'ronald', 'sam': 'samuel',
+    'steve': 'steven', 'stephen': 'steven', 'tom': 'thomas', 'tommy': 'thomas',
+    'tony': 'anthony', 'vicky': 'victoria', 'will': 'william',
+}
+
+
+def normalize_name(name):
+    """
+    Lower-case ASCII tokens of a name
+
+    Accents are folded, parenthesized notes ("(Ron)", "(... week 9)") and
+    suffixes (Jr., III) dropped, apostrophes removed (O'Hurley -> ohurley)
+    and runs of single letters joined (D. L. Hughley -> dl hughley).
+    """
+    text = unicodedata.normalize('NFKD', str(name))
+    text = ''.join(c for c in text if not unicodedata.combining(c)).casefold()
+    text = re.sub(r"\(.*?\)", ' ', text).replace('&', ' and ')
+    text = re.sub(r"['’`]", '', text)
+    tokens = [t for t in re.findall(r"[a-z0-9]+", text) if t not in SUFFIXES]
+    joined, initial = [], False
+    for token in tokens:
+        if initial and len(token) == 1 and token.isalpha():
+            joined[-1] += token
+        else:
+            joined.append(token)
+            initial = len(token) == 1 and token.isalpha()
+    return ' '.join(joined)
+
+
+def name_key(name):
+    """normalize_name() with the first name expanded through NICKNAMES"""
+    tokens = normalize_name(name).split()
+    if tokens:
+        tokens[0] = NICKNAMES.get(tokens[0], tokens[0])
+    return ' '.join(tokens)
+
+
+def trigrams(key):
+    """Character trigrams of a key, padded so word boundaries count"""
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameMatch(NamedTuple):
+    query: str
+    name: str | None      # canonical name, None if unmatched or ambiguous
+    score: float
+    method: str | None    # exact / normalized / initial / fuzzy
+    ambiguous: bool
+    candidates: tuple     # (name, score) of the best few, best first
+
+
+class NameIndex:
+    """
+    Canonical celebrity names with exact, normalized and trigram lookup
+
+    The first spelling seen for a key is its canonical name; later
+    spellings with the same key are recorded as aliases.
+
+    Example:
+        index = NameIndex(df['celebrity_name'])
+        index.match('D.L. Hughley').name          # 'D. L. Hughley'
+        index.resolve(ig_data['celebrity_name'])  # one row per query
+    """
+
+    def __init__(self, names=()):
+        self.names = []                    # id -> canonical name
+        self.keys = []                     # id -> key
+        self._spellings = {}               # stripped spelling -> id
+        self._by_key = {}                  # key -> id
+        self._grams = defaultdict(list)    # trigram -> ids (blocking)
+        self._gram_sets = []               # id -> trigram set
+        self._by_last = defaultdict(list)  # surname token -> ids
+        for name in names:
+            self.add(name)
+
+    @classmethod
+    def from_data(cls, path=DATA_PATH):
+        """Index of every celebrity in the main table"""
+        return cls(load_dwts_data(path)['celebrity_name'])
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, name):
+        """Register a spelling; returns its identity id"""
+        spelling = str(name).strip()
+        if spelling in self._spellings:
+            return self._spellings[spelling]
+        key = name_key(spelling)
+        ident = self._by_key.get(key)
+        if ident is None:
+            ident = len(self.names)
+            self.names.append(spelling)
+            self.keys.append(key)
+            self._by_key[key] = ident
+            grams = trigrams(key)
+            self._gram_sets.append(grams)
+            for gram in grams:
+                self._grams[gram].append(ident)
+            tokens = key.split()
+            if len(tokens) > 1:
+                self._by_last[tokens[-1]].append(ident)
+        self._spellings[spelling] = ident
+        return ident
+
+    def candidates(self, key, limit=5):
+        """(id, score) of names sharing a trigram with key, best first"""
+        grams = trigrams(key)
+        shared = Counter(i for gram in grams for i in self._grams.get(gram, ()))
+        scored = [(i, 2 * n / (len(grams) + len(self._gram_sets[i]))) for i, n in shared.items()]
+        return sorted(scored, key=lambda item: (-item[1], self.names[item[0]]))[:limit]
+
+    def match(self, name, threshold=THRESHOLD, margin=MARGIN):
+        """Resolve one spelling to a NameMatch"""
+        query = str(name)
+        spelling = query.strip()
+        if spelling in self._spellings:
+            ident = self._spellings[spelling]
+            return NameMatch(query, self.names[ident], 1.0, 'exact', False, ((self.names[ident], 1.0),))
+        key = name_key(spelling)
+        if key in self._by_key:
+            ident = self._by_key[key]
+            return NameMatch(query, self.names[ident], 1.0, 'normalized', False, ((self.names[ident], 1.0),))
+
+        tokens = key.split()
+        if len(tokens) > 1:
+            first = tokens[0]
+            same_initial = [i for i in self._by_last.get(tokens[-1], ())
+                            if self.keys[i].split()[0] == first
+                            or (len(first) == 1 and self.keys[i].startswith(first))]
+            if same_initial:
+                found = tuple((self.names[i], INITIAL_SCORE) for i in same_initial)
+                if len(same_initial) == 1:
+                    return NameMatch(query, found[0][0], INITIAL_SCORE, 'initial', False, found)
+                return NameMatch(query, None, INITIAL_SCORE, 'initial', True, found)
+
+        scored = self.candidates(key)
+        found = tuple((self.names[i], round(s, 3)) for i, s in scored)
+        if not scored or scored[0][1] < threshold:
+            return NameMatch(query, None, scored[0][1] if scored else 0.0, None, False, found)
+        if len(scored) > 1 and scored[1][1] >= threshold and scored[0][1] - scored[1][1] < margin:
+            return NameMatch(query, None, scored[0][1], 'fuzzy', True, found)
+        return NameMatch(query, self.names[scored[0][0]], scored[0][1], 'fuzzy', False, found)
+
+    def resolve(self, names, threshold=THRESHOLD, margin=MARGIN):
+        """
+        Resolve many spellings, each distinct one matched once
+
+        Returns:
+            DataFrame with query, name, score, method, ambiguous and
+            candidates, indexed like names
+        """
+        names = pd.Series(names)
+        distinct = {n: self.match(n, threshold, margin) for n in pd.unique(names.astype(str))}
+        return pd.DataFrame([distinct[n] for n in names.astype(str)], index=names.index,
+                            columns=NameMatch._fields)
+
+    def celebrity_ids(self, names):
+        """
+        Stable ids for storage: name_key of each name's canonical spelling
+
+        Unresolved names keep the key of their own spelling.
+        """
+        resolved = self.resolve(names)
+        spelling = pd.Series(names, index=resolved.index).astype(str).str.strip()
+        return resolved['name'].fillna(spelling).map(name_key)
+
+    def near_duplicates(self, threshold=THRESHOLD):
+        """
+        Pairs of distinct identities in the index that look alike
+
+        Either one person under two spellings the normalization missed, or
+        two people a fuzzy match could confuse.
+
+        Returns:
+            DataFrame with name, other and score, most similar first
+        """
+        rows = []
+        for i, key in enumerate(self.keys):
+            for j, score in self.candidates(key, limit=len(self.names)):
+                if j > i and score >= threshold:
+                    rows.append({'name': self.names[i], 'other': self.names[j], 'score': round(score, 3)})
+        return pd.DataFrame(rows, columns=['name', 'other', 'score']).sort_values(
+            'score', ascending=False, ignore_index=True)
+
+
+def resolution_summary(resolved):
+    """Count of queries per method, plus unmatched and ambiguous"""
+    method = resolved['method'].fillna('unmatched').where(~resolved['ambiguous'], 'ambiguous')
+    return method.value_counts()
+
+
+def join_by_name(df, other, columns, index=None, name_col='celebrity_name'):
+    """
+    Left-join columns of other onto df through resolved celebrity names
+
+    Names in other are resolved against df's (or a given index), and
+    unmatched and ambiguous rows are dropped. An identity with one row in
+    other is joined to all of its rows in df. An identity other lists
+    several times (a celebrity on two seasons) is joined by occurrence: its
+    k-th row in other goes to its k-th row in df, in row order, and rows
+    of df past the last occurrence in other get no value. The join never
+    adds rows to df.
+
+    Returns:
+        (joined DataFrame, resolution table for other's rows)
+    """
+    if index is None:
+        index = NameIndex(df[name_col])
+    resolved = index.resolve(other[name_col])
+    right = other[columns].assign(_resolved=resolved['name'].to_numpy()).dropna(subset=['_resolved'])
+    right['_occurrence'] = right.groupby('_resolved').cumcount()
+    repeated = right['_resolved'].duplicated(keep=False)
+    right.loc[~repeated, '_occurrence'] = -1
+
+    left = df.assign(_resolved=index.resolve(df[name_col])['name'].to_numpy())
+    left['_occurrence'] = left.groupby('_resolved', dropna=False).cumcount().where(
+        left['_resolved'].isin(right.loc[repeated, '_resolved']), -1)
+    joined = left.merge(right, on=['_resolved', '_occurrence'], how='left', validate='many_to_one')
+    joined.index = df.index
+    return joined.drop(columns=['_resolved', '_occurrence']), resolved
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolve celebrity names in data files against the main table")
+    parser.add_argument('paths', nargs='*', help="CSVs with a celebrity_name column (default: data/*.csv)")
+    parser.add_argument('--threshold', type=float, default=THRESHOLD)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = NameIndex.from_data()
+    print("=" * 80)
+    print(f"NAME INDEX: {len(index)} identities ({time.perf_counter() - start:.3f}s)")
+    print("=" * 80)
+
+    paths = args.paths or [p for p in sorted(DATA_DIR.glob('*.csv')) if p != DATA_PATH]
+    for path in paths:
+        frame = pd.read_csv(path)
+        if 'celebrity_name' not in frame.columns:
+            continue
+        start = time.perf_counter()
+        resolved = index.resolve(frame['celebrity_name'], args.threshold)
+        elapsed = time.perf_counter() - start
+        counts = resolution_summary(resolved)
+        print(f"\n{Path(path).name}: {len(frame)} rows, "
+              f"{resolved['name'].nunique()} identities ({elapsed:.3f}s)")
+        print("  " + ", ".join(f"{method} {n}" for method, n in counts.items()))
+        inexact = resolved[resolved['method'].ne('exact')].drop_duplicates('query')
+        for match in inexact.itertuples(index=False):
+            label = 'AMBIGUOUS' if match.ambiguous else (match.method or 'UNMATCHED')
+            print(f"  {label:10s} {match.query!r} -> {match.name!r} "
+                  f"{[c for c, _ in match.candidates[:3]]}")
+
+    near = index.near_duplicates(args.threshold)
+    print(f"\nLook-alike identities in the main table (score >= {args.threshold}): {len(near)}")
+    if len(near):
+        print(near.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
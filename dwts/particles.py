@@ -0,0 +1,270 @@
+"""
+Particle filter for week-by-week fan popularity
+
+The HMC fit in dwts.bayes refits every season from scratch. A season's
+evidence arrives one week at a time, so a filter can carry the posterior
+forward instead: N particles of latent popularity per couple (float32, one
+row per particle), and each week:
+
+    1. drift: popularity += tau * sqrt(weeks since the last update) * N(0, 1)
+       for the couples still dancing
+    2. fan shares = softmax(popularity) over the couples dancing
+    3. reweight by the probability of the observed elimination under the
+       season's rule, using combine() on all particles at once and the same
+       softmin likelihood as dwts.bayes (bottom two from season 28)
+    4. systematic resampling when the effective sample size drops below
+       half of N
+
+A week costs O(N * couples) regardless of how many weeks came before, so
+a live season is updated by calling update() once per new week, with the
+season's own week number (weeks without scores are simply not passed).
+
+Usage:
+    python -m dwts.particles --particles 100000 --seasons 27 28
+"""
+
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from dwts.bayes import KAPPA_PERCENT, KAPPA_RANK
+from dwts.combine import JUDGES_SAVE_FROM, combine, voting_rule
+from dwts.data import DATA_PATH, IG_PATH, load_dwts_data, load_instagram_followers
+from dwts.reshape import reshape_long
+
+
+DRIFT = 0.3             # week-to-week popularity step (log scale)
+FOLLOWERS_WEIGHT = 0.5  # prior mean popularity per standard deviation of log_followers
+
+
+def systematic_resample(weights, rng):
+    """Indices drawn by systematic resampling from normalized weights"""
+    n = len(weights)
+    positions = (rng.random() + np.arange(n)) / n
+    cumulative = np.cumsum(weights)
+    cumulative[-1] = 1.0
+    return np.searchsorted(cumulative, positions)
+
+
+def elimination_loglik(scores, eliminated, bottom_two=False):
+    """
+    Log probability of the eliminated couples for every particle
+
+    Args:
+        scores: CombinedScores over one week, arrays of shape (particles, couples)
+        eliminated: bool mask over couples
+        bottom_two: judges' save; each eliminated couple only needs to be
+            in the bottom two
+
+    Returns:
+        (particles,) log-likelihood
+    """
+    from scipy.special import logsumexp
+
+    badness = np.where(scores.uses_rank, KAPPA_RANK * scores.combined, -KAPPA_PERCENT * scores.combined)
+    logits = badness - badness.max(axis=1, keepdims=True)
+    logp = logits - logsumexp(logits, axis=1, keepdims=True)
+    loglik = logp[:, eliminated].sum(axis=1)
+    if bottom_two:
+        p = np.exp(logp)
+        odds = p / np.maximum(1 - p, 1e-12)
+        for e in np.flatnonzero(eliminated):
+            loglik += np.log1p(odds.sum(axis=1) - odds[:, e])
+    return loglik
+
+
+class SeasonFilter:
+    """
+    Weighted fan-popularity particles for one season
+
+    Example:
+        filt = SeasonFilter(names, season=27, n_particles=100_000)
+        filt.update(1, {'Bobby Bones': 21, ...}, eliminated=['Nancy McKeon'])
+        filt.summary()
+    """
+
+    def __init__(self, names, season, n_particles=10_000, prior_mean=None, drift=DRIFT, seed=0):
+        self.names = list(names)
+        self.season = int(season)
+        self.rule = voting_rule(season)
+        self.judges_save = self.season >= JUDGES_SAVE_FROM
+        self.drift = np.float32(drift)
+        self.rng = np.random.default_rng(seed)
+        self._col = {name: i for i, name in enumerate(self.names)}
+
+        mean = np.zeros(len(self.names), np.float32) if prior_mean is None else np.asarray(prior_mean, np.float32)
+        self.popularity = mean + self.rng.standard_normal((n_particles, len(self.names)), dtype=np.float32)
+        self.log_weights = np.zeros(n_particles)
+        self.log_evidence = 0.0
+        self.week = 0           # last week assimilated (0: none yet)
+        self.history = []
+
+    @property
+    def n_particles(self):
+        return len(self.log_weights)
+
+    def weights(self):
+        from scipy.special import logsumexp
+
+        return np.exp(self.log_weights - logsumexp(self.log_weights))
+
+    def ess(self):
+        w = self.weights()
+        return 1 / np.sum(w ** 2)
+
+    def update(self, week, judge, eliminated=(), final=False):
+        """
+        Assimilate one week
+
+        Args:
+            week: the season's week number; summaries are labelled with it,
+                and the drift covers every week since the last update
+            judge: dict couple -> judge total for every couple dancing
+            eliminated: couples voted out this week
+            final: the judges' save does not apply in the final
+
+        Returns:
+            this week's summary rows (see summary())
+
+        Raises:
+            ValueError: week is not after the last week assimilated
+        """
+        from scipy.special import logsumexp
+
+        week = int(week)
+        if week <= self.week:
+            raise ValueError(f"Week {week} given after week {self.week}")
+
+        names = list(judge)
+        cols = np.array([self._col[n] for n in names])
+        totals = np.array([judge[n] for n in names], dtype=np.float64)
+        out = np.isin(names, list(eliminated))
+
+        if self.week > 0:
+            step = self.drift * np.float32(np.sqrt(week - self.week))
+            self.popularity[:, cols] += step * self.rng.standard_normal(
+                (self.n_particles, len(cols)), dtype=np.float32)
+        self.week = week
+
+        logits = self.popularity[:, cols]
+        shares = np.exp(logits - logits.max(axis=1, keepdims=True))
+        shares /= shares.sum(axis=1, keepdims=True)
+
+        if out.any():
+            scores = combine(totals, shares, [0, len(cols)], [self.rule])
+            loglik = elimination_loglik(scores, out, bottom_two=self.judges_save and not final)
+            normalized = self.log_weights - logsumexp(self.log_weights)
+            self.log_evidence += float(logsumexp(normalized + loglik))
+            self.log_weights = normalized + loglik
+
+        w = self.weights()
+        mean = w @ shares
+        rows = [{
+            'season': self.season, 'week': self.week, 'celebrity_name': name,
+            'fan_share_mean': float(mean[j]),
+            'fan_share_sd': float(np.sqrt(w @ (shares[:, j] - mean[j]) ** 2)),
+            'ess': float(1 / np.sum(w ** 2)),
+        } for j, name in enumerate(names)]
+        self.history.extend(rows)
+
+        if rows[0]['ess'] < self.n_particles / 2:
+            keep = systematic_resample(w, self.rng)
+            self.popularity = self.popularity[keep]
+            self.log_weights = np.zeros(self.n_particles)
+        return rows
+
+    def summary(self):
+        """Per-week weighted posterior mean / sd of each couple's fan share"""
+        return pd.DataFrame(self.history)
+
+
+def _season_inputs(long, season):
+    weeks = long[(long['season'] == season) & long['active']].sort_values(['week', 'row'])
+    for week, wk in weeks.groupby('week', sort=True):
+        yield (week, dict(zip(wk['celebrity_name'], wk['judge_total'])),
+               wk.loc[wk['eliminated_this_week'], 'celebrity_name'].tolist(),
+               bool(wk['final_week'].iat[0]))
+
+
+def filter_season(long, season, n_particles=10_000, prior_mean=None, seed=0):
+    """Run a SeasonFilter through every week of one season"""
+    names = long.loc[long['season'] == season].drop_duplicates('row')['celebrity_name'].tolist()
+    filt = SeasonFilter(names, season, n_particles, prior_mean, seed=seed)
+    for week, judge, eliminated, final in _season_inputs(long, season):
+        filt.update(week, judge, eliminated, final)
+    return filt
+
+
+def _prior_means(df, ig_data):
+    """Prior mean popularity per wide-table row from standardized log_followers"""
+    followers = df[['celebrity_name']].merge(ig_data, on='celebrity_name', how='left')['follower_count']
+    logf = np.log10(followers.to_numpy(np.float64) + 1)
+    z = (logf - np.nanmean(logf)) / np.nanstd(logf)
+    return pd.Series(FOLLOWERS_WEIGHT * np.nan_to_num(z), index=df.index)
+
+
+def _filter_task(args):
+    long, season, n_particles, prior_mean, seed = args
+    start = time.perf_counter()
+    filt = filter_season(long, season, n_particles, prior_mean, seed)
+    return filt.summary(), filt.log_evidence, time.perf_counter() - start
+
+
+def filter_all(seasons=None, n_particles=10_000, n_jobs=1, seed=0):
+    """
+    Filter every season independently, seasons spread over processes
+
+    Returns:
+        (summary DataFrame, DataFrame of season, log_evidence, seconds)
+    """
+    df = load_dwts_data(DATA_PATH)
+    long = reshape_long(df, report=False)
+    prior = _prior_means(df, load_instagram_followers(IG_PATH))
+    seasons = seasons or sorted(long['season'].unique())
+    seeds = np.random.SeedSequence(seed).spawn(len(seasons))
+    tasks = []
+    for season, s in zip(seasons, seeds):
+        season_long = long[long['season'] == season]
+        rows = season_long.drop_duplicates('row')['row']
+        tasks.append((season_long, season, n_particles, prior.iloc[rows.to_numpy()].to_numpy(), s))
+
+    if n_jobs == 1:
+        results = [_filter_task(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            results = list(pool.map(_filter_task, tasks))
+    summary = pd.concat([r[0] for r in results], ignore_index=True)
+    stats = pd.DataFrame({
+        'season': seasons,
+        'log_evidence': [r[1] for r in results],
+        'seconds': [r[2] for r in results],
+    })
+    return summary, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Week-by-week particle filter for fan shares")
+    parser.add_argument('--particles', type=int, default=10_000)
+    parser.add_argument('--seasons', type=int, nargs='+')
+    parser.add_argument('--jobs', type=int, default=1, help="worker processes")
+    parser.add_argument('--output', help="optional CSV path for the weekly summary")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"FAN SHARE PARTICLE FILTER ({args.particles:,} particles per season)")
+    print("=" * 80)
+    summary, stats = filter_all(args.seasons, args.particles, args.jobs)
+    weeks = summary.groupby('season')['week'].max()
+    stats['ms_per_week'] = 1000 * stats['seconds'] / stats['season'].map(weeks)
+    print(stats.round(3).to_string(index=False))
+
+    if args.output:
+        summary.to_csv(args.output, index=False)
+        print(f"\n✓ Weekly summary saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
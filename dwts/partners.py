@@ -0,0 +1,231 @@
+"""
+Incremental pro-dancer statistics
+
+pro_dancer_analysis.csv (appearances, avg_placement, win_rate, top3_rate, ...)
+used to be rebuilt with a full groupby('ballroom_partner') pass in several
+notebooks. PartnerStatsIndex keeps running sufficient statistics per pro
+instead, so that:
+
+    - appending a season is O(1) per contestant
+    - leave-one-out stats (excluding a contestant's own result) are O(1)
+    - as-of-season stats (only seasons before N) are a bisect per pro
+
+which is what point-in-time features need to avoid leaking a contestant's
+own placement into their partner features.
+"""
+
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass, field, replace
+
+import numpy as np
+import pandas as pd
+
+from dwts.data import average_judge_score
+
+
+# Output names used by 02_feature_engineering for the per-contestant features
+FEATURE_COLUMNS = {
+    'appearances': 'partner_appearances',
+    'avg_placement': 'partner_avg_placement',
+    'best_placement': 'partner_best',
+    'worst_placement': 'partner_worst',
+    'avg_judge_score': 'partner_avg_judge_score',
+    'wins': 'partner_wins',
+    'win_rate': 'partner_win_rate',
+    'top3_rate': 'partner_top3_rate',
+}
+
+
+@dataclass
+class PartnerTotals:
+    """Sufficient statistics for one pro dancer"""
+    appearances: int = 0
+    placement_sum: float = 0.0
+    placement_sq_sum: float = 0.0
+    judge_sum: float = 0.0
+    judge_count: int = 0
+    wins: int = 0
+    top3_finishes: int = 0
+    # Placements are small integers, so a histogram gives min/max that
+    # survive removing a single result
+    placement_counts: Counter = field(default_factory=Counter)
+
+    def copy(self):
+        return replace(self, placement_counts=Counter(self.placement_counts))
+
+    def add(self, placement, judge_score=np.nan, sign=1):
+        self.appearances += sign
+        self.placement_sum += sign * placement
+        self.placement_sq_sum += sign * placement ** 2
+        if not np.isnan(judge_score):
+            self.judge_sum += sign * judge_score
+            self.judge_count += sign
+        self.wins += sign * (placement == 1)
+        self.top3_finishes += sign * (placement <= 3)
+        self.placement_counts[placement] += sign
+        if self.placement_counts[placement] == 0:
+            del self.placement_counts[placement]
+
+    def summary(self):
+        """Stats in the pro_dancer_analysis.csv column layout"""
+        n = self.appearances
+        if n == 0:
+            return dict.fromkeys(
+                ['appearances', 'avg_placement', 'best_placement', 'worst_placement',
+                 'placement_std', 'avg_judge_score', 'top3_finishes', 'wins',
+                 'win_rate', 'top3_rate'], np.nan) | {'appearances': 0}
+        mean = self.placement_sum / n
+        if n > 1:
+            var = max(self.placement_sq_sum - n * mean ** 2, 0.0) / (n - 1)
+            std = np.sqrt(var)
+        else:
+            std = np.nan
+        return {
+            'appearances': n,
+            'avg_placement': mean,
+            'best_placement': min(self.placement_counts),
+            'worst_placement': max(self.placement_counts),
+            'placement_std': std,
+            'avg_judge_score': self.judge_sum / self.judge_count if self.judge_count else np.nan,
+            'top3_finishes': self.top3_finishes,
+            'wins': self.wins,
+            'win_rate': self.wins / n,
+            'top3_rate': self.top3_finishes / n,
+        }
+
+
+class PartnerStatsIndex:
+    """
+    Running per-pro statistics with leave-one-out and as-of-season queries
+
+    Seasons must be appended in non-decreasing order. For each pro the index
+    keeps one cumulative snapshot per season they appeared in; the last one
+    is the live running total.
+
+    Example:
+        index = PartnerStatsIndex.from_frame(df)
+        index.stats('Derek Hough')
+        index.stats('Derek Hough', as_of=20)   # seasons 1-19 only
+        index.leave_one_out('Derek Hough', placement=1, judge_score=27.5)
+    """
+
+    def __init__(self):
+        self._seasons = {}    # pro -> [season, ...]
+        self._snapshots = {}  # pro -> [PartnerTotals after that season, ...]
+        self.last_season = None
+
+    @classmethod
+    def from_frame(cls, df):
+        """Build the index from a wide DWTS table, season by season"""
+        index = cls()
+        for _, season_df in df.sort_values('season', kind='stable').groupby('season', sort=True):
+            index.add_season(season_df)
+        return index
+
+    def add(self, partner, season, placement, judge_score=np.nan):
+        """Record one contestant result; O(1)"""
+        if self.last_season is not None and season < self.last_season:
+            raise ValueError(
+                f"Season {season} appended after season {self.last_season}; "
+                "as-of queries need seasons in order")
+        self.last_season = season
+
+        seasons = self._seasons.setdefault(partner, [])
+        snapshots = self._snapshots.setdefault(partner, [])
+        if not seasons or seasons[-1] != season:
+            seasons.append(season)
+            snapshots.append(snapshots[-1].copy() if snapshots else PartnerTotals())
+        snapshots[-1].add(placement, judge_score)
+
+    def add_season(self, season_df):
+        """Append every contestant of one season (wide-table rows)"""
+        if 'avg_judge_score' in season_df.columns:
+            judge = season_df['avg_judge_score']
+        else:
+            judge = average_judge_score(season_df)
+        for partner, season, placement, score in zip(
+                season_df['ballroom_partner'], season_df['season'],
+                season_df['placement'], judge):
+            self.add(partner, int(season), placement, float(score))
+
+    def partners(self):
+        return list(self._snapshots)
+
+    def totals(self, partner, as_of=None):
+        """
+        Sufficient statistics for a pro
+
+        Args:
+            partner: pro dancer name
+            as_of: if given, only seasons strictly before this one count
+        """
+        snapshots = self._snapshots.get(partner)
+        if not snapshots:
+            return PartnerTotals()
+        if as_of is None:
+            return snapshots[-1]
+        pos = bisect_left(self._seasons[partner], as_of)
+        return snapshots[pos - 1] if pos > 0 else PartnerTotals()
+
+    def stats(self, partner, as_of=None):
+        return self.totals(partner, as_of).summary()
+
+    def leave_one_out(self, partner, placement, judge_score=np.nan, as_of=None, season=None):
+        """
+        Stats for a pro with one contestant's own result removed
+
+        With as_of, pass the contestant's season: a result from as_of or
+        later is not in the as-of totals, so nothing is removed.
+
+        Raises:
+            ValueError: as_of without season, or a placement the totals
+                do not contain
+        """
+        if as_of is not None:
+            if season is None:
+                raise ValueError("leave_one_out with as_of needs the contestant's season")
+            if season >= as_of:
+                return self.stats(partner, as_of)
+        totals = self.totals(partner, as_of).copy()
+        if totals.placement_counts[placement] <= 0:
+            raise ValueError(f"{partner} has no recorded result with placement {placement}")
+        totals.add(placement, judge_score, sign=-1)
+        return totals.summary()
+
+    def to_frame(self, min_appearances=0, exclude_guests=True, as_of=None):
+        """
+        Table in the pro_dancer_analysis.csv layout
+
+        Args:
+            min_appearances: drop pros with fewer appearances
+            exclude_guests: drop one-off partners such as
+                "Witney Carson (Xoshitl Gomez week 9)"
+            as_of: only count seasons before this one
+        """
+        rows = [{'ballroom_partner': p, **self.stats(p, as_of)} for p in self._snapshots]
+        table = pd.DataFrame(rows)
+        if exclude_guests:
+            table = table[~table['ballroom_partner'].str.contains('week', case=False, na=False)]
+        table = table[table['appearances'] >= max(min_appearances, 1)]
+        return table.sort_values('appearances', ascending=False).round(3).reset_index(drop=True)
+
+    def _feature_frame(self, df, stats_for_row):
+        judge = df['avg_judge_score'] if 'avg_judge_score' in df.columns else average_judge_score(df)
+        rows = [stats_for_row(p, int(s), pl, float(j)) for p, s, pl, j in zip(
+            df['ballroom_partner'], df['season'], df['placement'], judge)]
+        features = pd.DataFrame(rows, index=df.index)[list(FEATURE_COLUMNS)]
+        return features.rename(columns=FEATURE_COLUMNS)
+
+    def point_in_time_features(self, df):
+        """
+        Partner features using only seasons before each contestant's season
+
+        Safe for predicting a season from its past; a pro's first season
+        gets NaN features.
+        """
+        return self._feature_frame(df, lambda p, s, pl, j: self.stats(p, as_of=s))
+
+    def leave_one_out_features(self, df):
+        """Partner features over all seasons, excluding each contestant's own result"""
+        return self._feature_frame(df, lambda p, s, pl, j: self.leave_one_out(p, pl, j))
@@ -0,0 +1,428 @@
+"""
+Notebook pipeline: dependency DAG, parallel execution and result caching
+
+The notebooks hand results to each other through CSV files written as side
+effects (e.g. 05 writes 2026_MCM_with_instagram.csv). Each notebook's inputs and outputs are read
+from its code cells: the path arguments of pandas readers (read_csv,
+read_parquet, ...) and writers (to_csv, to_parquet, ...), given as literals,
+Path(literal) or names assigned such a value in an earlier cell, plus the
+dwts loaders and path constants (the ProfileStore database included). A notebook depends on every notebook
+that writes one of its inputs.
+
+A notebook's cache key hashes its code cells (markdown edits do not count),
+the contents of its input files and the source of the dwts modules it
+imports, directly or through other dwts modules. Notebooks run in worker processes
+(one fresh process each, cwd = notebooks/, matplotlib on Agg) as soon as
+their upstream notebooks finish, and a notebook whose key is unchanged is
+skipped; its outputs are restored from the cache if they were deleted or
+overwritten since.
+
+Cell-level caching is not attempted: the cells of a notebook share one
+namespace of in-memory objects, so the notebook is the smallest unit whose
+results (its output files) can be reused safely.
+
+Usage:
+    python -m dwts.pipeline                 # run what is out of date
+    python -m dwts.pipeline --dry-run       # show the DAG and the plan
+    python -m dwts.pipeline 04_placement_feature_analysis --force --jobs 2
+"""
+
+import argparse
+import ast
+import contextlib
+import hashlib
+import importlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+NOTEBOOK_DIR = ROOT / 'notebooks'
+PIPELINE_DIR = ROOT / '.cache' / 'pipeline'
+
+READERS = {'read_csv', 'read_parquet', 'read_excel', 'read_json', 'read_table', 'import_csv'}
+WRITERS = {'to_csv', 'to_parquet', 'to_excel', 'to_json'}
+
+# dwts loaders and the (module, path constant) each one reads when called
+# without arguments
+LOADERS = {
+    'load_dwts_data': ('dwts.data', 'DATA_PATH'),
+    'load_instagram_followers': ('dwts.data', 'IG_PATH'),
+    'ProfileStore': ('dwts.profiles', 'PROFILE_DB'),
+}
+
+
+class NotebookError(RuntimeError):
+    """A notebook cell raised while the pipeline was executing it"""
+
+
+def code_cells(path):
+    """(cell index, source) for the code cells of a notebook"""
+    cells = json.loads(Path(path).read_text(encoding='utf-8'))['cells']
+    return [(i, ''.join(c['source'])) for i, c in enumerate(cells) if c['cell_type'] == 'code']
+
+
+def _path_value(node, names):
+    """String value of a path expression, or None if it is not static"""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, ast.Name):
+        return names.get(node.id)
+    if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+            and node.func.id == 'Path' and len(node.args) == 1):
+        return _path_value(node.args[0], names)
+    return None
+
+
+def notebook_io(path):
+    """
+    Files a notebook reads and writes
+
+    Returns:
+        (inputs, outputs): sets of resolved Paths; a file the notebook writes
+        itself is not counted as an input
+    """
+    path = Path(path)
+    names, inputs, outputs = {}, set(), set()
+    for _, source in code_cells(path):
+        try:
+            tree = ast.parse(source)
+        except SyntaxError:
+            continue
+        # Statements in order so a name resolves to its latest assignment
+        for stmt in tree.body:
+            for node in ast.walk(stmt):
+                if isinstance(node, ast.ImportFrom) and node.module and node.module.split('.')[0] == 'dwts':
+                    module = importlib.import_module(node.module)
+                    for alias in node.names:
+                        if isinstance(getattr(module, alias.name, None), Path):
+                            names[alias.asname or alias.name] = str(getattr(module, alias.name))
+                if not isinstance(node, ast.Call):
+                    continue
+                func = node.func.attr if isinstance(node.func, ast.Attribute) else getattr(node.func, 'id', None)
+                if func in LOADERS:
+                    if node.args:
+                        value = _path_value(node.args[0], names)
+                    else:
+                        module, constant = LOADERS[func]
+                        value = str(getattr(importlib.import_module(module), constant))
+                    target = inputs
+                elif node.args and (func in READERS or func in WRITERS):
+                    value = _path_value(node.args[0], names)
+                    target = inputs if func in READERS else outputs
+                else:
+                    continue
+                if value is not None:
+                    target.add((path.parent / value).resolve())
+            if isinstance(stmt, ast.Assign):
+                value = _path_value(stmt.value, names)
+                for t in stmt.targets:
+                    if isinstance(t, ast.Name) and value is not None:
+                        names[t.id] = value
+    return inputs - outputs, outputs
+
+
+def _imported_modules(tree):
+    """Names of the dwts modules a parsed source imports, anywhere in it"""
+    from dwts import _EXPORTS
+
+    found = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            found.update(a.name for a in node.names if a.name.split('.')[0] == 'dwts')
+        elif isinstance(node, ast.ImportFrom) and node.module and node.module.split('.')[0] == 'dwts':
+            found.add(node.module)
+            if node.module == 'dwts':
+                found.update(_EXPORTS.get(a.name, f"dwts.{a.name}") for a in node.names)
+    # Importing dwts.x runs dwts/__init__.py first
+    return found | {'dwts'} if found else found
+
+
+def dwts_sources(path):
+    """
+    Source files of the dwts modules a notebook runs
+
+    Follows the imports of each dwts module it reaches, including imports
+    inside functions, so a helper used only through another module counts.
+    """
+    todo = set()
+    for _, source in code_cells(path):
+        try:
+            todo |= _imported_modules(ast.parse(source))
+        except SyntaxError:
+            continue
+    files = {}
+    while todo:
+        name = todo.pop()
+        if name in files:
+            continue
+        file = ROOT.joinpath(*name.split('.'))
+        file = file / '__init__.py' if file.is_dir() else file.with_suffix('.py')
+        if not file.exists():
+            continue
+        files[name] = file
+        todo |= _imported_modules(ast.parse(file.read_text(encoding='utf-8')))
+    return sorted(files.values())
+
+
+def build_dag(notebooks):
+    """
+    Upstream notebooks of each notebook
+
+    Args:
+        notebooks: notebook paths
+
+    Returns:
+        (dag, io): dag maps notebook stem -> set of upstream stems, io maps
+        stem -> (inputs, outputs)
+
+    Raises:
+        ValueError: two notebooks write the same file, or the DAG has a cycle
+    """
+    io = {Path(nb).stem: notebook_io(nb) for nb in notebooks}
+    writer = {}
+    for name, (_, outputs) in io.items():
+        for out in outputs:
+            if out in writer:
+                raise ValueError(f"{out.name} is written by both {writer[out]} and {name}")
+            writer[out] = name
+    dag = {name: {writer[f] for f in inputs if f in writer} for name, (inputs, _) in io.items()}
+    topological_order(dag)
+    return dag, io
+
+
+def topological_order(dag):
+    """Notebook stems with every notebook after its upstream notebooks"""
+    order, state = [], {}
+
+    def visit(name, trail):
+        if state.get(name) == 'done':
+            return
+        if state.get(name) == 'visiting':
+            raise ValueError(f"Notebook dependency cycle: {' -> '.join(trail + [name])}")
+        state[name] = 'visiting'
+        for up in sorted(dag[name]):
+            visit(up, trail + [name])
+        state[name] = 'done'
+        order.append(name)
+
+    for name in sorted(dag):
+        visit(name, [])
+    return order
+
+
+def _file_hash(path):
+    return hashlib.sha1(Path(path).read_bytes()).hexdigest()
+
+
+def notebook_key(path, inputs, sources=()):
+    """
+    Hash of a notebook's code cells, its input files and the dwts sources
+
+    A non-empty SQLite write-ahead log (<name>-wal) is hashed with its
+    database, since committed rows can sit there until a checkpoint; an
+    empty one (left by readers) changes nothing.
+    """
+    h = hashlib.sha1()
+    for _, source in code_cells(path):
+        h.update(source.encode())
+        h.update(b'\0')
+    for f in sorted(inputs) + [Path(f) for f in sources]:
+        h.update(str(f.relative_to(ROOT) if f.is_relative_to(ROOT) else f).encode())
+        h.update(_file_hash(f).encode() if f.exists() else b'missing')
+        wal = f.with_name(f"{f.name}-wal")
+        if wal.exists() and wal.stat().st_size:
+            h.update(_file_hash(wal).encode())
+    return h.hexdigest()[:16]
+
+
+def execute_notebook(path, log_path):
+    """
+    Run a notebook's code cells in order in one namespace
+
+    Stdout and stderr go to log_path. Meant to run in a fresh worker process:
+    it changes directory to the notebook's folder, as Jupyter would.
+
+    Returns:
+        list of (cell index, seconds)
+    """
+    path = Path(path)
+    os.environ['MPLBACKEND'] = 'Agg'
+    os.chdir(path.parent)
+    namespace = {'__name__': '__main__'}
+    timings = []
+    with open(log_path, 'w', encoding='utf-8') as log, \
+            contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+        for index, source in code_cells(path):
+            start = time.perf_counter()
+            try:
+                exec(compile(source, f"{path.name}[{index}]", 'exec'), namespace)
+            except Exception as exc:
+                raise NotebookError(f"{path.name} cell {index}: {type(exc).__name__}: {exc}") from None
+            timings.append((index, time.perf_counter() - start))
+    return timings
+
+
+class NotebookPipeline:
+    """
+    Run notebooks in dependency order, skipping the ones that are up to date
+
+    Layout:
+        <root>/manifest.json   (per notebook: cache key, output file hashes)
+        <root>/blobs/<sha1>    (cached copies of output files)
+        <root>/logs/<name>.log (captured output of the last run)
+    """
+
+    def __init__(self, notebook_dir=NOTEBOOK_DIR, root=PIPELINE_DIR):
+        self.notebook_dir = Path(notebook_dir)
+        self.root = Path(root)
+        self.paths = {p.stem: p for p in sorted(self.notebook_dir.glob('*.ipynb'))}
+        self.dag, self.io = build_dag(self.paths.values())
+        self.sources = {name: dwts_sources(path) for name, path in self.paths.items()}
+
+    def _manifest(self):
+        path = self.root / 'manifest.json'
+        return json.loads(path.read_text()) if path.exists() else {}
+
+    def _save_manifest(self, manifest):
+        self.root.mkdir(parents=True, exist_ok=True)
+        (self.root / 'manifest.json').write_text(json.dumps(manifest, indent=2))
+
+    def _restore(self, entry, copy=True):
+        """Bring a cached notebook's outputs back; False if a copy is missing"""
+        for rel, sha in entry['outputs'].items():
+            target = ROOT / rel
+            if target.exists() and _file_hash(target) == sha:
+                continue
+            blob = self.root / 'blobs' / sha
+            if not blob.exists():
+                return False
+            if copy:
+                shutil.copyfile(blob, target)
+        return True
+
+    def _store(self, name):
+        """Cache a notebook's freshly written outputs"""
+        outputs = {}
+        (self.root / 'blobs').mkdir(parents=True, exist_ok=True)
+        for f in sorted(self.io[name][1]):
+            if f.exists():
+                sha = _file_hash(f)
+                shutil.copyfile(f, self.root / 'blobs' / sha)
+                outputs[str(f.relative_to(ROOT))] = sha
+        return outputs
+
+    def select(self, names=None):
+        """The requested notebooks plus everything upstream of them"""
+        if not names:
+            return set(self.dag)
+        unknown = set(names) - set(self.dag)
+        if unknown:
+            raise ValueError(f"Unknown notebooks: {sorted(unknown)}")
+        todo, stack = set(), list(names)
+        while stack:
+            name = stack.pop()
+            if name not in todo:
+                todo.add(name)
+                stack.extend(self.dag[name])
+        return todo
+
+    def run(self, names=None, n_jobs=1, force=False, dry_run=False):
+        """
+        Execute out-of-date notebooks, independent ones in parallel
+
+        Args:
+            names: notebook stems to bring up to date (default: all); their
+                upstream notebooks are included
+            n_jobs: notebooks executing at once
+            force: re-run the named notebooks even if their key is unchanged
+            dry_run: report the plan without executing anything
+
+        Returns:
+            dict stem -> {'status': cached | ran | failed | blocked | planned,
+            'seconds', 'error'}
+        """
+        selected = self.select(names)
+        forced = set(names or self.dag) if force else set()
+        manifest = self._manifest()
+        self.root.mkdir(parents=True, exist_ok=True)
+        (self.root / 'logs').mkdir(exist_ok=True)
+
+        results, pending, running = {}, set(selected), {}
+        with ProcessPoolExecutor(max_workers=n_jobs, max_tasks_per_child=1) as pool:
+            while pending or running:
+                for name in sorted(pending):
+                    upstream = self.dag[name] & selected
+                    if not all(up in results for up in upstream):
+                        continue
+                    pending.discard(name)
+                    if any(results[up]['status'] in ('failed', 'blocked') for up in upstream):
+                        results[name] = {'status': 'blocked', 'seconds': 0.0, 'error': None}
+                        continue
+                    # Keys are computed once upstream notebooks have written their outputs
+                    key = notebook_key(self.paths[name], self.io[name][0], self.sources[name])
+                    entry = manifest.get(name)
+                    if name not in forced and entry and entry['key'] == key and self._restore(entry, copy=not dry_run):
+                        results[name] = {'status': 'cached', 'seconds': 0.0, 'error': None}
+                    elif dry_run:
+                        results[name] = {'status': 'planned', 'seconds': 0.0, 'error': None}
+                    else:
+                        log = self.root / 'logs' / f"{name}.log"
+                        future = pool.submit(execute_notebook, self.paths[name], log)
+                        running[future] = (name, key, time.perf_counter())
+                if not running:
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, key, start = running.pop(future)
+                    seconds = time.perf_counter() - start
+                    try:
+                        future.result()
+                    except Exception as exc:
+                        results[name] = {'status': 'failed', 'seconds': seconds, 'error': str(exc)}
+                        manifest.pop(name, None)
+                    else:
+                        results[name] = {'status': 'ran', 'seconds': seconds, 'error': None}
+                        manifest[name] = {'key': key, 'outputs': self._store(name)}
+                    self._save_manifest(manifest)
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the analysis notebooks as a cached DAG")
+    parser.add_argument('notebooks', nargs='*', help="notebook names (default: all)")
+    parser.add_argument('--jobs', type=int, default=1, help="notebooks executing at once")
+    parser.add_argument('--force', action='store_true', help="re-run the named notebooks")
+    parser.add_argument('--dry-run', action='store_true', help="show the plan only")
+    args = parser.parse_args()
+
+    pipeline = NotebookPipeline()
+    print("=" * 80)
+    print("NOTEBOOK PIPELINE")
+    print("=" * 80)
+    for name in topological_order(pipeline.dag):
+        inputs, outputs = pipeline.io[name]
+        upstream = ', '.join(sorted(pipeline.dag[name])) or '-'
+        print(f"  {name}")
+        print(f"      after:  {upstream}")
+        print(f"      reads:  {', '.join(sorted(f.name for f in inputs)) or '-'}")
+        print(f"      writes: {', '.join(sorted(f.name for f in outputs)) or '-'}")
+
+    start = time.perf_counter()
+    names = [Path(n).stem for n in args.notebooks]
+    results = pipeline.run(names, n_jobs=args.jobs, force=args.force, dry_run=args.dry_run)
+    print()
+    for name in topological_order(pipeline.dag):
+        if name in results:
+            r = results[name]
+            print(f"  {r['status']:8s} {r['seconds']:7.1f}s  {name}" + (f"\n           {r['error']}" if r['error'] else ''))
+    print(f"\n✓ Pipeline finished in {time.perf_counter() - start:.1f}s (logs in {PIPELINE_DIR / 'logs'})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Popularity metrics from Instagram follower counts (notebook 05, step 5)
+
+    log_followers         log10(followers + 1), for correlations and models
+    normalized_followers  min-max scaled to [0, 1]
+    popularity_tier       C-List / B-List / A-List split at the 33rd and 67th
+                          follower percentiles
+"""
+
+import numpy as np
+import pandas as pd
+
+from dwts.data import IG_PATH, load_instagram_followers
+from dwts.names import join_by_name
+
+
+TIER_LABELS = ['C-List', 'B-List', 'A-List']
+TIER_QUANTILES = [0.33, 0.67]
+
+
+def popularity_metrics(followers):
+    """
+    Popularity columns for a follower-count Series
+
+    Missing counts stay missing in every column.
+
+    Returns:
+        DataFrame with log_followers, normalized_followers, popularity_tier,
+        indexed like followers
+    """
+    followers = pd.Series(followers, dtype=np.float64)
+    cuts = followers.quantile(TIER_QUANTILES)
+    return pd.DataFrame({
+        'log_followers': np.log10(followers + 1),
+        'normalized_followers': (followers - followers.min()) / (followers.max() - followers.min()),
+        'popularity_tier': pd.cut(
+            followers, bins=[0, cuts.iloc[0], cuts.iloc[1], np.inf], labels=TIER_LABELS),
+    }, index=followers.index)
+
+
+def add_popularity(df, ig_data=None, store=None):
+    """
+    Merge follower counts into the wide table and add popularity_metrics()
+
+    Sheet names are resolved with dwts.names, so the result keeps one row
+    per row of df.
+
+    Args:
+        df: wide DWTS table
+        ig_data: (celebrity_name, follower_count) as from
+            load_instagram_followers (loaded from IG_PATH per season if
+            None); a name listed several times is matched to the
+            contestant's seasons in order
+        store: optional dwts.followers.FollowerStore; counts then come from
+            the last snapshot before each contestant's season premiere,
+            with the sheet's count where the history has none
+    """
+    if ig_data is None:
+        ig_data = load_instagram_followers(IG_PATH, per_season=True)
+    out, _ = join_by_name(df, ig_data, ['follower_count'])
+    if store is not None:
+        from dwts.followers import season_followers
+        out['follower_count'] = season_followers(out, store).fillna(out['follower_count'])
+    return pd.concat([out, popularity_metrics(out['follower_count'])], axis=1)
@@ -0,0 +1,347 @@
+"""
+Celebrity social profiles shared by the scrapers and the notebooks
+
+Every scraper returned {name: {'handle', 'followers', 'verified', 'found'}}
+and wrote its own CSV (instagram_followers_httpx.csv, _free_api.csv,
+_instagrapi.csv, _scraped.csv, _collected.csv), while notebook 05 read
+only the manual sheet. ProfileStore is one SQLite database for all of
+them:
+
+    observations  every result a source reported, skipped when it repeats
+                  that source's previous result for the celebrity
+                  (indexed on celebrity and on handle)
+    profiles      one reconciled row per celebrity and platform, rewritten
+                  in the same transaction as the observations it depends
+                  on, so readers never merge sources themselves
+
+Reconciliation takes each source's latest observation and prefers found
+accounts, then ones not reported unverified (an unknown flag is not held
+against a source), then SOURCE_PRIORITY, then the most recent.
+A profile is flagged when sources found different handles or follower
+counts more than FOLLOWER_CONFLICT times apart.
+
+Celebrities are keyed by NameIndex.celebrity_ids (dwts.names), the same
+ids as the follower history in dwts.followers; pass history= to also
+append every Instagram count there (the history has no platform column).
+
+Usage:
+    python -m dwts.profiles import "data/celebrityIG - Sheet1.csv" --source manual_sheet
+    python -m dwts.profiles import instagram_followers_httpx.csv --source httpx
+    python -m dwts.profiles show --conflicts
+"""
+
+import argparse
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+
+from dwts.data import DATA_DIR
+from dwts.names import NameIndex
+
+
+PROFILE_DB = DATA_DIR / 'profiles.sqlite'
+
+# Lower is trusted more: the hand-checked sheet, then logged-in API
+# clients, then anonymous endpoints and page scraping
+SOURCE_PRIORITY = ['manual_sheet', 'instagrapi', 'rapidapi', 'httpx', 'collector', 'free_api', 'selenium']
+FOLLOWER_CONFLICT = 2.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS observations (
+    id INTEGER PRIMARY KEY,
+    celebrity_id TEXT NOT NULL,
+    celebrity_name TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    source TEXT NOT NULL,
+    handle TEXT,
+    followers INTEGER,
+    verified INTEGER,
+    found INTEGER NOT NULL,
+    observed_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS observations_celebrity ON observations (celebrity_id, platform, source, observed_at);
+CREATE INDEX IF NOT EXISTS observations_handle ON observations (platform, handle);
+
+CREATE TABLE IF NOT EXISTS profiles (
+    celebrity_id TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    celebrity_name TEXT NOT NULL,
+    handle TEXT,
+    followers INTEGER,
+    verified INTEGER,
+    source TEXT,
+    observed_at TEXT,
+    n_sources INTEGER NOT NULL,
+    conflict TEXT,
+    PRIMARY KEY (celebrity_id, platform)
+);
+CREATE INDEX IF NOT EXISTS profiles_handle ON profiles (platform, handle);
+"""
+
+OBSERVATION_COLUMNS = ['celebrity_id', 'celebrity_name', 'platform', 'source', 'handle',
+                       'followers', 'verified', 'found', 'observed_at']
+PROFILE_COLUMNS = ['celebrity_id', 'platform', 'celebrity_name', 'handle', 'followers', 'verified',
+                   'source', 'observed_at', 'n_sources', 'conflict']
+
+
+def _results_frame(results):
+    """Scraper output dict ({name: {'handle', ...}}) or DataFrame as observation columns"""
+    if isinstance(results, dict):
+        results = pd.DataFrame([{'celebrity_name': name, **data} for name, data in results.items()])
+    frame = results.rename(columns={'instagram_handle': 'handle', 'follower_count': 'followers'})
+    for col in ['handle', 'followers', 'verified']:
+        if col not in frame.columns:
+            frame[col] = None
+    if 'found' not in frame.columns:
+        frame['found'] = frame['followers'].notna()
+    return frame
+
+
+def _none(value):
+    return None if pd.isna(value) else value
+
+
+def _value(handle, followers, verified, found):
+    """Comparable (handle, followers, verified, found) with SQL-style NULLs"""
+    return (_none(handle), None if pd.isna(followers) else int(followers),
+            None if pd.isna(verified) else int(verified), int(found))
+
+
+class ProfileStore:
+    """
+    SQLite profile database (WAL mode, so a notebook can read while a
+    scraper writes)
+
+    Example:
+        store = ProfileStore()
+        store.record(followers_data, source='httpx')
+        store.profiles()                      # one row per celebrity
+        store.by_handle('@zendaya')
+    """
+
+    def __init__(self, path=PROFILE_DB, index=None, history=None, readonly=False):
+        """
+        Args:
+            readonly: open an existing database for reading only (for the
+                notebooks); record() and import_csv() then raise
+                sqlite3.OperationalError
+        """
+        self.path = Path(path)
+        self._index = index
+        self.history = history
+        if readonly:
+            if not self.path.exists():
+                raise FileNotFoundError(
+                    f"No profile database at {self.path}; record the manual sheet first with "
+                    f'python -m dwts.profiles import "data/celebrityIG - Sheet1.csv" --source manual_sheet')
+            self.conn = sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True, timeout=30)
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = NameIndex.from_data()
+        return self._index
+
+    def record(self, results, source, platform='instagram', observed_at=None):
+        """
+        Store one scraper run and re-reconcile the celebrities it touched
+
+        Args:
+            results: scraper output dict or a DataFrame with celebrity_name,
+                handle / instagram_handle, followers / follower_count and
+                optionally verified, found, collection_date
+            source: backend name (see SOURCE_PRIORITY)
+            observed_at: time of the run (default: collection_date, else now)
+
+        Returns:
+            number of new observations
+        """
+        frame = _results_frame(results)
+        if observed_at is not None:
+            stamps = pd.Series(pd.Timestamp(observed_at), index=frame.index)
+        elif 'collection_date' in frame.columns:
+            stamps = pd.to_datetime(frame['collection_date'])
+        else:
+            stamps = pd.Series(pd.Timestamp.now(), index=frame.index)
+        frame = frame.assign(
+            celebrity_id=self.index.celebrity_ids(frame['celebrity_name']),
+            celebrity_name=frame['celebrity_name'].astype(str).str.strip(),
+            platform=platform, source=source,
+            handle=frame['handle'].astype('object').where(frame['handle'].notna(), None),
+            followers=pd.to_numeric(frame['followers'].astype(str).str.replace(',', ''), errors='coerce'),
+            found=frame['found'].astype(str).str.lower().isin(['true', '1']),
+            observed_at=stamps.dt.strftime('%Y-%m-%d %H:%M:%S'),
+        )
+        frame['verified'] = frame['verified'].map({True: 1, False: 0, 'True': 1, 'False': 0})
+        frame = frame.drop_duplicates(['celebrity_id', 'observed_at'])
+
+        latest = self._latest(frame['celebrity_id'].unique(), platform, [source])
+        previous = {row.celebrity_id: _value(row.handle, row.followers, row.verified, row.found)
+                    for row in latest.itertuples(index=False)}
+        rows = []
+        for row in frame[OBSERVATION_COLUMNS].itertuples(index=False):
+            value = _value(row.handle, row.followers, row.verified, row.found)
+            if previous.get(row.celebrity_id) == value:
+                continue
+            previous[row.celebrity_id] = value
+            rows.append((row.celebrity_id, row.celebrity_name, platform, source, *value, row.observed_at))
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT INTO observations ({', '.join(OBSERVATION_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(OBSERVATION_COLUMNS))})", rows)
+            self._reconcile({r[0] for r in rows}, platform)
+
+        if self.history is not None and platform == 'instagram':
+            found = frame[frame['found'] & frame['followers'].notna()]
+            self.history.append(pd.DataFrame({
+                'celebrity_id': found['celebrity_id'], 'timestamp': pd.to_datetime(found['observed_at']),
+                'followers': found['followers'], 'verified': found['verified'].astype('boolean'),
+                'source': source,
+            }))
+        return len(rows)
+
+    def import_csv(self, path, source, platform='instagram', observed_at=None):
+        """
+        Record a legacy scraper CSV or the manual follower sheet
+
+        The sheet has no dates or found flags: every row counts as found,
+        observed at observed_at (default: the file's modification time).
+        """
+        frame = pd.read_csv(path)
+        if observed_at is None and 'collection_date' not in frame.columns:
+            observed_at = pd.Timestamp(Path(path).stat().st_mtime, unit='s').floor('s')
+        return self.record(frame, source, platform, observed_at)
+
+    def _latest(self, ids, platform, sources=None):
+        """Each source's most recent observation for the given celebrities"""
+        ids = list(ids)
+        if not ids:
+            return pd.DataFrame(columns=OBSERVATION_COLUMNS)
+        query = f"""
+            SELECT {', '.join(OBSERVATION_COLUMNS)} FROM (
+                SELECT *, ROW_NUMBER() OVER (
+                    PARTITION BY celebrity_id, source ORDER BY observed_at DESC, id DESC) AS rank
+                FROM observations
+                WHERE platform = ? AND celebrity_id IN ({', '.join('?' * len(ids))})
+            ) WHERE rank = 1"""
+        latest = pd.read_sql_query(query, self.conn, params=[platform, *ids])
+        if sources is not None:
+            latest = latest[latest['source'].isin(sources)]
+        return latest
+
+    def _reconcile(self, ids, platform):
+        latest = self._latest(ids, platform)
+        if latest.empty:
+            return
+        priority = {s: i for i, s in enumerate(SOURCE_PRIORITY)}
+        latest['priority'] = latest['source'].map(priority).fillna(len(priority))
+        # Sources that do not report verification (the manual sheet) are not
+        # outranked by ones that do: only an explicit "not verified" demotes
+        latest['unverified'] = latest['verified'].eq(0)
+        latest = latest.sort_values(
+            ['celebrity_id', 'found', 'unverified', 'priority', 'observed_at'],
+            ascending=[True, False, True, True, False], na_position='last')
+        rows = []
+        for celebrity_id, group in latest.groupby('celebrity_id', sort=False):
+            best = group.iloc[0]
+            found = group[group['found'] == 1]
+            handles = found['handle'].dropna().str.lstrip('@').str.lower().unique()
+            counts = found['followers'].dropna()
+            conflict = None
+            if len(handles) > 1:
+                conflict = 'handle'
+            elif len(counts) > 1 and counts.max() > FOLLOWER_CONFLICT * max(counts.min(), 1):
+                conflict = 'followers'
+            handle, followers, verified, _ = _value(best['handle'], best['followers'], best['verified'], 0)
+            rows.append((celebrity_id, platform, best['celebrity_name'], handle, followers, verified,
+                         best['source'], best['observed_at'], len(found), conflict))
+        self.conn.executemany(
+            f"INSERT OR REPLACE INTO profiles ({', '.join(PROFILE_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(PROFILE_COLUMNS))})", rows)
+
+    def profiles(self, platform='instagram', conflicts_only=False):
+        """
+        Reconciled profiles as a DataFrame
+
+        Returns:
+            celebrity_id, celebrity_name, handle, followers, verified,
+            source, observed_at, n_sources and conflict
+        """
+        query = "SELECT * FROM profiles WHERE platform = ?"
+        if conflicts_only:
+            query += " AND conflict IS NOT NULL"
+        frame = pd.read_sql_query(query + " ORDER BY celebrity_id", self.conn, params=[platform])
+        frame['followers'] = frame['followers'].astype('Int64')
+        frame['verified'] = frame['verified'].astype('boolean')
+        return frame.drop(columns='platform')
+
+    def lookup(self, name, platform='instagram'):
+        """Reconciled profile of one celebrity as a dict, or None"""
+        celebrity_id = self.index.celebrity_ids([name]).iloc[0]
+        row = self.conn.execute(
+            f"SELECT {', '.join(PROFILE_COLUMNS)} FROM profiles WHERE celebrity_id = ? AND platform = ?",
+            (celebrity_id, platform)).fetchone()
+        return dict(zip(PROFILE_COLUMNS, row)) if row else None
+
+    def by_handle(self, handle, platform='instagram'):
+        """Every celebrity that any source reported under this handle"""
+        handle = handle if handle.startswith('@') else f"@{handle}"
+        return pd.read_sql_query(
+            "SELECT DISTINCT celebrity_id, celebrity_name, source FROM observations "
+            "WHERE platform = ? AND handle IN (?, ?)",
+            self.conn, params=[platform, handle, handle.lstrip('@')])
+
+    def observations(self, name=None, platform='instagram'):
+        """Raw observations, oldest first (one celebrity if name is given)"""
+        query, params = "SELECT * FROM observations WHERE platform = ?", [platform]
+        if name is not None:
+            query += " AND celebrity_id = ?"
+            params.append(self.index.celebrity_ids([name]).iloc[0])
+        return pd.read_sql_query(query + " ORDER BY observed_at, id", self.conn, params=params)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Celebrity profile store")
+    parser.add_argument('--db', default=str(PROFILE_DB))
+    commands = parser.add_subparsers(dest='command', required=True)
+    imports = commands.add_parser('import', help="record scraper CSVs or the manual sheet")
+    imports.add_argument('paths', nargs='+')
+    imports.add_argument('--source', required=True)
+    imports.add_argument('--platform', default='instagram')
+    imports.add_argument('--observed-at', help="for files without collection_date")
+    show = commands.add_parser('show', help="print reconciled profiles")
+    show.add_argument('--platform', default='instagram')
+    show.add_argument('--conflicts', action='store_true')
+    args = parser.parse_args()
+
+    with ProfileStore(args.db) as store:
+        if args.command == 'import':
+            for path in args.paths:
+                added = store.import_csv(path, args.source, args.platform, args.observed_at)
+                print(f"✓ {Path(path).name}: {added} new observations")
+            return
+        table = store.profiles(args.platform, conflicts_only=args.conflicts)
+        print("=" * 80)
+        print(f"{args.platform.upper()} PROFILES: {len(table)} celebrities, "
+              f"{table['conflict'].notna().sum()} with conflicting sources")
+        print("=" * 80)
+        print(table.drop(columns='celebrity_id').to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
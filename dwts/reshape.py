@@ -0,0 +1,186 @@
+"""
+Wide-to-long reshape with validated elimination detection
+
+The wide table encodes a contestant's exit three ways:
+
+    - N/A for weeks the show never ran that season
+    - 0 for every week after the contestant left
+    - the results string ("Eliminated Week 2", "1st Place", "Withdrew")
+
+and each notebook read these differently (02 stops at the first 0, 04 sums
+the zeros into totals). reshape_long() is the one interpretation: a
+contestant-week table for every week the season ran, with an `active` mask
+(danced that week) and exit flags derived from the score pattern in a single
+vectorized pass, cross-checked against `results`.
+
+Usage:
+    long, issues = reshape_long(df)
+"""
+
+import numpy as np
+import pandas as pd
+
+from dwts.data import N_JUDGES, N_WEEKS
+
+
+ID_COLUMNS = ['celebrity_name', 'ballroom_partner', 'season', 'results', 'placement']
+
+RESULT_PATTERN = r'^(?:Eliminated Week (?P<elim_week>\d+)|(?P<place>\d+)(?:st|nd|rd|th) Place|(?P<withdrew>Withdrew))$'
+
+
+def score_tensor(df):
+    """Judge scores as a float array of shape (contestants, weeks, judges)"""
+    cols = [f'week{w}_judge{j}_score' for w in range(1, N_WEEKS + 1) for j in range(1, N_JUDGES + 1)]
+    values = df.reindex(columns=cols).apply(pd.to_numeric, errors='coerce').to_numpy(np.float64)
+    return values.reshape(len(df), N_WEEKS, N_JUDGES)
+
+
+def parse_results(results):
+    """
+    Split the results column into kind / elim_week / place
+
+    kind is 'eliminated', 'placed', 'withdrew' or 'unknown'.
+    """
+    parts = results.astype(str).str.strip().str.extract(RESULT_PATTERN)
+    kind = np.select(
+        [parts['elim_week'].notna(), parts['place'].notna(), parts['withdrew'].notna()],
+        ['eliminated', 'placed', 'withdrew'], default='unknown')
+    return pd.DataFrame({
+        'kind': kind,
+        'elim_week': pd.to_numeric(parts['elim_week']).astype('Int64'),
+        'place': pd.to_numeric(parts['place']).astype('Int64'),
+    }, index=results.index)
+
+
+def _season_lengths(seasons, ran):
+    """Last week that ran in each contestant's season, broadcast per row"""
+    codes, uniques = pd.factorize(seasons)
+    ran_in_season = np.zeros((len(uniques), ran.shape[1]), dtype=bool)
+    np.logical_or.at(ran_in_season, codes, ran)
+    weeks = np.arange(1, ran.shape[1] + 1)
+    length = np.where(ran_in_season, weeks, 0).max(axis=1)
+    return length[codes]
+
+
+def reshape_long(df, report=True):
+    """
+    Reshape the wide table to one row per contestant-week
+
+    Rows cover every week the contestant's season ran. Columns:
+        row                     position of the contestant in df
+        celebrity_name, ballroom_partner, season, results, placement
+        week
+        judge1_score..judge4_score, n_judges, judge_total, judge_mean
+        active                  danced this week (total score > 0)
+        eliminated_this_week    last week danced by a contestant voted out (not a
+                                withdrawal, not a finalist)
+        withdrew_this_week      last week danced by a contestant who withdrew
+        final_week              this is the season's last week
+
+    Args:
+        df: wide DWTS table
+        report: also return the cross-check against `results`
+
+    Returns:
+        long DataFrame, and an issues DataFrame when report is True
+    """
+    scores = score_tensor(df)
+    n_rows, n_weeks, _ = scores.shape
+    weeks = np.arange(1, n_weeks + 1)
+
+    ran = ~np.isnan(scores).all(axis=2)
+    totals = np.nansum(scores, axis=2)
+    active = totals > 0
+    n_judges = (~np.isnan(scores) & (scores > 0)).sum(axis=2)
+
+    season_length = _season_lengths(df['season'].to_numpy(), ran)
+    last_active = np.where(active, weeks, 0).max(axis=1)
+    parsed = parse_results(df['results'])
+    withdrew = (parsed['kind'] == 'withdrew').to_numpy()
+
+    # Leaving before the final is an elimination; in the final week only an
+    # explicit "Eliminated Week N" counts (mid-finale cuts in two-night finales)
+    exit_week = last_active[:, None] == weeks
+    eliminated_in_final = ((parsed['kind'] == 'eliminated').to_numpy()
+                           & (parsed['elim_week'].to_numpy(dtype=np.float64, na_value=np.nan) == season_length))
+    counts_as_elimination = (last_active < season_length) | eliminated_in_final
+    eliminated = exit_week & counts_as_elimination[:, None] & ~withdrew[:, None]
+    withdrew_week = exit_week & withdrew[:, None]
+
+    in_season = weeks <= season_length[:, None]
+    row_idx, week_idx = np.nonzero(in_season)
+
+    with np.errstate(invalid='ignore'):
+        judge_mean = np.where(n_judges > 0, totals / np.maximum(n_judges, 1), np.nan)
+
+    long = df.iloc[row_idx][ID_COLUMNS].reset_index(drop=True)
+    long.insert(0, 'row', row_idx)
+    long['week'] = week_idx + 1
+    for j in range(scores.shape[2]):
+        long[f'judge{j + 1}_score'] = scores[row_idx, week_idx, j]
+    long['n_judges'] = n_judges[row_idx, week_idx]
+    long['judge_total'] = np.where(ran[row_idx, week_idx], totals[row_idx, week_idx], np.nan)
+    long['judge_mean'] = judge_mean[row_idx, week_idx]
+    long['active'] = active[row_idx, week_idx]
+    long['eliminated_this_week'] = eliminated[row_idx, week_idx]
+    long['withdrew_this_week'] = withdrew_week[row_idx, week_idx]
+    long['final_week'] = (week_idx + 1) == season_length[row_idx]
+
+    if not report:
+        return long
+    issues = _check_results(df, parsed, active, last_active, season_length)
+    return long, issues
+
+
+def _check_results(df, parsed, active, last_active, season_length):
+    """
+    Cross-check the score-derived exits against the results column
+
+    Issue types:
+        unparsed_result          results string not recognized
+        never_danced             no week with a positive score
+        score_after_exit         a positive score after a 0 week
+        elimination_week_mismatch  "Eliminated Week N" but last danced week differs
+        placement_order          left earlier than a season-mate yet placed better
+
+    A "3rd Place" contestant cut in the semi-final and an "Eliminated Week N"
+    cut during a two-night finale are consistent and not reported.
+    """
+    first_inactive_after_active = np.cumsum(active, axis=1) < active.sum(axis=1, keepdims=True)
+    gap = (~active & first_inactive_after_active & (np.cumsum(active, axis=1) > 0)).any(axis=1)
+
+    kind = parsed['kind'].to_numpy()
+    elim_week = parsed['elim_week'].to_numpy(dtype=np.float64, na_value=np.nan)
+    checks = {
+        'unparsed_result': kind == 'unknown',
+        'never_danced': last_active == 0,
+        'score_after_exit': gap,
+        'elimination_week_mismatch': (kind == 'eliminated') & (elim_week != last_active) & (last_active > 0),
+    }
+
+    records = []
+    for issue, mask in checks.items():
+        for i in np.flatnonzero(mask):
+            records.append({
+                'season': df['season'].iat[i], 'celebrity_name': df['celebrity_name'].iat[i],
+                'issue': issue, 'results': df['results'].iat[i],
+                'last_active_week': int(last_active[i]), 'season_length': int(season_length[i]),
+            })
+
+    # Placement must not improve for earlier exits (withdrawals excluded)
+    frame = pd.DataFrame({
+        'i': np.arange(len(df)), 'season': df['season'].to_numpy(),
+        'placement': df['placement'].to_numpy(), 'last_active': last_active,
+    })[kind != 'withdrew']
+    pairs = frame.merge(frame, on='season', suffixes=('', '_other'))
+    bad = pairs[(pairs['last_active'] < pairs['last_active_other'])
+                & (pairs['placement'] < pairs['placement_other'])]
+    for i in np.unique(bad['i']):
+        records.append({
+            'season': df['season'].iat[i], 'celebrity_name': df['celebrity_name'].iat[i],
+            'issue': 'placement_order', 'results': df['results'].iat[i],
+            'last_active_week': int(last_active[i]), 'season_length': int(season_length[i]),
+        })
+
+    columns = ['season', 'celebrity_name', 'issue', 'results', 'last_active_week', 'season_length']
+    return pd.DataFrame(records, columns=columns).sort_values(['season', 'issue'], ignore_index=True)
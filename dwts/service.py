@@ -0,0 +1,232 @@
+"""
+Elimination probabilities for a season in progress
+
+Loads the posterior saved by dwts.bayes (python -m dwts.bayes) once, then
+answers "how likely is each couple to go home this week?" by Monte Carlo
+over the cached draws:
+
+    popularity = b . x + industry effect + pro effect + celebrity effect
+                 (+ random-walk drift for the weeks already danced)
+    fan shares = softmax(popularity) per draw
+    outcome    = combine() + worst_in_week() under the chosen rule, with
+                 combine.judges_save() picking from the bottom two (not in
+                 the final week)
+
+Levels unseen in training (a new pro, a first-time celebrity) draw their
+effect from the fitted sigma. Answers are cached in an LRU keyed by the
+week's couples and score vector, so repeated queries return immediately.
+
+Usage:
+    from dwts.service import EliminationService
+    service = EliminationService()
+    service.probabilities(couples, scores, rule='judges_save', week=5)
+    service.probabilities(couples, scores, rule='judges_save', week=11, final=True)
+
+    python -m dwts.service --season 34 --week 5
+    python -m dwts.service --couples week.csv --rule percent
+"""
+
+import argparse
+import time
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from dwts.bayes import DRAWS_PATH
+from dwts.combine import JUDGES_SAVE_FROM, combine, judges_save, voting_rule, worst_in_week
+
+
+RULES = ['rank', 'percent', 'judges_save']
+
+
+class Couple(NamedTuple):
+    """What the service needs to know about one couple"""
+    celebrity_name: str
+    ballroom_partner: str
+    celebrity_industry: str
+    follower_count: Optional[float] = None
+
+
+def season_rule(season):
+    """Rule used on the show for a season number"""
+    return 'judges_save' if int(season) >= JUDGES_SAVE_FROM else voting_rule(season)
+
+
+class EliminationService:
+    """
+    Monte Carlo elimination probabilities over cached posterior draws
+
+    Args:
+        path: .npz written by dwts.bayes.save_draws
+        max_draws: use at most this many posterior draws
+        cache_size: LRU entries for repeated (couples, scores) queries
+        seed: seed for unseen-level effects and drift
+    """
+
+    def __init__(self, path=DRAWS_PATH, max_draws=None, cache_size=1024, seed=0):
+        posterior = np.load(path)
+        keep = slice(None, max_draws)
+        self.b = posterior['b'][keep]
+        self.sigma = posterior['sigma'][keep]
+        self.effects = {
+            'industry': dict(zip(posterior['industry'], posterior['industry_effect'][keep].T)),
+            'pro': dict(zip(posterior['pro'], posterior['pro_effect'][keep].T)),
+            'celeb': dict(zip(posterior['celeb'], posterior['celeb_effect'][keep].T)),
+        }
+        self.followers_center = float(posterior['followers_center'])
+        self.followers_scale = float(posterior['followers_scale'])
+        self.seed = seed
+        self._query = lru_cache(maxsize=cache_size)(self._compute)
+
+    @property
+    def n_draws(self):
+        return len(self.b)
+
+    def _effect(self, level, name, rng):
+        if name in self.effects[level]:
+            return self.effects[level][name]
+        # Unseen level: a standardized draw, scaled by sigma in popularity()
+        return rng.standard_normal(self.n_draws)
+
+    def popularity(self, couples, week=1):
+        """(draws, couples) popularity for the couples entering a given week"""
+        rng = np.random.default_rng([self.seed, len(couples), week])
+        columns = []
+        for couple in couples:
+            couple = Couple(*couple)
+            if couple.follower_count is None or np.isnan(couple.follower_count):
+                x = np.array([0.0, 1.0])
+            else:
+                z = (np.log10(couple.follower_count + 1) - self.followers_center) / self.followers_scale
+                x = np.array([z, 0.0])
+            theta = (self.b @ x
+                     + self.sigma[:, 0] * self._effect('industry', couple.celebrity_industry, rng)
+                     + self.sigma[:, 1] * self._effect('pro', couple.ballroom_partner, rng)
+                     + self.sigma[:, 2] * self._effect('celeb', couple.celebrity_name, rng))
+            if week > 1:
+                theta = theta + self.sigma[:, 3] * np.sqrt(week - 1) * rng.standard_normal(self.n_draws)
+            columns.append(theta)
+        return np.column_stack(columns)
+
+    def _compute(self, couples, scores, rule, week, final):
+        n = len(couples)
+        theta = self.popularity(couples, week)
+        shares = np.exp(theta - theta.max(axis=1, keepdims=True))
+        shares /= shares.sum(axis=1, keepdims=True)
+
+        judge = np.asarray(scores, dtype=np.float64)
+        combined = combine(judge, shares, [0, n], ['percent' if rule == 'percent' else 'rank'])
+        bottom = worst_in_week(combined, [0, n], k=min(2, n))[:, 0, :]
+
+        out_counts = np.zeros(n)
+        bottom_counts = np.zeros(n)
+        np.add.at(bottom_counts, bottom[bottom >= 0].ravel(), 1)
+        if rule == 'judges_save' and bottom.shape[1] == 2 and not final:
+            out = judges_save(judge, shares, bottom[:, 0], bottom[:, 1],
+                              np.random.default_rng([self.seed, week]))
+            np.add.at(out_counts, out, 1)
+        else:
+            np.add.at(out_counts, bottom[:, 0], 1)
+        return out_counts / self.n_draws, bottom_counts / self.n_draws, shares.mean(axis=0)
+
+    def probabilities(self, couples, scores, rule='percent', week=1, final=False):
+        """
+        Elimination probability for each couple this week
+
+        Args:
+            couples: Couple tuples (or dicts with the same keys)
+            scores: this week's judge totals, aligned with couples
+            rule: 'rank', 'percent' or 'judges_save'
+            week: week number (adds the fitted drift for weeks already danced)
+            final: the season's last week; the judges' save does not apply,
+                so the lowest combined score places last
+
+        Returns:
+            DataFrame with celebrity_name, judge_score, fan_share_mean,
+            p_bottom_two and p_eliminated, riskiest first
+        """
+        if rule not in RULES:
+            raise ValueError(f"Unknown rule {rule!r}; expected one of {RULES}")
+        couples = tuple(
+            Couple(**c) if isinstance(c, dict) else Couple(*c) for c in couples)
+        couples = tuple(c._replace(follower_count=None if c.follower_count is None or pd.isna(c.follower_count)
+                                   else float(c.follower_count)) for c in couples)
+        p_out, p_bottom, share = self._query(couples, tuple(float(s) for s in scores), rule, int(week),
+                                            bool(final))
+        table = pd.DataFrame({
+            'celebrity_name': [c.celebrity_name for c in couples],
+            'judge_score': list(scores),
+            'fan_share_mean': share,
+            'p_bottom_two': p_bottom,
+            'p_eliminated': p_out,
+        })
+        return table.sort_values('p_eliminated', ascending=False, ignore_index=True)
+
+    def cache_info(self):
+        return self._query.cache_info()
+
+
+def couples_from_data(season, week):
+    """Couples, judge totals and the final-week flag for one week of the data file"""
+    from dwts.data import DATA_PATH, IG_PATH, load_dwts_data, load_instagram_followers
+    from dwts.reshape import reshape_long
+
+    df = load_dwts_data(DATA_PATH)
+    long = reshape_long(df, report=False)
+    wk = long[(long['season'] == season) & (long['week'] == week) & long['active']]
+    if wk.empty:
+        raise ValueError(f"No couples danced in season {season}, week {week}")
+    rows = df.iloc[wk['row']].merge(load_instagram_followers(IG_PATH), on='celebrity_name', how='left')
+    couples = [Couple(r.celebrity_name, r.ballroom_partner, r.celebrity_industry, r.follower_count)
+               for r in rows.itertuples()]
+    return couples, wk['judge_total'].tolist(), bool(wk['final_week'].iat[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Elimination probabilities for this week")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--season', type=int, help="score a week from the data file")
+    source.add_argument('--couples', help="CSV with celebrity_name, ballroom_partner, "
+                                          "celebrity_industry, judge_score[, follower_count]")
+    parser.add_argument('--week', type=int, default=1)
+    parser.add_argument('--final', action='store_true',
+                        help="score the season's final week (set from the data with --season)")
+    parser.add_argument('--rule', choices=RULES, help="default: the season's own rule")
+    parser.add_argument('--draws', default=str(DRAWS_PATH), help="posterior .npz from dwts.bayes")
+    args = parser.parse_args()
+
+    if args.season is not None:
+        couples, scores, final = couples_from_data(args.season, args.week)
+        final = final or args.final
+        rule = args.rule or season_rule(args.season)
+    else:
+        table = pd.read_csv(args.couples)
+        if 'follower_count' not in table.columns:
+            table['follower_count'] = np.nan
+        couples = [Couple(r.celebrity_name, r.ballroom_partner, r.celebrity_industry, r.follower_count)
+                   for r in table.itertuples()]
+        scores = table['judge_score'].tolist()
+        rule = args.rule or 'judges_save'
+        final = args.final
+
+    start = time.perf_counter()
+    service = EliminationService(args.draws)
+    loaded = time.perf_counter()
+    result = service.probabilities(couples, scores, rule, args.week, final)
+    answered = time.perf_counter()
+    service.probabilities(couples, scores, rule, args.week, final)
+    cached = time.perf_counter()
+
+    print("=" * 80)
+    print(f"ELIMINATION RISK ({rule}, week {args.week}{' final' if final else ''}, "
+          f"{service.n_draws} posterior draws)")
+    print("=" * 80)
+    print(result.round(3).to_string(index=False))
+    print(f"\nLoad {1000 * (loaded - start):.1f} ms, query {1000 * (answered - loaded):.1f} ms, "
+          f"cached query {1000 * (cached - answered):.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""
+Memory-compact state for multi-season simulations
+
+Counterfactual and Monte Carlo work holds judge scores, fan shares and
+active masks for 34 seasons x up to 11 weeks x up to 16 contestants x many
+draws. As float64 DataFrames (like fan_votes_estimated_all_seasons.csv)
+most of that memory is index and padding. SeasonArrays stores it ragged:
+
+    - one cell per contestant-week actually danced, ordered season, week,
+      contestant; week_offsets[g]:week_offsets[g + 1] is the g-th
+      (season, week) group and season_offsets[s]:season_offsets[s + 1]
+      the s-th season
+    - judge totals as a flat float32 buffer
+    - fan-share draws as (n_draws, n_cells), float32 or uint16 fixed point
+    - the rectangular (week x contestant) active mask and the elimination
+      flags bit-packed
+
+Per-season access returns views into the flat judge, fan and index
+buffers (only the small bit-packed masks and the rebased week offsets are
+copied), and share() / attach() move the buffers into multiprocessing.shared_memory so
+worker processes read one copy instead of pickling it.
+
+With the 2,777 danced contestant-weeks, a million fan-share draws take
+about 5.6 GB as uint16 (11 GB as float32).
+"""
+
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+UINT16_SCALE = np.float32(1 / 65535)
+
+# Arrays that make up the state; everything else is derived from them
+_BUFFERS = [
+    'seasons', 'n_weeks', 'n_contestants', 'season_offsets', 'season_group_offsets',
+    'season_bit_offsets', 'week_offsets', 'group_week', 'cell_contestant', 'contestant_rows',
+    'contestant_offsets', 'judge', 'active_bits', 'eliminated_bits', 'fan',
+]
+
+
+@dataclass
+class SeasonView:
+    """
+    One season's slice of a SeasonArrays
+
+    weeks, contestant, judge, fan and rows are views into the flat buffers.
+    eliminated and active are unpacked from the bit-packed buffers and
+    week_offsets are rebased to the season (week_offsets[0] == 0), so those
+    three are copies; writing to them does not change the SeasonArrays.
+    fan is in the storage dtype; week() decodes uint16 shares using
+    fan_scale.
+    """
+    season: int
+    n_weeks: int
+    n_contestants: int
+    weeks: np.ndarray
+    week_offsets: np.ndarray
+    contestant: np.ndarray
+    judge: np.ndarray
+    eliminated: np.ndarray
+    active: np.ndarray
+    fan: np.ndarray
+    rows: np.ndarray
+    fan_scale: Optional[float] = None
+
+    def week(self, i):
+        """(contestant, judge, fan) for the season's i-th danced week"""
+        a, b = self.week_offsets[i], self.week_offsets[i + 1]
+        fan = self.fan[:, a:b]
+        if self.fan_scale is not None:
+            fan = fan * self.fan_scale
+        return self.contestant[a:b], self.judge[a:b], fan
+
+
+class SeasonArrays:
+    """
+    Ragged array-backed container for every season's contestant-week cells
+
+    Build with SeasonArrays.from_long(long) from reshape_long() output.
+    """
+
+    def __init__(self, **buffers):
+        for name in _BUFFERS:
+            setattr(self, name, buffers[name])
+        self.fan_scale = buffers.get('fan_scale')
+        self._shm = []
+
+    @classmethod
+    def from_long(cls, long, fan=None, fan_dtype=np.float32):
+        """
+        Pack a reshape_long() table
+
+        Args:
+            long: contestant-week table with row, season, week, judge_total,
+                active and eliminated_this_week columns
+            fan: optional fan shares aligned with the *active* rows of long
+                (sorted by season, week, row), shape (n_cells,) or
+                (n_draws, n_cells)
+            fan_dtype: np.float32, or np.uint16 to store shares as fixed point
+        """
+        long = long.sort_values(['season', 'week', 'row'], kind='stable')
+
+        contestants = long[['season', 'row']].drop_duplicates().sort_values(['season', 'row'])
+        seasons, n_contestants = np.unique(contestants['season'].to_numpy(), return_counts=True)
+        contestant_offsets = np.concatenate([[0], np.cumsum(n_contestants)])
+        local = contestants.groupby('season').cumcount().to_numpy()
+        local_of_row = pd.Series(local, index=contestants['row'].to_numpy())
+
+        n_weeks = long.groupby('season')['week'].max().reindex(seasons).to_numpy()
+
+        # Rectangular week x contestant mask per season, bit-packed end to end
+        bit_sizes = n_weeks * n_contestants
+        season_bit_offsets = np.concatenate([[0], np.cumsum(bit_sizes)])
+        season_pos = np.searchsorted(seasons, long['season'].to_numpy())
+        bit_index = (season_bit_offsets[season_pos]
+                     + (long['week'].to_numpy() - 1) * n_contestants[season_pos]
+                     + local_of_row.loc[long['row']].to_numpy())
+        active_flat = np.zeros(season_bit_offsets[-1], dtype=bool)
+        active_flat[bit_index[long['active'].to_numpy()]] = True
+
+        cells = long[long['active']]
+        cell_season_pos = np.searchsorted(seasons, cells['season'].to_numpy())
+        season_offsets = np.concatenate(
+            [[0], np.cumsum(np.bincount(cell_season_pos, minlength=len(seasons)))])
+
+        groups = cells.groupby(['season', 'week'], sort=True).size()
+        week_offsets = np.concatenate([[0], np.cumsum(groups.to_numpy())])
+        group_season = groups.index.get_level_values(0).to_numpy()
+        season_group_offsets = np.concatenate(
+            [[0], np.cumsum(pd.Series(group_season).value_counts().reindex(seasons).to_numpy())])
+
+        state = dict(
+            seasons=seasons.astype(np.int16),
+            n_weeks=n_weeks.astype(np.int8),
+            n_contestants=n_contestants.astype(np.int16),
+            season_offsets=season_offsets.astype(np.int64),
+            season_group_offsets=season_group_offsets.astype(np.int64),
+            season_bit_offsets=season_bit_offsets.astype(np.int64),
+            week_offsets=week_offsets.astype(np.int64),
+            group_week=groups.index.get_level_values(1).to_numpy().astype(np.int8),
+            cell_contestant=local_of_row.loc[cells['row']].to_numpy().astype(np.int16),
+            contestant_rows=contestants['row'].to_numpy().astype(np.int32),
+            contestant_offsets=contestant_offsets.astype(np.int64),
+            judge=cells['judge_total'].to_numpy(np.float32),
+            active_bits=np.packbits(active_flat),
+            eliminated_bits=np.packbits(cells['eliminated_this_week'].to_numpy(bool)),
+            fan=np.zeros((0, len(cells)), dtype=fan_dtype),
+            fan_scale=None,
+        )
+        arrays = cls(**state)
+        if fan is not None:
+            arrays.set_fan(fan, fan_dtype)
+        return arrays
+
+    @property
+    def n_cells(self):
+        return len(self.judge)
+
+    @property
+    def n_draws(self):
+        return self.fan.shape[0]
+
+    def set_fan(self, fan, dtype=np.float32):
+        """Store fan shares (n_cells,) or (n_draws, n_cells), optionally as uint16"""
+        fan = np.atleast_2d(np.asarray(fan, dtype=np.float32))
+        if fan.shape[1] != self.n_cells:
+            raise ValueError(f"Expected {self.n_cells} cells, got {fan.shape[1]}")
+        if np.dtype(dtype) == np.uint16:
+            self.fan = np.round(np.clip(fan, 0, 1) / UINT16_SCALE).astype(np.uint16)
+            self.fan_scale = UINT16_SCALE
+        else:
+            self.fan = fan.astype(dtype, copy=False)
+            self.fan_scale = None
+
+    def fan_shares(self, start=0, stop=None):
+        """Fan shares for a cell range as float32 (decodes uint16 storage)"""
+        block = self.fan[:, start:stop]
+        return block * self.fan_scale if self.fan_scale is not None else block
+
+    def eliminated(self, start=0, stop=None):
+        """Unpacked elimination flags for a cell range"""
+        stop = self.n_cells if stop is None else stop
+        first, last = start // 8, -(-stop // 8)
+        bits = np.unpackbits(self.eliminated_bits[first:last])
+        return bits[start - first * 8:stop - first * 8].astype(bool)
+
+    def active_grid(self, i):
+        """(n_weeks, n_contestants) active mask for the i-th season"""
+        start, stop = self.season_bit_offsets[i], self.season_bit_offsets[i + 1]
+        first = start // 8
+        bits = np.unpackbits(self.active_bits[first:-(-stop // 8)])
+        grid = bits[start - first * 8:stop - first * 8].astype(bool)
+        return grid.reshape(self.n_weeks[i], self.n_contestants[i])
+
+    def season(self, season):
+        """SeasonView for a season number"""
+        i = int(np.searchsorted(self.seasons, season))
+        if i >= len(self.seasons) or self.seasons[i] != season:
+            raise KeyError(f"Season {season} not in arrays")
+        a, b = self.season_offsets[i], self.season_offsets[i + 1]
+        g0, g1 = self.season_group_offsets[i], self.season_group_offsets[i + 1]
+        return SeasonView(
+            season=int(season),
+            n_weeks=int(self.n_weeks[i]),
+            n_contestants=int(self.n_contestants[i]),
+            weeks=self.group_week[g0:g1],
+            week_offsets=self.week_offsets[g0:g1 + 1] - a,
+            contestant=self.cell_contestant[a:b],
+            judge=self.judge[a:b],
+            eliminated=self.eliminated(a, b),
+            active=self.active_grid(i),
+            fan=self.fan[:, a:b],
+            rows=self.contestant_rows[self.contestant_offsets[i]:self.contestant_offsets[i + 1]],
+            fan_scale=self.fan_scale,
+        )
+
+    def nbytes(self):
+        """Total size of the packed buffers"""
+        return sum(getattr(self, name).nbytes for name in _BUFFERS)
+
+    @staticmethod
+    def fan_nbytes(n_cells, n_draws, dtype=np.uint16):
+        """Memory needed for an n_draws ensemble"""
+        return n_cells * n_draws * np.dtype(dtype).itemsize
+
+    def share(self):
+        """
+        Copy every buffer into shared memory and return a picklable handle
+
+        The handle is what worker processes pass to SeasonArrays.attach().
+        The creating process owns the blocks and must call unlink() when done.
+        """
+        handle = {'fan_scale': self.fan_scale, 'buffers': {}}
+        for name in _BUFFERS:
+            array = getattr(self, name)
+            shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            shared = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+            shared[...] = array
+            setattr(self, name, shared)
+            self._shm.append(shm)
+            handle['buffers'][name] = (shm.name, array.shape, array.dtype.str)
+        return handle
+
+    @classmethod
+    def attach(cls, handle):
+        """Map shared buffers created by share() without copying"""
+        buffers, blocks = {}, []
+        for name, (shm_name, shape, dtype) in handle['buffers'].items():
+            shm = shared_memory.SharedMemory(name=shm_name)
+            blocks.append(shm)
+            buffers[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+        arrays = cls(**buffers, fan_scale=handle['fan_scale'])
+        arrays._shm = blocks
+        return arrays
+
+    def close(self):
+        """
+        Drop this process's mapping of the shared buffers
+
+        The arrays are set to None rather than copied out (that would need
+        as much private memory as the blocks), so the object is unusable
+        afterwards; views taken from it earlier must be released first.
+        """
+        for name in _BUFFERS:
+            setattr(self, name, None)
+        for shm in self._shm:
+            shm.close()
+        self._shm = []
+
+    def unlink(self):
+        """Close and free the shared blocks (owner only)"""
+        blocks = list(self._shm)
+        self.close()
+        for shm in blocks:
+            shm.unlink()
@@ -0,0 +1,241 @@
+"""
+Chunked reading of the wide DWTS CSV with incremental aggregators
+
+load_dwts_data reads the whole table, which is fine for the 421 real rows
+but not for synthetic or multi-show files with millions of contestants.
+stream() reads the CSV once in chunks, parsing only the columns its
+aggregators ask for (usecols) with fixed dtypes, and folds each chunk into
+running state whose size depends on the number of names, pros or weeks,
+never on the number of rows:
+
+    UniqueNames     distinct celebrity names (what the scrapers need)
+    WeeklyTotals    per-week count, mean, std, min and max of the total
+                    judge score over contestants who danced that week
+    PartnerStats    per-pro PartnerTotals, in the pro_dancer_analysis.csv
+                    layout
+
+Usage:
+    python -m dwts.streaming
+    python -m dwts.streaming synthetic.csv --chunksize 200000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from dwts.data import DATA_PATH, N_JUDGES, N_WEEKS, NA_VALUES
+from dwts.partners import PartnerTotals
+
+
+CHUNKSIZE = 100_000
+
+SCORE_COLUMNS = [f'week{w}_judge{j}_score' for w in range(1, N_WEEKS + 1) for j in range(1, N_JUDGES + 1)]
+
+# Scores come in thirds and quarters as well as whole and half points, some
+# above 10 with bonuses (up to 13.33), so they are parsed as float64 like
+# load_dwts_data: float32 sums would drift from the eager aggregates
+DTYPES = {
+    'celebrity_name': 'str',
+    'ballroom_partner': 'str',
+    'season': np.int32,
+    'placement': np.int32,
+    **dict.fromkeys(SCORE_COLUMNS, np.float64),
+}
+
+
+def read_chunks(path=DATA_PATH, columns=None, chunksize=CHUNKSIZE):
+    """
+    Yield the wide table as DataFrames of at most chunksize rows
+
+    Args:
+        path: wide CSV in the 2026_MCM_Problem_C_Data.csv schema
+        columns: columns to parse (all if None); the rest are skipped by
+            the parser
+        chunksize: rows per chunk
+
+    Celebrity names are stripped as in load_dwts_data.
+    """
+    dtype = DTYPES if columns is None else {c: DTYPES[c] for c in columns if c in DTYPES}
+    reader = pd.read_csv(path, usecols=columns, dtype=dtype, na_values=NA_VALUES,
+                         chunksize=chunksize)
+    with reader:
+        for chunk in reader:
+            if 'celebrity_name' in chunk.columns:
+                chunk['celebrity_name'] = chunk['celebrity_name'].str.strip()
+            yield chunk
+
+
+class UniqueNames:
+    """Distinct celebrity names"""
+
+    columns = ['celebrity_name']
+
+    def __init__(self):
+        self.names = set()
+
+    def update(self, chunk):
+        self.names.update(chunk['celebrity_name'].dropna().unique())
+
+    def result(self):
+        """Sorted list of names"""
+        return sorted(self.names)
+
+
+class WeeklyTotals:
+    """
+    Summary of the weekly total judge score over contestants who danced
+
+    Totals follow weekly_total_scores: a week counts for a contestant when
+    at least one judge score is present and the total is above 0 (0 means
+    already eliminated).
+    """
+
+    columns = SCORE_COLUMNS
+
+    def __init__(self):
+        self.count = np.zeros(N_WEEKS, dtype=np.int64)
+        self.total = np.zeros(N_WEEKS)
+        self.total_sq = np.zeros(N_WEEKS)
+        self.low = np.full(N_WEEKS, np.inf)
+        self.high = np.full(N_WEEKS, -np.inf)
+
+    def update(self, chunk):
+        scores = chunk[SCORE_COLUMNS].to_numpy(np.float64).reshape(len(chunk), N_WEEKS, N_JUDGES)
+        totals = np.nansum(scores, axis=2)
+        danced = (totals > 0) & ~np.isnan(scores).all(axis=2)
+        masked = np.where(danced, totals, np.nan)
+        self.count += danced.sum(axis=0)
+        self.total += np.nansum(masked, axis=0)
+        self.total_sq += np.nansum(masked ** 2, axis=0)
+        if len(chunk):
+            self.low = np.fmin(self.low, np.nanmin(np.where(danced, totals, np.inf), axis=0))
+            self.high = np.fmax(self.high, np.nanmax(np.where(danced, totals, -np.inf), axis=0))
+
+    def result(self):
+        """
+        Returns:
+            DataFrame indexed by week with contestants, mean_total,
+            std_total, min_total and max_total (NaN for weeks never danced)
+        """
+        n = self.count.astype(np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = self.total / n
+            var = (self.total_sq - n * mean ** 2) / (n - 1)
+        return pd.DataFrame({
+            'contestants': self.count,
+            'mean_total': mean,
+            'std_total': np.sqrt(np.maximum(var, 0.0)),
+            'min_total': np.where(self.count > 0, self.low, np.nan),
+            'max_total': np.where(self.count > 0, self.high, np.nan),
+        }, index=pd.RangeIndex(1, N_WEEKS + 1, name='week'))
+
+
+class PartnerStats:
+    """
+    Per-pro PartnerTotals accumulated chunk by chunk
+
+    Each chunk is reduced with one groupby per pro (and per pro-placement
+    for the placement histogram) before it touches the Python objects, so
+    the cost per chunk scales with the pros in it, not its rows. Sums are
+    taken in a different order than PartnerStatsIndex, so averages can
+    differ from it in the last bits (about 1e-15 relative), well below the
+    3 decimals result() rounds to.
+    """
+
+    columns = ['ballroom_partner', 'placement'] + SCORE_COLUMNS
+
+    def __init__(self):
+        self.totals = {}
+
+    def update(self, chunk):
+        scores = chunk[SCORE_COLUMNS].to_numpy(np.float64).reshape(len(chunk), N_WEEKS, N_JUDGES)
+        weekly = np.nansum(scores, axis=2)
+        danced = (weekly > 0) & ~np.isnan(scores).all(axis=2)
+        with np.errstate(invalid='ignore'):
+            judge = np.where(danced, weekly, 0.0).sum(axis=1) / danced.sum(axis=1)
+        placement = chunk['placement'].to_numpy(np.float64)
+        frame = pd.DataFrame({
+            'partner': chunk['ballroom_partner'].to_numpy(),
+            'placement': placement,
+            'placement_sq': placement ** 2,
+            'judge': judge,
+            'judge_count': ~np.isnan(judge),
+            'wins': placement == 1,
+            'top3': placement <= 3,
+        })
+        sums = frame.groupby('partner', sort=False).agg(
+            appearances=('placement', 'size'), placement_sum=('placement', 'sum'),
+            placement_sq_sum=('placement_sq', 'sum'), judge_sum=('judge', 'sum'),
+            judge_count=('judge_count', 'sum'), wins=('wins', 'sum'), top3=('top3', 'sum'))
+        for partner, row in zip(sums.index, sums.itertuples(index=False)):
+            totals = self.totals.setdefault(partner, PartnerTotals())
+            totals.appearances += int(row.appearances)
+            totals.placement_sum += row.placement_sum
+            totals.placement_sq_sum += row.placement_sq_sum
+            totals.judge_sum += row.judge_sum
+            totals.judge_count += int(row.judge_count)
+            totals.wins += int(row.wins)
+            totals.top3_finishes += int(row.top3)
+        counts = frame.groupby(['partner', 'placement'], sort=False).size()
+        for (partner, place), n in counts.items():
+            self.totals[partner].placement_counts[int(place)] += int(n)
+
+    def result(self, min_appearances=0, exclude_guests=True):
+        """Table in the pro_dancer_analysis.csv layout (as PartnerStatsIndex.to_frame)"""
+        table = pd.DataFrame([{'ballroom_partner': p, **t.summary()} for p, t in self.totals.items()])
+        if exclude_guests:
+            table = table[~table['ballroom_partner'].str.contains('week', case=False, na=False)]
+        table = table[table['appearances'] >= max(min_appearances, 1)]
+        return table.sort_values('appearances', ascending=False).round(3).reset_index(drop=True)
+
+
+def stream(aggregators, path=DATA_PATH, chunksize=CHUNKSIZE):
+    """
+    Feed every chunk of the CSV to each aggregator in one pass
+
+    Only the union of the aggregators' columns is parsed.
+
+    Returns:
+        (aggregator results in order, rows read)
+    """
+    columns = list(dict.fromkeys(c for agg in aggregators for c in agg.columns))
+    rows = 0
+    for chunk in read_chunks(path, columns, chunksize):
+        for agg in aggregators:
+            agg.update(chunk)
+        rows += len(chunk)
+    return [agg.result() for agg in aggregators], rows
+
+
+def unique_celebrities(path=DATA_PATH, chunksize=CHUNKSIZE):
+    """Sorted distinct celebrity names, reading only that column"""
+    (names,), _ = stream([UniqueNames()], path, chunksize)
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream aggregates from a wide DWTS CSV")
+    parser.add_argument('path', nargs='?', default=str(DATA_PATH))
+    parser.add_argument('--chunksize', type=int, default=CHUNKSIZE)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    (names, weekly, partners), rows = stream(
+        [UniqueNames(), WeeklyTotals(), PartnerStats()], args.path, args.chunksize)
+    elapsed = time.perf_counter() - start
+
+    print("=" * 80)
+    print(f"STREAMED {rows:,} ROWS FROM {args.path}")
+    print("=" * 80)
+    print(f"\nDistinct celebrities: {len(names):,}")
+    print("\nWeekly total judge score:")
+    print(weekly.round(2).to_string())
+    print(f"\nPros with 3+ appearances: {(partners['appearances'] >= 3).sum()}")
+    print(partners.head(10)[['ballroom_partner', 'appearances', 'avg_placement', 'wins']].to_string(index=False))
+    print(f"\n✓ {rows:,} rows in {elapsed:.1f}s ({rows / max(elapsed, 1e-9):,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+"""
+Synthetic DWTS seasons for load and scale testing
+
+SyntheticModel.from_data() fits the pieces of a season to the real table:
+
+    structure       a real season's shape, chosen at random per synthetic
+                    season: contestants, weeks, eliminations and withdrawals
+                    per week, judges on the panel each week (2-4), the
+                    score grid of each week and its bonus points
+    judge scores    week mean + season offset + pro-partner effect (shrunk
+                    per pro) + contestant ability + contestant slope per
+                    week + noise, clipped 1-10, plus bonus points for a
+                    share of the couples, rounded to the week's grid
+    score grid      the coarsest of SCORE_GRIDS the real week's scores lie
+                    on: whole or half points, and thirds, quarters, ninths
+                    ... in weeks where a judge's score averages several
+                    dances
+    bonus points    in weeks with scores above 10, the real share of
+                    couples with one; each judge's score of such a couple
+                    gets one of the week's real excesses over 10
+    partners        pros drawn without replacement, weighted by appearances
+    followers       log10 followers ~ Normal, fitted to celebrityIG - Sheet1
+    demographics    industry, home state / country and age of a random real
+                    contestant
+
+Each week the couples eliminated are the lowest on standardized judge
+total + FAN_WEIGHT * standardized log followers + Normal(0, 1) noise, and
+the finalists are placed in the same order.
+
+Seasons are generated in blocks of BLOCK_SEASONS, block b seeded with
+SeedSequence(seed, spawn_key=(b,)), so the output is fixed by the seed and
+the first N seasons of a longer run equal a run of N seasons. Blocks are
+written as they are produced (CSV in the wide schema, or Parquet), so
+memory stays constant however many rows are requested.
+
+Usage:
+    python -m dwts.synthetic --rows 10000000 --output synthetic.parquet
+    python -m dwts.synthetic --seasons 500 --seed 7 --output synthetic.csv \\
+        --followers synthetic_followers.csv
+"""
+
+import argparse
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from dwts.data import DATA_PATH, IG_PATH, N_JUDGES, N_WEEKS, load_dwts_data, load_instagram_followers
+from dwts.reshape import reshape_long
+
+
+BLOCK_SEASONS = 1000
+FAN_WEIGHT = 1.0         # weight of popularity against judge totals in eliminations
+PARTNER_SHRINKAGE = 3.0  # prior appearances pulling each pro's effect toward 0
+# Denominators a week's scores can lie on (1/36 and 1/72 mix ninths with
+# halves or eighths); the data stores 4 decimals, hence GRID_TOLERANCE
+SCORE_GRIDS = (1, 2, 3, 4, 6, 8, 9, 12, 18, 24, 36, 72)
+GRID_TOLERANCE = 0.01
+MAX_SCORE = 10
+
+SCORE_COLUMNS = [f'week{w}_judge{j}_score' for w in range(1, N_WEEKS + 1) for j in range(1, N_JUDGES + 1)]
+PROFILE_COLUMNS = ['celebrity_industry', 'celebrity_homestate', 'celebrity_homecountry/region',
+                   'celebrity_age_during_season']
+COLUMNS = (['celebrity_name', 'ballroom_partner'] + PROFILE_COLUMNS
+           + ['season', 'results', 'placement'] + SCORE_COLUMNS)
+
+
+def score_grid(values):
+    """Smallest d in SCORE_GRIDS with every value a multiple of 1 / d"""
+    values = np.asarray(values, dtype=np.float64)
+    for d in SCORE_GRIDS:
+        if np.all(np.abs(values * d - np.round(values * d)) < GRID_TOLERANCE):
+            return d
+    return SCORE_GRIDS[-1]
+
+
+def _ordinal(n):
+    suffix = 'th' if 10 <= n % 100 <= 20 else {1: 'st', 2: 'nd', 3: 'rd'}.get(n % 10, 'th')
+    return f"{n}{suffix} Place"
+
+
+@dataclass
+class SeasonTemplate:
+    """Shape of one real season"""
+    n: int
+    eliminated: np.ndarray   # (weeks,) couples eliminated each week (final week: ignored)
+    withdrew: np.ndarray     # (weeks,)
+    panel: np.ndarray        # (weeks,) judges scoring that week
+    grid: np.ndarray         # (weeks,) scores are multiples of 1 / grid
+    bonus_rate: np.ndarray   # (weeks,) share of couples scored above MAX_SCORE
+    bonus: list              # (weeks,) arrays of real excesses over MAX_SCORE
+
+
+@dataclass
+class SyntheticModel:
+    """Fitted generator parameters (see module docstring)"""
+    templates: list
+    week_mean: np.ndarray    # (N_WEEKS,)
+    season_sd: float
+    ability_sd: float
+    slope_sd: float
+    noise_sd: float
+    pros: np.ndarray
+    pro_weight: np.ndarray
+    pro_effect: np.ndarray
+    followers_mean: float
+    followers_sd: float
+    profiles: pd.DataFrame
+
+    @classmethod
+    def from_data(cls, df=None, ig_data=None):
+        """Fit to the wide table and the follower sheet (loaded if None)"""
+        if df is None:
+            df = load_dwts_data(DATA_PATH)
+        if ig_data is None:
+            ig_data = load_instagram_followers(IG_PATH)
+        long = reshape_long(df, report=False)
+
+        judge_columns = [f'judge{j}_score' for j in range(1, N_JUDGES + 1)]
+        templates = []
+        for _, season in long.groupby('season', sort=True):
+            weeks = season.groupby('week', sort=True)
+            grid, bonus_rate, bonus = [], [], []
+            for _, week in weeks:
+                values = week.loc[week['active'], judge_columns].to_numpy(np.float64)
+                scored = values[~np.isnan(values)]
+                grid.append(score_grid(scored))
+                above = values > MAX_SCORE
+                bonus_rate.append(above.any(axis=1).mean() if len(values) else 0.0)
+                bonus.append(values[above] - MAX_SCORE)
+            templates.append(SeasonTemplate(
+                n=season['row'].nunique(),
+                eliminated=weeks['eliminated_this_week'].sum().to_numpy(np.int64),
+                withdrew=weeks['withdrew_this_week'].sum().to_numpy(np.int64),
+                panel=np.maximum(weeks['n_judges'].max().to_numpy(np.int64), 1),
+                grid=np.array(grid),
+                bonus_rate=np.array(bonus_rate),
+                bonus=bonus,
+            ))
+
+        # One row per active contestant-week-judge score
+        active = long[long['active']]
+        cells = active.melt(
+            id_vars=['row', 'season', 'week', 'ballroom_partner'],
+            value_vars=[f'judge{j}_score' for j in range(1, N_JUDGES + 1)], value_name='score',
+        ).dropna(subset=['score'])
+        week_mean = cells.groupby('week')['score'].mean().reindex(range(1, N_WEEKS + 1)).ffill().to_numpy()
+        resid = cells['score'] - week_mean[cells['week'] - 1]
+        season_offset = resid.groupby(cells['season']).transform('mean')
+        resid = resid - season_offset
+
+        # Per-contestant intercept (week 1) and slope of the residual
+        t = (cells['week'] - 1).astype(np.float64)
+        by_row = pd.DataFrame({'row': cells['row'], 't': t, 'r': resid, 'tr': t * resid, 'tt': t * t})
+        sums = by_row.groupby('row').agg(n=('r', 'size'), t=('t', 'sum'), r=('r', 'sum'),
+                                         tr=('tr', 'sum'), tt=('tt', 'sum'))
+        denom = sums['n'] * sums['tt'] - sums['t'] ** 2
+        slope = ((sums['n'] * sums['tr'] - sums['t'] * sums['r']) / denom.where(denom > 0)).fillna(0.0)
+        ability = (sums['r'] - slope * sums['t']) / sums['n']
+        noise = resid - ability.reindex(cells['row']).to_numpy() - slope.reindex(cells['row']).to_numpy() * t
+
+        # Pro effect: shrunk mean ability of the pro's celebrities
+        partner = df['ballroom_partner'].reindex(ability.index)
+        by_pro = ability.groupby(partner).agg(['sum', 'size'])
+        pro_effect = by_pro['sum'] / (by_pro['size'] + PARTNER_SHRINKAGE)
+
+        logf = np.log10(ig_data['follower_count'].to_numpy(np.float64) + 1)
+        return cls(
+            templates=templates,
+            week_mean=week_mean,
+            season_sd=float(season_offset.groupby(cells['season']).first().std()),
+            ability_sd=float((ability - pro_effect.reindex(partner).to_numpy()).std()),
+            slope_sd=float(slope[cells.groupby('row')['week'].nunique() >= 3].std()),
+            noise_sd=float(noise.std()),
+            pros=by_pro.index.to_numpy(),
+            pro_weight=(by_pro['size'] / by_pro['size'].sum()).to_numpy(),
+            pro_effect=pro_effect.to_numpy(),
+            followers_mean=float(logf.mean()),
+            followers_sd=float(logf.std()),
+            profiles=df[PROFILE_COLUMNS].reset_index(drop=True),
+        )
+
+    def _template_block(self, template, seasons, rng):
+        """Wide rows (as a dict of arrays) for seasons sharing one template"""
+        S, n, W = len(seasons), template.n, len(template.panel)
+        rows = S * n
+
+        # Pros without replacement per season (Gumbel top-k on log weights)
+        keys = np.log(self.pro_weight) + rng.gumbel(size=(S, len(self.pros)))
+        pro = np.argsort(-keys, axis=1)[:, :n]
+        ability = (self.pro_effect[pro] + self.ability_sd * rng.standard_normal((S, n))
+                   + self.season_sd * rng.standard_normal((S, 1)))
+        slope = self.slope_sd * rng.standard_normal((S, n))
+        logf = self.followers_mean + self.followers_sd * rng.standard_normal((S, n))
+        popularity = (logf - logf.mean(axis=1, keepdims=True)) / (logf.std(axis=1, keepdims=True) + 1e-9)
+
+        scores = np.full((S, n, N_WEEKS, N_JUDGES), np.nan)
+        alive = np.ones((S, n), dtype=bool)
+        exit_week = np.zeros((S, n), dtype=np.int64)
+        placement = np.zeros((S, n), dtype=np.int64)
+        withdrew = np.zeros((S, n), dtype=bool)
+        seasons_idx = np.arange(S)
+        next_place = n
+
+        def leave(order, count, week):
+            # Seasons sharing a template lose the same number of couples each week
+            nonlocal next_place
+            for k in range(count):
+                alive[seasons_idx, order[:, k]] = False
+                exit_week[seasons_idx, order[:, k]] = week
+                placement[seasons_idx, order[:, k]] = next_place
+                next_place -= 1
+
+        for w in range(W):
+            mean = self.week_mean[w] + ability + slope * w
+            raw = mean[..., None] + self.noise_sd * rng.standard_normal((S, n, N_JUDGES))
+            week_scores = np.clip(raw, 1, MAX_SCORE)
+            if template.bonus_rate[w] > 0:
+                gets_bonus = rng.random((S, n)) < template.bonus_rate[w]
+                extra = rng.choice(template.bonus[w], size=(S, n, N_JUDGES))
+                week_scores = week_scores + np.where(gets_bonus[..., None], extra, 0.0)
+            grid = template.grid[w]
+            week_scores = np.maximum(np.round(week_scores * grid) / grid, 1)
+            week_scores[..., template.panel[w]:] = np.nan
+            scores[:, :, w] = np.where(alive[..., None], week_scores, 0.0)
+            scores[:, :, w, template.panel[w]:] = np.nan
+
+            final = w == W - 1
+            if not final and template.withdrew[w]:
+                quit_order = np.argsort(np.where(alive, rng.random((S, n)), np.inf), axis=1)
+                withdrew[seasons_idx[:, None], quit_order[:, :template.withdrew[w]]] = True
+                leave(quit_order, template.withdrew[w], w + 1)
+
+            total = np.nansum(week_scores, axis=2)
+            mu = np.nanmean(np.where(alive, total, np.nan), axis=1, keepdims=True)
+            sd = np.nanstd(np.where(alive, total, np.nan), axis=1, keepdims=True) + 1e-9
+            safety = (total - mu) / sd + FAN_WEIGHT * popularity + rng.standard_normal((S, n))
+            # Worst first among the couples still dancing
+            order = np.argsort(np.where(alive, safety, np.inf), axis=1)
+
+            leave(order, int(alive[0].sum()) if final else int(template.eliminated[w]), w + 1)
+
+        week_ran = np.arange(N_WEEKS) < W
+        scores[:, :, ~week_ran] = np.nan
+        finalist = exit_week == W
+        results = np.where(
+            withdrew, 'Withdrew',
+            np.where(finalist, np.vectorize(_ordinal, otypes=[object])(placement),
+                     np.char.add('Eliminated Week ', exit_week.astype(str)).astype(object)))
+
+        season_col = np.repeat(seasons, n)
+        contestant = np.tile(np.arange(1, n + 1), S)
+        profiles = self.profiles.iloc[rng.integers(len(self.profiles), size=rows)]
+        block = {
+            'celebrity_name': [f"Synthetic S{s} #{c}" for s, c in zip(season_col, contestant)],
+            'ballroom_partner': self.pros[pro.ravel()],
+        }
+        for col in PROFILE_COLUMNS:
+            block[col] = profiles[col].to_numpy()
+        block['season'] = season_col
+        block['results'] = results.ravel()
+        block['placement'] = placement.ravel()
+        flat = scores.reshape(rows, N_WEEKS * N_JUDGES)
+        for i, col in enumerate(SCORE_COLUMNS):
+            block[col] = flat[:, i]
+        block['followers'] = np.round(10 ** logf.ravel() - 1).astype(np.int64)
+        return block
+
+    def generate_block(self, block, seed=0, n_seasons=BLOCK_SEASONS):
+        """
+        Seasons block * BLOCK_SEASONS + 1 onward as one wide DataFrame
+
+        Args:
+            block: block index
+            seed: run seed; the block's stream is SeedSequence(seed, spawn_key=(block,))
+            n_seasons: seasons to keep from the block (for a final partial
+                block; the full block is drawn so any prefix of a run is
+                identical to a shorter run with the same seed)
+
+        Returns:
+            DataFrame in the wide schema plus a followers column, ordered by
+            season
+        """
+        rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(block,)))
+        first = block * BLOCK_SEASONS + 1
+        template_of = rng.integers(len(self.templates), size=BLOCK_SEASONS)
+        seasons = np.arange(first, first + BLOCK_SEASONS)
+        frames = []
+        for t in np.unique(template_of):
+            frames.append(pd.DataFrame(self._template_block(self.templates[t], seasons[template_of == t], rng)))
+        frame = pd.concat(frames, ignore_index=True).sort_values('season', kind='stable', ignore_index=True)
+        return frame.loc[frame['season'] < first + n_seasons, COLUMNS + ['followers']].reset_index(drop=True)
+
+
+def generate(model, n_seasons, seed=0):
+    """Yield wide DataFrames of up to BLOCK_SEASONS seasons each"""
+    for block, start in enumerate(range(0, n_seasons, BLOCK_SEASONS)):
+        yield model.generate_block(block, seed, min(BLOCK_SEASONS, n_seasons - start))
+
+
+def write(model, path, n_seasons, seed=0, followers_path=None):
+    """
+    Stream n_seasons synthetic seasons to CSV or Parquet (by suffix)
+
+    Args:
+        followers_path: optional CSV in the celebrityIG sheet schema
+            (celebrity_name, followers)
+
+    Returns:
+        rows written
+    """
+    path = Path(path)
+    parquet = path.suffix == '.parquet'
+    writer, rows = None, 0
+    try:
+        for k, frame in enumerate(generate(model, n_seasons, seed)):
+            followers = frame.pop('followers')
+            if parquet:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+                table = pa.Table.from_pandas(frame, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+            else:
+                frame.to_csv(path, mode='w' if k == 0 else 'a', header=k == 0, index=False)
+            if followers_path is not None:
+                sheet = pd.DataFrame({'celebrity_name': frame['celebrity_name'], 'followers': followers})
+                sheet.to_csv(followers_path, mode='w' if k == 0 else 'a', header=k == 0, index=False)
+            rows += len(frame)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic DWTS seasons")
+    size = parser.add_mutually_exclusive_group(required=True)
+    size.add_argument('--seasons', type=int)
+    size.add_argument('--rows', type=int, help="approximate contestant rows")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', required=True, help=".csv or .parquet")
+    parser.add_argument('--followers', help="optional follower sheet CSV")
+    args = parser.parse_args()
+
+    model = SyntheticModel.from_data()
+    mean_size = np.mean([t.n for t in model.templates])
+    n_seasons = args.seasons or max(1, int(round(args.rows / mean_size)))
+
+    print("=" * 80)
+    print(f"SYNTHETIC SEASONS ({n_seasons:,} seasons, seed {args.seed})")
+    print("=" * 80)
+    print(f"  judge noise sd {model.noise_sd:.2f}, ability sd {model.ability_sd:.2f}, "
+          f"slope sd {model.slope_sd:.3f}, season sd {model.season_sd:.2f}")
+    start = time.perf_counter()
+    rows = write(model, args.output, n_seasons, args.seed, args.followers)
+    seconds = time.perf_counter() - start
+    print(f"\n✓ {rows:,} contestant rows written to {args.output} "
+          f"in {seconds:.1f}s ({rows / seconds:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
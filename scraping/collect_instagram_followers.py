@@ -15,6 +15,14 @@ import time
 import json
 from instagrapi import Client
 from instagrapi.exceptions import UserNotFound
+import sys
+
+# Results go to the shared profile store in dwts/ (repo root on the path)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from dwts.followers import FollowerStore
+from dwts.profiles import ProfileStore
+from instagram_sessions import ACCOUNTS_PATH, SessionPool
+from probe_plan import ProbePlan
 
 # Load DWTS data and get unique celebrities
 def load_dwts_celebrities():
@@ -24,7 +32,7 @@ def load_dwts_celebrities():
         print(f"ERROR: Cannot find {DATA_PATH}")
         return []
     
-    df = pd.read_csv(DATA_PATH)
+    df = pd.read_csv(DATA_PATH, usecols=['celebrity_name'])
     celebrities = sorted(df['celebrity_name'].unique().tolist())
     return celebrities
 
@@ -71,7 +79,7 @@ def generate_instagram_handles(celebrity_names):
     return handle_candidates
 
 
-def collect_followers_instagrapi(celebrity_names, handle_candidates=None, username=None, password=None):
+def collect_followers_instagrapi(celebrity_names, handle_candidates=None, username=None, password=None, sessions=None):
     """
     Collect followers using instagrapi (unofficial Instagram API)
     Supports login for better results
@@ -81,6 +89,7 @@ def collect_followers_instagrapi(celebrity_names, handle_candidates=None, userna
         handle_candidates: dict mapping names to list of possible IG handles
         username: Instagram username for login (optional but recommended)
         password: Instagram password for login (optional but recommended)
+        sessions: SessionPool to use instead of username/password
     
     Returns:
         dict with celebrity_name: {'handle': handle, 'followers': count, 'found': bool}
@@ -93,12 +102,14 @@ def collect_followers_instagrapi(celebrity_names, handle_candidates=None, userna
     try:
         cl = Client()
         
-        # Try to login if credentials provided
-        if username and password:
-            print(f"\nAttempting to login as @{username}...")
+        # Use a saved session (or log in once) if credentials provided
+        if sessions is None and username and password:
+            sessions = SessionPool([(username, password)])
+        if sessions is not None:
             try:
-                cl.login(username, password)
-                print(f"✓ Successfully logged in as @{username}")
+                sessions.client()
+                cl = sessions
+                print(f"✓ Using Instagram session of @{sessions.username}")
             except Exception as login_error:
                 print(f"⚠ Login failed: {login_error}")
                 print("Attempting anonymous mode instead...\n")
@@ -115,26 +126,31 @@ def collect_followers_instagrapi(celebrity_names, handle_candidates=None, userna
     found_count = 0
     not_found_count = 0
     
+    # Plan the probes for all celebrities at once: each handle is looked up once
+    plan = ProbePlan({
+        name: (handle_candidates or {}).get(name) or [
+            name.lower().replace(" ", ""),
+            name.lower().replace(" ", "."),
+            name.lower().replace(" ", "_"),
+        ]
+        for name in celebrity_names
+    })
+    plan.report()
+    print()
+    
     for idx, celebrity_name in enumerate(celebrity_names, 1):
         print(f"[{idx}/{len(celebrity_names)}] Searching for: {celebrity_name}")
         found = False
         
-        # Get candidate handles for this celebrity
-        if handle_candidates and celebrity_name in handle_candidates:
-            candidates = handle_candidates[celebrity_name]
-        else:
-            # Default candidates
-            candidates = [
-                celebrity_name.lower().replace(" ", ""),
-                celebrity_name.lower().replace(" ", "."),
-                celebrity_name.lower().replace(" ", "_"),
-            ]
+        # Planned candidate handles for this celebrity
+        candidates = plan.candidates[celebrity_name]
         
         # Try each candidate handle
         if client_ready:
             for handle in candidates:
+                cached = handle in plan
                 try:
-                    user_info = cl.user_info_by_username(handle)
+                    user_info = plan.probe(handle, cl.user_info_by_username, answers=(UserNotFound,))
                     follower_count = user_info.follower_count
                     
                     followers_data[celebrity_name] = {
@@ -161,7 +177,8 @@ def collect_followers_instagrapi(celebrity_names, handle_candidates=None, userna
                 
                 finally:
                     # Rate limiting: wait 1-2 seconds between requests
-                    time.sleep(1.5)
+                    if not cached:
+                        time.sleep(1.5)
         
         if not found:
             followers_data[celebrity_name] = {
@@ -179,6 +196,7 @@ def collect_followers_instagrapi(celebrity_names, handle_candidates=None, userna
     print(f"Found: {found_count}")
     print(f"Not found: {not_found_count}")
     print(f"Success rate: {found_count/len(celebrity_names)*100:.1f}%")
+    print(f"Probes: {plan.summary()}")
     
     return followers_data
 
@@ -248,6 +266,9 @@ def save_results(followers_data, output_file='instagram_followers_collected.csv'
     df.to_csv(output_file, index=False)
     
     print(f"\n✓ Results saved to: {output_file}")
+    with ProfileStore(history=FollowerStore()) as store:
+        added = store.record(followers_data, source='instagrapi')
+    print(f"✓ {added} new observations recorded in {store.path.name}")
     return df
 
 
@@ -274,15 +295,20 @@ if __name__ == "__main__":
     print("\nLogging in will give better access to follower data.")
     print("If you don't have Instagram, just press Enter to skip.\n")
     
-    ig_username = input("Enter your Instagram username (or press Enter to skip): ").strip()
-    ig_password = None
-    
-    if ig_username:
-        import getpass
-        ig_password = getpass.getpass("Enter your Instagram password: ")
-        print("✓ Credentials captured (password hidden)")
+    sessions = None
+    if ACCOUNTS_PATH.exists():
+        sessions = SessionPool.from_csv(ACCOUNTS_PATH)
+        print(f"✓ Using {len(sessions.accounts)} account(s) from {ACCOUNTS_PATH}")
     else:
-        print("⚠ Skipping login - using anonymous mode (may have limited success)")
+        ig_username = input("Enter your Instagram username (or press Enter to skip): ").strip()
+        
+        if ig_username:
+            import getpass
+            ig_password = getpass.getpass("Enter your Instagram password: ")
+            sessions = SessionPool([(ig_username, ig_password)])
+            print("✓ Credentials captured (password hidden)")
+        else:
+            print("⚠ Skipping login - using anonymous mode (may have limited success)")
     
     # Step 3: Generate Instagram handle candidates
     print("\n" + "="*80)
@@ -298,7 +324,7 @@ if __name__ == "__main__":
     print(f"\nThis will take ~{len(celebrities) * 1.5 / 60:.0f} minutes ({len(celebrities)} celebrities × 1.5 sec per try)")
     print("Please be patient...\n")
     
-    followers_data = collect_followers_instagrapi(celebrities, handle_candidates, ig_username, ig_password)
+    followers_data = collect_followers_instagrapi(celebrities, handle_candidates, sessions=sessions)
     
     # Step 5: Save results
     print("\nStep 5: Saving results...")
@@ -17,6 +17,14 @@ import json
 import random
 from instagrapi import Client
 from instagrapi.exceptions import UserNotFound
+import sys
+
+# Results go to the shared profile store in dwts/ (repo root on the path)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from dwts.followers import FollowerStore
+from dwts.profiles import ProfileStore
+from instagram_sessions import ACCOUNTS_PATH, SessionPool
+from probe_plan import ProbePlan
 
 
 # Load DWTS data and get unique celebrities
@@ -27,7 +35,7 @@ def load_dwts_celebrities():
         print(f"ERROR: Cannot find {DATA_PATH}")
         return []
     
-    df = pd.read_csv(DATA_PATH)
+    df = pd.read_csv(DATA_PATH, usecols=['celebrity_name'])
     celebrities = sorted(df['celebrity_name'].unique().tolist())
     return celebrities
 
@@ -74,7 +82,7 @@ def generate_instagram_handles(celebrity_names):
     return handle_candidates
 
 
-def collect_followers_instagrapi(celebrity_names, handle_candidates=None, username=None, password=None, min_followers=5000, test_mode=False, test_count=15):
+def collect_followers_instagrapi(celebrity_names, handle_candidates=None, username=None, password=None, min_followers=5000, test_mode=False, test_count=15, sessions=None):
     """
     Collect followers using instagrapi (unofficial Instagram API)
     Filters by minimum follower count and verified status to avoid fake accounts
@@ -87,6 +95,7 @@ def collect_followers_instagrapi(celebrity_names, handle_candidates=None, userna
         min_followers: Minimum follower count to consider valid (default 5000)
         test_mode: If True, only test on test_count celebrities
         test_count: Number of celebrities to test (default 15)
+        sessions: SessionPool to reuse across calls (built from username/password if None)
     
     Returns:
         dict with celebrity_name: {'handle': handle, 'followers': count, 'found': bool, 'verified': bool}
@@ -113,12 +122,14 @@ def collect_followers_instagrapi(celebrity_names, handle_candidates=None, userna
     try:
         cl = Client()
         
-        # Try to login if credentials provided
-        if username and password:
-            print(f"Attempting to login as @{username}...")
+        # Use a saved session (or log in once) if credentials provided
+        if sessions is None and username and password:
+            sessions = SessionPool([(username, password)])
+        if sessions is not None:
             try:
-                cl.login(username, password)
-                print(f"✓ Successfully logged in as @{username}\n")
+                sessions.client()
+                cl = sessions
+                print(f"✓ Using Instagram session of @{sessions.username}\n")
             except Exception as login_error:
                 print(f"⚠ Login failed: {login_error}")
                 print("Attempting anonymous mode instead...\n")
@@ -136,26 +147,31 @@ def collect_followers_instagrapi(celebrity_names, handle_candidates=None, userna
     not_found_count = 0
     filtered_out_count = 0
     
+    # Plan the probes for all celebrities at once: each handle is looked up once
+    plan = ProbePlan({
+        name: (handle_candidates or {}).get(name) or [
+            name.lower().replace(" ", ""),
+            name.lower().replace(" ", "."),
+            name.lower().replace(" ", "_"),
+        ]
+        for name in celebrities_to_search
+    })
+    plan.report()
+    print()
+    
     for idx, celebrity_name in enumerate(celebrities_to_search, 1):
         print(f"[{idx:3d}/{len(celebrities_to_search)}] {celebrity_name:35s}", end=" | ", flush=True)
         best_account = None
         
-        # Get candidate handles for this celebrity
-        if handle_candidates and celebrity_name in handle_candidates:
-            candidates = handle_candidates[celebrity_name]
-        else:
-            # Default candidates
-            candidates = [
-                celebrity_name.lower().replace(" ", ""),
-                celebrity_name.lower().replace(" ", "."),
-                celebrity_name.lower().replace(" ", "_"),
-            ]
+        # Planned candidate handles for this celebrity
+        candidates = plan.candidates[celebrity_name]
         
         # Try each candidate handle
         if client_ready:
             for handle in candidates:
+                cached = handle in plan
                 try:
-                    user_info = cl.user_info_by_username(handle)
+                    user_info = plan.probe(handle, cl.user_info_by_username, answers=(UserNotFound,))
                     follower_count = user_info.follower_count
                     is_verified = user_info.is_verified
                     
@@ -179,7 +195,8 @@ def collect_followers_instagrapi(celebrity_names, handle_candidates=None, userna
                 
                 finally:
                     # Rate limiting: wait 1.5 seconds between requests
-                    time.sleep(1.5)
+                    if not cached:
+                        time.sleep(1.5)
         
         if best_account:
             followers_data[celebrity_name] = best_account
@@ -208,6 +225,7 @@ def collect_followers_instagrapi(celebrity_names, handle_candidates=None, userna
     else:
         success_rate = 0
     print(f"Success rate: {success_rate:.1f}%")
+    print(f"Probes: {plan.summary()}")
     
     if test_mode:
         print(f"\n⚠ TEST MODE - Results above are from {test_count} random celebrities")
@@ -239,6 +257,9 @@ def save_results(followers_data, output_file='instagram_followers_collected.csv'
     df.to_csv(output_file, index=False)
     
     print(f"\n✓ Results saved to: {output_file}")
+    with ProfileStore(history=FollowerStore()) as store:
+        added = store.record(followers_data, source='instagrapi')
+    print(f"✓ {added} new observations recorded in {store.path.name}")
     return df
 
 
@@ -265,15 +286,21 @@ if __name__ == "__main__":
     print("\nLogging in will give better access to follower data.")
     print("If you don't have Instagram, just press Enter to skip.\n")
     
-    ig_username = input("Enter your Instagram username (or press Enter to skip): ").strip()
-    ig_password = None
-    
-    if ig_username:
-        import getpass
-        ig_password = getpass.getpass("Enter your Instagram password: ")
-        print("✓ Credentials captured (password hidden)")
+    # One session pool for the test and the full run, so we log in at most once
+    sessions = None
+    if ACCOUNTS_PATH.exists():
+        sessions = SessionPool.from_csv(ACCOUNTS_PATH)
+        print(f"✓ Using {len(sessions.accounts)} account(s) from {ACCOUNTS_PATH}")
     else:
-        print("⚠ Skipping login - using anonymous mode (may have limited success)")
+        ig_username = input("Enter your Instagram username (or press Enter to skip): ").strip()
+        
+        if ig_username:
+            import getpass
+            ig_password = getpass.getpass("Enter your Instagram password: ")
+            sessions = SessionPool([(ig_username, ig_password)])
+            print("✓ Credentials captured (password hidden)")
+        else:
+            print("⚠ Skipping login - using anonymous mode (may have limited success)")
     
     # Step 3: Generate Instagram handle candidates
     print("\n" + "="*80)
@@ -291,11 +318,10 @@ if __name__ == "__main__":
     test_followers_data = collect_followers_instagrapi(
         celebrities, 
         handle_candidates, 
-        ig_username, 
-        ig_password,
         min_followers=5000,  # Default: 5000 followers minimum
         test_mode=True,
-        test_count=15
+        test_count=15,
+        sessions=sessions
     )
     
     # Step 5: Show test results
@@ -338,10 +364,9 @@ if __name__ == "__main__":
         full_followers_data = collect_followers_instagrapi(
             celebrities, 
             handle_candidates, 
-            ig_username, 
-            ig_password,
             min_followers=5000,
-            test_mode=False
+            test_mode=False,
+            sessions=sessions
         )
         
         # Save results
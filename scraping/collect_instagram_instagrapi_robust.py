@@ -10,8 +10,15 @@ import pandas as pd
 from pathlib import Path
 import time
 import random
-from instagrapi import Client
 from instagrapi.exceptions import UserNotFound, BadPassword, LoginRequired
+import sys
+
+# Results go to the shared profile store in dwts/ (repo root on the path)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from dwts.followers import FollowerStore
+from dwts.profiles import ProfileStore
+from instagram_sessions import ACCOUNTS_PATH, SessionPool
+from probe_plan import ProbePlan
 
 
 def load_dwts_celebrities():
@@ -21,7 +28,7 @@ def load_dwts_celebrities():
         print(f"ERROR: Cannot find {DATA_PATH}")
         return []
     
-    df = pd.read_csv(DATA_PATH)
+    df = pd.read_csv(DATA_PATH, usecols=['celebrity_name'])
     celebrities = sorted(df['celebrity_name'].unique().tolist())
     return celebrities
 
@@ -128,8 +135,8 @@ def generate_handle_candidates(name: str) -> list:
     return unique_candidates
 
 
-def collect_followers_instagrapi(celebrity_names, username, password, min_followers=5000, 
-                                 test_mode=False, test_count=15, max_retries=3):
+def collect_followers_instagrapi(celebrity_names, username=None, password=None, min_followers=5000, 
+                                 test_mode=False, test_count=15, max_retries=3, sessions=None):
     """
     Collect Instagram followers using Instagrapi with robust error handling
     
@@ -141,6 +148,7 @@ def collect_followers_instagrapi(celebrity_names, username, password, min_follow
         test_mode: if True, only test on test_count celebrities
         test_count: number of celebrities to test
         max_retries: max retries per celebrity
+        sessions: SessionPool to reuse across calls (built from username/password if None)
     
     Returns:
         dict with results
@@ -149,7 +157,9 @@ def collect_followers_instagrapi(celebrity_names, username, password, min_follow
     print("INSTAGRAM COLLECTOR - Instagrapi (ROBUST VERSION)")
     print("="*80)
     print(f"\nSettings:")
-    print(f"  - Account: {username}")
+    if sessions is None:
+        sessions = SessionPool([(username, password)])
+    print(f"  - Account(s): {', '.join(a.username for a in sessions.accounts)}")
     print(f"  - Minimum follower count: {min_followers:,}")
     print(f"  - Handle variations: Multiple per celebrity")
     print(f"  - Error handling: Comprehensive")
@@ -162,14 +172,13 @@ def collect_followers_instagrapi(celebrity_names, username, password, min_follow
         celebrities_to_search = celebrity_names
         print()
     
-    # Initialize client
+    # Initialize client (saved session, else one login)
     print("Initializing Instagrapi client...")
-    client = Client()
+    client = sessions
     
     try:
-        print(f"Logging in as {username}...")
-        client.login(username, password)
-        print("✓ Login successful\n")
+        client.client()
+        print(f"✓ Session ready for @{client.username}\n")
     except Exception as e:
         print(f"✗ Login failed: {str(e)}")
         return {}
@@ -180,12 +189,17 @@ def collect_followers_instagrapi(celebrity_names, username, password, min_follow
     error_count = 0
     skipped_count = 0
     
+    # Plan the probes for all celebrities at once: each handle is looked up once
+    plan = ProbePlan({name: generate_handle_candidates(name) for name in celebrities_to_search})
+    plan.report()
+    print()
+    
     try:
         for idx, celebrity_name in enumerate(celebrities_to_search, 1):
             print(f"[{idx:3d}/{len(celebrities_to_search)}] {celebrity_name:35s}", end=" | ", flush=True)
             
-            # Generate multiple handle candidates
-            handle_candidates = generate_handle_candidates(celebrity_name)
+            # Planned handle candidates
+            handle_candidates = plan.candidates[celebrity_name]
             
             # Try each handle
             followers_count = None
@@ -194,9 +208,10 @@ def collect_followers_instagrapi(celebrity_names, username, password, min_follow
             last_error = None
             
             for handle in handle_candidates:
+                cached = handle in plan
                 try:
-                    # Try to get user info
-                    user_info = client.user_info_by_username(handle)
+                    # Try to get user info (or the stored answer)
+                    user_info = plan.probe(handle, client.user_info_by_username, answers=(UserNotFound,))
                     
                     followers_count = user_info.follower_count
                     is_verified = user_info.is_verified
@@ -224,7 +239,8 @@ def collect_followers_instagrapi(celebrity_names, username, password, min_follow
                 
                 finally:
                     # Rate limit between attempts
-                    time.sleep(random.uniform(0.5, 1.5))
+                    if not cached:
+                        time.sleep(random.uniform(0.5, 1.5))
             
             # Check if we found them, verified, and meet threshold
             if followers_count and is_verified and followers_count >= min_followers:
@@ -277,6 +293,7 @@ def collect_followers_instagrapi(celebrity_names, username, password, min_follow
         print(f"Found: {found_count}")
         print(f"Not found: {not_found_count}")
         print(f"Errors/Skipped: {error_count + skipped_count}")
+        print(f"Probes: {plan.summary()}")
         if celebrities_to_search:
             print(f"Success rate: {found_count/len(celebrities_to_search)*100:.1f}%")
         
@@ -302,6 +319,9 @@ def save_results(followers_data, output_file='instagram_followers_instagrapi.csv
     df = pd.DataFrame(records)
     df.to_csv(output_file, index=False)
     print(f"✓ Results saved to: {output_file}")
+    with ProfileStore(history=FollowerStore()) as store:
+        added = store.record(followers_data, source='instagrapi')
+    print(f"✓ {added} new observations recorded in {store.path.name}")
     return df
 
 
@@ -318,8 +338,14 @@ if __name__ == "__main__":
     
     # Get login credentials
     print("\n" + "="*80)
-    username = input("Enter Instagram username: ").strip()
-    password = input("Enter Instagram password: ").strip()
+    # One session pool for the test and the full run, so we log in at most once
+    if ACCOUNTS_PATH.exists():
+        sessions = SessionPool.from_csv(ACCOUNTS_PATH)
+        print(f"✓ Using {len(sessions.accounts)} account(s) from {ACCOUNTS_PATH}")
+    else:
+        username = input("Enter Instagram username: ").strip()
+        password = input("Enter Instagram password: ").strip()
+        sessions = SessionPool([(username, password)])
     
     # Test mode first
     print("\n" + "="*80)
@@ -328,8 +354,7 @@ if __name__ == "__main__":
     
     test_results = collect_followers_instagrapi(
         celebrities,
-        username=username,
-        password=password,
+        sessions=sessions,
         min_followers=5000,
         test_mode=True,
         test_count=10
@@ -361,8 +386,7 @@ if __name__ == "__main__":
             
             full_results = collect_followers_instagrapi(
                 celebrities,
-                username=username,
-                password=password,
+                sessions=sessions,
                 min_followers=5000,
                 test_mode=False
             )
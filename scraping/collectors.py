@@ -0,0 +1,421 @@
+"""
+Multi-platform follower collectors on one async scheduler
+
+The seven Instagram scripts each run the same sequential loop (one
+request, sleep, next celebrity), so adding X, TikTok and YouTube that way
+would multiply the run time by four. Here each platform is a Backend
+class that only knows how to build its requests, parse a response and
+how hard it may be hit (requests per second, burst, concurrency, handles
+per request). One scheduler drives every backend at once over a single
+httpx.AsyncClient connection pool, each platform throttled by its own
+token bucket, so four platforms take about as long as the slowest one.
+
+Results are recorded in the shared profile store (dwts.profiles) under
+source 'collector' with platform set; Instagram counts also go to the
+follower history.
+
+Handles come from the reconciled Instagram profiles, else a guess from
+the name (the same handle is probed on every platform), or --handles.
+
+INSTALLATION:
+    pip install httpx
+
+USAGE:
+    python collectors.py --fixtures                         (local fake APIs)
+    python collectors.py --platforms instagram tiktok
+    X_BEARER_TOKEN=... YOUTUBE_API_KEY=... python collectors.py
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import random
+import re
+import sys
+import time
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+import httpx
+import pandas as pd
+
+# Results go to the shared profile store in dwts/ (repo root on the path)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from dwts.data import DATA_PATH
+from dwts.followers import FollowerStore
+from dwts.profiles import PROFILE_DB, ProfileStore
+
+
+MAX_CONNECTIONS = 100
+TIMEOUT = 15
+MAX_RETRIES = 3
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+
+class TokenBucket:
+    """Async token bucket: rate tokens per second, up to burst saved up"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause(self, seconds):
+        """Drain the bucket so the next request waits about `seconds` (after a 429)"""
+        self.tokens = min(self.tokens, 1 - seconds * self.rate)
+
+
+@dataclass
+class Request:
+    url: str
+    params: dict
+    handles: list
+
+
+@dataclass
+class Backend:
+    """
+    One platform: request building, parsing and rate-limit policy
+
+    Subclasses set platform, base_url and the limits, and implement
+    requests() and parse(). parse() returns {handle: (followers, verified)}
+    for the handles it found; handles missing from the result are
+    recorded as not found.
+    """
+    base_url: str = ''
+    rate: float = 1.0           # requests per second
+    burst: int = 1
+    concurrency: int = 4        # requests in flight
+    batch_size: int = 1         # handles per request
+    headers: dict = field(default_factory=dict)
+
+    platform = ''
+
+    @property
+    def available(self):
+        """False when a required credential is missing"""
+        return True
+
+    def requests(self, handles):
+        for start in range(0, len(handles), self.batch_size):
+            yield self.request(handles[start:start + self.batch_size])
+
+    def request(self, handles):
+        raise NotImplementedError
+
+    def parse(self, response, handles):
+        raise NotImplementedError
+
+
+@dataclass
+class InstagramBackend(Backend):
+    base_url: str = 'https://i.instagram.com'
+    rate: float = 0.5
+    burst: int = 2
+    concurrency: int = 2
+    headers: dict = field(default_factory=lambda: {'User-Agent': USER_AGENT, 'X-IG-App-ID': '936619743392459'})
+
+    platform = 'instagram'
+
+    def request(self, handles):
+        return Request(f"{self.base_url}/api/v1/users/web_profile_info/", {'username': handles[0]}, handles)
+
+    def parse(self, response, handles):
+        if response.status_code == 404:
+            return {}
+        data = response.json().get('data', {})
+        user = data.get('user') or data
+        followers = user.get('edge_followed_by', {}).get('count')
+        return {handles[0]: (followers, user.get('is_verified'))} if followers is not None else {}
+
+
+@dataclass
+class XBackend(Backend):
+    base_url: str = 'https://api.twitter.com'
+    rate: float = 300 / 900     # users/by: 300 requests per 15 minutes
+    burst: int = 5
+    concurrency: int = 2
+    batch_size: int = 100
+    token: str = field(default_factory=lambda: os.environ.get('X_BEARER_TOKEN', ''))
+
+    platform = 'x'
+
+    def __post_init__(self):
+        self.headers = {**self.headers, 'Authorization': f"Bearer {self.token}"}
+
+    @property
+    def available(self):
+        return bool(self.token)
+
+    def request(self, handles):
+        return Request(f"{self.base_url}/2/users/by",
+                       {'usernames': ','.join(handles), 'user.fields': 'public_metrics,verified'}, handles)
+
+    def parse(self, response, handles):
+        wanted = {h.lower(): h for h in handles}
+        found = {}
+        for user in response.json().get('data', []):
+            handle = wanted.get(user['username'].lower())
+            if handle is not None:
+                found[handle] = (user['public_metrics']['followers_count'], user.get('verified'))
+        return found
+
+
+@dataclass
+class TikTokBackend(Backend):
+    base_url: str = 'https://www.tiktok.com'
+    rate: float = 1.0
+    burst: int = 3
+    concurrency: int = 3
+    headers: dict = field(default_factory=lambda: {'User-Agent': USER_AGENT})
+
+    platform = 'tiktok'
+
+    def request(self, handles):
+        return Request(f"{self.base_url}/api/user/detail/", {'uniqueId': handles[0]}, handles)
+
+    def parse(self, response, handles):
+        info = response.json().get('userInfo') or {}
+        followers = info.get('stats', {}).get('followerCount')
+        if followers is None:
+            return {}
+        return {handles[0]: (followers, info.get('user', {}).get('verified'))}
+
+
+@dataclass
+class YouTubeBackend(Backend):
+    base_url: str = 'https://www.googleapis.com'
+    rate: float = 5.0
+    burst: int = 10
+    concurrency: int = 5
+    api_key: str = field(default_factory=lambda: os.environ.get('YOUTUBE_API_KEY', ''))
+
+    platform = 'youtube'
+
+    @property
+    def available(self):
+        return bool(self.api_key)
+
+    def request(self, handles):
+        # forHandle takes a single handle, so no batching here
+        return Request(f"{self.base_url}/youtube/v3/channels",
+                       {'part': 'statistics', 'forHandle': f"@{handles[0]}", 'key': self.api_key}, handles)
+
+    def parse(self, response, handles):
+        items = response.json().get('items') or []
+        if not items:
+            return {}
+        return {handles[0]: (int(items[0]['statistics']['subscriberCount']), None)}
+
+
+BACKENDS = {backend.platform: backend for backend in
+            [InstagramBackend, XBackend, TikTokBackend, YouTubeBackend]}
+
+
+def retry_after(value, default):
+    """Seconds to wait from a Retry-After header (delay in seconds or an HTTP date)"""
+    if value is None:
+        return default
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+async def fetch(client, backend, bucket, request):
+    """One request with retries on 429 / 5xx / network errors"""
+    for attempt in range(MAX_RETRIES + 1):
+        await bucket.acquire()
+        try:
+            response = await client.get(request.url, params=request.params, headers=backend.headers)
+        except httpx.HTTPError as error:
+            if attempt == MAX_RETRIES:
+                return {}, f"{type(error).__name__}"
+            await asyncio.sleep(2 ** attempt + random.random())
+            continue
+        if response.status_code == 429 or response.status_code >= 500:
+            wait = retry_after(response.headers.get('Retry-After'), 2 ** attempt)
+            bucket.pause(wait)
+            if attempt == MAX_RETRIES:
+                return {}, f"HTTP {response.status_code}"
+            continue
+        if response.status_code not in (200, 404):
+            return {}, f"HTTP {response.status_code}"
+        try:
+            return backend.parse(response, request.handles), None
+        except (ValueError, KeyError, TypeError) as error:
+            return {}, f"parse error: {error}"
+    return {}, 'retries exhausted'
+
+
+async def _run_backend(client, backend, handles, progress):
+    bucket = TokenBucket(backend.rate, backend.burst)
+    slots = asyncio.Semaphore(backend.concurrency)
+    rows = []
+
+    async def run(request):
+        async with slots:
+            found, error = await fetch(client, backend, bucket, request)
+        for handle in request.handles:
+            followers, verified = found.get(handle, (None, None))
+            rows.append({'platform': backend.platform, 'handle': handle, 'followers': followers,
+                         'verified': verified, 'found': handle in found, 'error': error})
+        progress[backend.platform] += len(request.handles)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run(r) for r in backend.requests(handles)))
+    return rows, time.perf_counter() - start
+
+
+async def collect(handles, backends, max_connections=MAX_CONNECTIONS, timeout=TIMEOUT):
+    """
+    Look up every handle on every backend concurrently
+
+    Args:
+        handles: list of handles, or {platform: handles} to probe different
+            handles per platform
+        backends: Backend instances
+
+    Returns:
+        (DataFrame with platform, handle, followers, verified, found, error;
+         {platform: seconds})
+    """
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+    progress = {b.platform: 0 for b in backends}
+    async with httpx.AsyncClient(limits=limits, timeout=timeout, follow_redirects=True) as client:
+        runs = await asyncio.gather(*(
+            _run_backend(client, b, handles[b.platform] if isinstance(handles, dict) else handles, progress)
+            for b in backends))
+    rows = [row for platform_rows, _ in runs for row in platform_rows]
+    return pd.DataFrame(rows), {b.platform: elapsed for b, (_, elapsed) in zip(backends, runs)}
+
+
+def celebrity_handles(store=None):
+    """
+    {celebrity_name: handle without @} for every contestant
+
+    Uses the reconciled Instagram handle where the store (if given) has
+    one, else the name run together (the guess scrape_instagram_httpx.py
+    makes).
+    """
+    names = pd.read_csv(DATA_PATH, usecols=['celebrity_name'])['celebrity_name'].str.strip().unique()
+    guesses = {name: re.sub(r'[^a-z0-9._]', '', name.lower()) for name in names}
+    if store is None:
+        return guesses
+    known = store.profiles('instagram').dropna(subset=['handle'])
+    known = dict(zip(known['celebrity_id'], known['handle'].str.lstrip('@')))
+    ids = store.index.celebrity_ids(pd.Series(names))
+    return {name: known.get(cid) or guesses[name] for name, cid in zip(names, ids)}
+
+
+def record_results(store, results, celebrities):
+    """Record collector rows into the profile store under each platform"""
+    owners = {}
+    for name, handle in celebrities.items():
+        owners.setdefault(handle.lower(), []).append(name)
+    added = 0
+    for platform, rows in results.groupby('platform'):
+        data = {}
+        for row in rows.itertuples(index=False):
+            if row.error:
+                continue
+            for name in owners.get(row.handle.lower(), []):
+                data[name] = {'handle': f"@{row.handle}", 'followers': row.followers,
+                              'verified': row.verified, 'found': row.found}
+        added += store.record(data, source='collector', platform=platform)
+    return added
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Collect follower counts from several platforms at once")
+    parser.add_argument('--platforms', nargs='+', choices=sorted(BACKENDS), default=sorted(BACKENDS))
+    parser.add_argument('--handles', nargs='+', help="probe these handles instead of the stored Instagram ones")
+    parser.add_argument('--fixtures', action='store_true', help="run against a local fixture server")
+    parser.add_argument('--db', help="profile database (default: dwts.profiles.PROFILE_DB)")
+    parser.add_argument('--no-record', action='store_true', help="print results without storing them")
+    args = parser.parse_args()
+
+    print("\n" + "=" * 80)
+    print(f"MULTI-PLATFORM COLLECTOR: {', '.join(args.platforms)}")
+    print("=" * 80)
+
+    server = None
+    if args.fixtures:
+        import fixture_server
+        server, base_url = fixture_server.serve()
+        backends = []
+        for p in args.platforms:
+            credentials = {f.name: 'fixture' for f in fields(BACKENDS[p]) if f.name in ('token', 'api_key')}
+            backends.append(BACKENDS[p](base_url=f"{base_url}/{p}", rate=40, burst=10, concurrency=16,
+                                        **credentials))
+        print(f"✓ Fixture APIs on {base_url}")
+    else:
+        backends = [BACKENDS[p]() for p in args.platforms]
+        for backend in backends:
+            if not backend.available:
+                print(f"⚠ Skipping {backend.platform}: credentials not set")
+        backends = [b for b in backends if b.available]
+        if not backends:
+            parser.exit(1, "✗ No platform to collect: every requested backend is missing credentials\n")
+
+    # Fixture counts are fake: keep them out of the real database and history
+    record = not args.no_record and not args.handles and (args.db or not args.fixtures)
+    db = Path(args.db) if args.db else PROFILE_DB
+    # Without recording, the store is only read for handles, and only if it exists
+    if record or (not args.handles and db.exists()):
+        opened = ProfileStore(db, history=None if args.fixtures else FollowerStore())
+    else:
+        opened = contextlib.nullcontext()
+    with opened as store:
+        if args.handles:
+            celebrities = {h: h.lstrip('@') for h in args.handles}
+        else:
+            celebrities = celebrity_handles(store)
+        handles = sorted({h.lstrip('@') for h in celebrities.values()})
+        print(f"✓ {len(handles)} handles x {len(backends)} platforms\n")
+
+        start = time.perf_counter()
+        results, elapsed = asyncio.run(collect(handles, backends))
+        total = time.perf_counter() - start
+
+        summary = results.groupby('platform').agg(
+            probed=('handle', 'size'), found=('found', 'sum'), errors=('error', 'count'))
+        summary['seconds'] = pd.Series(elapsed).round(2)
+        print(summary.to_string())
+        print(f"\n✓ {len(results)} lookups in {total:.1f}s "
+              f"(platforms one after another: {sum(elapsed.values()):.1f}s)")
+
+        if record and len(results):
+            added = record_results(store, results, celebrities)
+            print(f"✓ {added} new observations recorded in {store.path.name}")
+
+    if server is not None:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
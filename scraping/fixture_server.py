@@ -0,0 +1,166 @@
+"""
+Local stand-ins for the platform APIs used by collectors.py
+
+Serves the response shapes of the four profile endpoints the collector
+backends call, from a fake account table derived from the handle (so
+every run sees the same numbers), with a fixed per-request latency and a
+per-platform requests-per-second limit answered with 429 + Retry-After:
+
+    /instagram/api/v1/users/web_profile_info/?username=<handle>
+    /x/2/users/by?usernames=<h1,h2,...>&user.fields=public_metrics,verified
+    /tiktok/api/user/detail/?uniqueId=<handle>
+    /youtube/youtube/v3/channels?part=statistics&forHandle=@<handle>
+
+Every handle whose hash is divisible by 5 does not exist on any platform.
+
+USAGE:
+    python fixture_server.py --port 8765 --latency 0.05
+    python collectors.py --fixtures          (starts one in-process)
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+LATENCY = 0.05          # seconds per request
+RATE_LIMITS = {         # requests per second before 429
+    'instagram': 50,
+    'x': 20,
+    'tiktok': 50,
+    'youtube': 50,
+}
+
+
+def fake_account(platform, handle):
+    """(followers, verified) for a handle on a platform, or None if it does not exist"""
+    digest = int(hashlib.sha1(handle.lower().encode()).hexdigest(), 16)
+    if digest % 5 == 0:
+        return None
+    platform_digest = int(hashlib.sha1(f"{platform}:{handle.lower()}".encode()).hexdigest(), 16)
+    followers = 10 ** (3 + platform_digest % 6) + platform_digest % 1000
+    return followers, platform_digest % 3 == 0
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    latency = LATENCY
+    rate_limits = RATE_LIMITS
+    windows = defaultdict(lambda: [0.0, 0])   # platform -> [window start, requests]
+    lock = threading.Lock()
+    requests_served = defaultdict(int)
+
+    def log_message(self, *args):
+        pass
+
+    def _json(self, status, body, headers=None):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _over_limit(self, platform):
+        with self.lock:
+            window = self.windows[platform]
+            now = time.monotonic()
+            if now - window[0] >= 1.0:
+                window[0], window[1] = now, 0
+            window[1] += 1
+            self.requests_served[platform] += 1
+            return window[1] > self.rate_limits.get(platform, float('inf'))
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        platform = url.path.strip('/').split('/')[0]
+        time.sleep(self.latency)
+        if self._over_limit(platform):
+            return self._json(429, {'error': 'rate limited'}, {'Retry-After': '1'})
+
+        if url.path == '/instagram/api/v1/users/web_profile_info/':
+            handle = query.get('username', '')
+            account = fake_account('instagram', handle)
+            if account is None:
+                return self._json(404, {'status': 'fail'})
+            return self._json(200, {'data': {'user': {
+                'username': handle, 'edge_followed_by': {'count': account[0]}, 'is_verified': account[1]}},
+                'status': 'ok'})
+
+        if url.path == '/x/2/users/by':
+            found, errors = [], []
+            for handle in query.get('usernames', '').split(','):
+                account = fake_account('x', handle)
+                if account is None:
+                    errors.append({'value': handle, 'title': 'Not Found Error'})
+                else:
+                    found.append({'username': handle, 'verified': account[1],
+                                  'public_metrics': {'followers_count': account[0]}})
+            return self._json(200, {'data': found, 'errors': errors} if errors else {'data': found})
+
+        if url.path == '/tiktok/api/user/detail/':
+            handle = query.get('uniqueId', '')
+            account = fake_account('tiktok', handle)
+            if account is None:
+                return self._json(200, {'statusCode': 10202, 'userInfo': {}})
+            return self._json(200, {'statusCode': 0, 'userInfo': {
+                'user': {'uniqueId': handle, 'verified': account[1]},
+                'stats': {'followerCount': account[0]}}})
+
+        if url.path == '/youtube/youtube/v3/channels':
+            handle = query.get('forHandle', '').lstrip('@')
+            account = fake_account('youtube', handle)
+            if account is None:
+                return self._json(200, {'pageInfo': {'totalResults': 0}})
+            return self._json(200, {'pageInfo': {'totalResults': 1}, 'items': [{
+                'id': f"UC{handle}", 'statistics': {'subscriberCount': str(account[0])}}]})
+
+        self._json(404, {'error': f"unknown path {url.path}"})
+
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # socketserver listens with a backlog of 5; more concurrent clients
+    # than that see dropped connects and a one-second SYN retry
+    request_queue_size = 128
+
+
+def serve(port=0, latency=LATENCY, rate_limits=None):
+    """
+    Start a fixture server on a daemon thread
+
+    Returns:
+        (server, base_url); call server.shutdown() to stop
+    """
+    handler = type('Handler', (FixtureHandler,), {
+        'latency': latency,
+        'rate_limits': rate_limits or RATE_LIMITS,
+        'windows': defaultdict(lambda: [0.0, 0]),
+        'lock': threading.Lock(),
+        'requests_served': defaultdict(int),
+    })
+    server = FixtureServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve fake platform profile APIs")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=LATENCY)
+    args = parser.parse_args()
+
+    server, base_url = serve(args.port, args.latency)
+    print(f"✓ Fixture APIs on {base_url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,172 @@
+"""
+Reusable instagrapi logins for one or more Instagram accounts
+
+Every collector used to call client.login() at the start of each run (the
+v2 and robust scripts twice: once for the test sample, once for the full
+run). Each login takes seconds and is what Instagram answers with
+challenges and "please wait" blocks. SessionPool logs an account in once,
+saves the session with dump_settings() under .cache/instagrapi/, and on
+later runs loads it back with load_settings() without logging in at all.
+A fresh login only happens when Instagram raises LoginRequired for the
+saved session, and it keeps the stored device ids.
+
+With several accounts the pool stays on one until it is rate limited
+(PleaseWaitFewMinutes, RateLimitError, ClientThrottledError), then rests
+it for `cooldown` seconds and moves to the next one, round-robin. When
+every account is resting it sleeps until the first is free again (or
+re-raises the rate-limit error if wait=False).
+
+Accounts come from a CSV with username, password and optionally proxy
+(instagram_accounts.csv in the working directory; keep it out of git).
+
+INSTALLATION:
+    pip install instagrapi
+
+USAGE:
+    pool = SessionPool([('my_account', 'password')])
+    pool = SessionPool.from_csv('instagram_accounts.csv')
+    user = pool.user_info_by_username('zendaya')
+"""
+
+import time
+from pathlib import Path
+
+import pandas as pd
+
+
+SESSION_DIR = Path(__file__).resolve().parent.parent / '.cache' / 'instagrapi'
+ACCOUNTS_PATH = Path('instagram_accounts.csv')
+COOLDOWN = 300      # seconds a rate-limited account rests
+
+
+def read_accounts(path=ACCOUNTS_PATH):
+    """[(username, password, proxy)] from an accounts CSV (proxy None if blank)"""
+    accounts = pd.read_csv(path, dtype=str, keep_default_na=False)
+    proxies = accounts['proxy'] if 'proxy' in accounts.columns else [''] * len(accounts)
+    return [(u.strip(), p, x.strip() or None)
+            for u, p, x in zip(accounts['username'], accounts['password'], proxies)]
+
+
+class _Account:
+    def __init__(self, username, password, proxy=None):
+        self.username = username
+        self.password = password
+        self.proxy = proxy
+        self.client = None
+        self.available_at = 0.0     # time.monotonic() when it may be used again
+
+
+class SessionPool:
+    """
+    instagrapi clients for a list of accounts, logged in on first use
+
+    Instagrapi calls go through call(method, ...) (or the
+    user_info_by_username shortcut), which handles LoginRequired and
+    rate limits as described in the module docstring; other exceptions
+    (UserNotFound, ...) reach the caller unchanged.
+    """
+
+    def __init__(self, accounts, session_dir=SESSION_DIR, cooldown=COOLDOWN, wait=True):
+        self.accounts = [_Account(*account) for account in accounts]
+        if not self.accounts:
+            raise ValueError("SessionPool needs at least one account")
+        self.session_dir = Path(session_dir)
+        self.cooldown = cooldown
+        self.wait = wait
+        self.current = 0
+        self.logins = 0
+
+    @classmethod
+    def from_csv(cls, path=ACCOUNTS_PATH, **kwargs):
+        return cls(read_accounts(path), **kwargs)
+
+    @property
+    def username(self):
+        return self.accounts[self.current].username
+
+    def _settings_path(self, account):
+        return self.session_dir / f"{account.username}.json"
+
+    def _login(self, account, client):
+        """Fresh login that keeps the saved device ids, then save the session"""
+        uuids = client.get_settings().get('uuids')
+        client.set_settings({})
+        if uuids:
+            client.set_uuids(uuids)
+        client.login(account.username, account.password)
+        self.logins += 1
+        path = self._settings_path(account)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        client.dump_settings(path)
+        print(f"✓ Logged in as @{account.username} (session saved)")
+
+    def _connect(self, account):
+        from instagrapi import Client
+        client = Client()
+        if account.proxy:
+            client.set_proxy(account.proxy)
+        path = self._settings_path(account)
+        if path.exists():
+            client.load_settings(path)
+            # relogin() and later login() calls read these
+            client.username, client.password = account.username, account.password
+            print(f"✓ Reusing saved session for @{account.username}")
+        else:
+            self._login(account, client)
+        account.client = client
+        return client
+
+    def _next_available(self):
+        """The current account if it is not resting, else the next one round-robin"""
+        while True:
+            now = time.monotonic()
+            for offset in range(len(self.accounts)):
+                index = (self.current + offset) % len(self.accounts)
+                if self.accounts[index].available_at <= now:
+                    self.current = index
+                    return self.accounts[index]
+            wake = min(a.available_at for a in self.accounts)
+            if wake == float('inf'):
+                raise RuntimeError("no Instagram account could log in")
+            print(f"⚠ All accounts rate limited; waiting {wake - now:.0f}s")
+            time.sleep(wake - now)
+
+    def client(self):
+        """Logged-in client of the account in use, skipping accounts whose login fails"""
+        while True:
+            account = self._next_available()
+            if account.client is not None:
+                return account.client
+            try:
+                return self._connect(account)
+            except Exception as e:
+                print(f"✗ Login failed for @{account.username}: {e}")
+                account.available_at = float('inf')
+
+    def call(self, method, *args, **kwargs):
+        """client().<method>(*args, **kwargs) with re-login and account rotation"""
+        from instagrapi.exceptions import (
+            ClientThrottledError, LoginRequired, PleaseWaitFewMinutes, RateLimitError)
+        relogged = set()
+        while True:
+            client = self.client()
+            account = self.accounts[self.current]
+            try:
+                return getattr(client, method)(*args, **kwargs)
+            except LoginRequired:
+                if account.username in relogged:
+                    raise
+                relogged.add(account.username)
+                print(f"⚠ Session for @{account.username} expired; logging in again")
+                self._login(account, client)
+            except (PleaseWaitFewMinutes, RateLimitError, ClientThrottledError):
+                account.available_at = time.monotonic() + self.cooldown
+                self.current = (self.current + 1) % len(self.accounts)
+                resting = all(a.available_at > time.monotonic() for a in self.accounts)
+                if resting and not self.wait:
+                    raise
+                if len(self.accounts) > 1:
+                    print(f"⚠ @{account.username} rate limited; switching to @{self.username}")
+
+    def user_info_by_username(self, handle):
+        return self.call('user_info_by_username', handle)
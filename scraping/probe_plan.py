@@ -0,0 +1,134 @@
+"""
+Global probe plan for Instagram handle candidates
+
+The collectors generate a list of handle candidates per celebrity and
+probe each list on its own. ProbePlan looks at all lists together before
+anything is sent:
+
+    - candidates are compared as Instagram compares usernames (lowercase,
+      without a leading "@"); ones that cannot be usernames (characters
+      other than letters, digits, "." and "_", such as "the-real-x" or
+      "charlid'amelio", over 30 characters, leading/trailing or double
+      dots) are dropped, not rewritten into a different handle
+    - the same handle wanted by several celebrities, or twice by one, is
+      one probe; its answer is fanned out to every celebrity whose list
+      contains it
+
+probe() runs the planned lookup for one handle the first time it is
+asked for and replays the stored answer (or "not found" exception) after
+that, so the scrape loops keep their per-celebrity logic and order while
+each handle goes over the network at most once. Transient errors are not
+stored, so those handles are retried.
+
+USAGE:
+    plan = ProbePlan({name: generate_handle_candidates(name) for name in celebrities})
+    plan.report()
+    for handle in plan.candidates[name]:
+        cached = handle in plan
+        user_info = plan.probe(handle, client.user_info_by_username, answers=(UserNotFound,))
+"""
+
+import re
+from collections import Counter
+
+
+MAX_LENGTH = 30
+INVALID = re.compile(r'[^a-z0-9._]')
+
+
+def canonical_handle(handle):
+    """Handle as an Instagram username (lowercase, no "@"), or None if it cannot be one"""
+    handle = str(handle).strip().lower().removeprefix('@')
+    if (not handle or len(handle) > MAX_LENGTH or INVALID.search(handle)
+            or handle[0] == '.' or handle[-1] == '.' or '..' in handle):
+        return None
+    return handle
+
+
+class ProbePlan:
+    """
+    Unique handles to probe for a set of celebrities
+
+    Attributes:
+        candidates: {name: canonical handles in the original order}
+        wanted_by: {handle: [names whose candidates include it]}
+        generated: candidates before planning
+        dropped: candidates that cannot be Instagram usernames
+    """
+
+    def __init__(self, candidates):
+        self.candidates = {}
+        self.wanted_by = {}
+        self.generated = 0
+        self.dropped = 0
+        for name, handles in candidates.items():
+            handles = list(handles)
+            self.generated += len(handles)
+            canonical = [canonical_handle(h) for h in handles]
+            self.dropped += canonical.count(None)
+            self.candidates[name] = list(dict.fromkeys(h for h in canonical if h))
+            for handle in self.candidates[name]:
+                self.wanted_by.setdefault(handle, []).append(name)
+        self.answers = {}       # handle -> (value, exception)
+        self.probed = 0
+        self.reused = 0
+
+    def __len__(self):
+        return len(self.wanted_by)
+
+    def __contains__(self, handle):
+        """True once the handle has a stored answer"""
+        return canonical_handle(handle) in self.answers
+
+    @property
+    def saved(self):
+        return self.generated - len(self)
+
+    @property
+    def shared(self):
+        """Handles wanted by more than one celebrity"""
+        return {h: names for h, names in self.wanted_by.items() if len(names) > 1}
+
+    def report(self):
+        """Print the plan size and how many probes it saves"""
+        print("Probe plan:")
+        print(f"  - Celebrities: {len(self.candidates)}")
+        print(f"  - Candidates generated: {self.generated:,}")
+        print(f"  - Not valid usernames: {self.dropped:,}")
+        print(f"  - Unique handles to probe: {len(self):,} "
+              f"({self.saved:,} fewer probes, {self.saved / max(self.generated, 1) * 100:.1f}%)")
+        shared = self.shared
+        if shared:
+            print(f"  - Wanted by several celebrities: {len(shared)}")
+            for handle, names in Counter({h: len(n) for h, n in shared.items()}).most_common(3):
+                print(f"      @{handle}: {', '.join(shared[handle])}")
+
+    def probe(self, handle, fetch, answers=()):
+        """
+        fetch(handle) the first time, the stored outcome afterwards
+
+        Args:
+            fetch: lookup function taking a handle
+            answers: exception types that are an answer for the handle
+                (e.g. UserNotFound) and are stored and re-raised like
+                return values; any other exception is passed on unstored
+        """
+        handle = canonical_handle(handle)
+        if handle in self.answers:
+            self.reused += 1
+            value, error = self.answers[handle]
+            if error is not None:
+                raise error
+            return value
+        self.probed += 1
+        try:
+            value = fetch(handle)
+        except answers as e:
+            self.answers[handle] = (None, e)
+            raise
+        self.answers[handle] = (value, None)
+        return value
+
+    def summary(self):
+        """One line on what the run actually sent"""
+        return f"{self.probed:,} handles probed, {self.reused:,} answers reused"
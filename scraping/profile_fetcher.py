@@ -0,0 +1,232 @@
+"""
+Instagram follower counts from the web_profile_info JSON endpoint, no browser
+
+scrape_instagram_selenium.py starts Chrome to read one number that
+Instagram also serves as JSON (the web_profile_info shape
+scrape_instagram_free_api.py parses). ProfileFetcher asks that endpoint
+directly over one httpx connection pool, using the Instagram backend,
+token bucket and retry rules from collectors.py, and resolves many
+celebrities concurrently, each trying its handle candidates in order.
+
+Different spellings of a name generate the same handles, and with many
+celebrities in flight two of them can ask for one handle at the same
+moment, so lookups are coalesced per handle: a handle already in flight
+is awaited rather than requested again, and a finished answer is reused
+for the rest of the run. Failed requests are not reused. The candidate
+lists themselves come from a ProbePlan (probe_plan.py).
+
+Chrome is only an opt-in fallback (--browser-fallback): it is started for
+celebrities with no account found whose candidates include handles the
+JSON requests failed on (blocked, rate limited past retries, bad
+response); handles the endpoint reported missing are not retried.
+
+INSTALLATION:
+    pip install httpx
+    pip install selenium webdriver-manager      (only for --browser-fallback)
+
+USAGE:
+    python profile_fetcher.py --fixtures                    (local mock API)
+    python profile_fetcher.py --test 20
+    python profile_fetcher.py --browser-fallback
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+import httpx
+import pandas as pd
+
+from collectors import MAX_CONNECTIONS, TIMEOUT, InstagramBackend, TokenBucket, fetch
+from probe_plan import ProbePlan
+from scrape_instagram_free_api import generate_handle_candidates, load_dwts_celebrities, save_results
+
+
+MIN_FOLLOWERS = 5000
+CONCURRENCY = 8     # celebrities resolved at once
+
+
+class ProfileFetcher:
+    """
+    Coalescing web_profile_info client
+
+    Example:
+        async with httpx.AsyncClient() as client:
+            fetcher = ProfileFetcher(client)
+            followers, verified, error = await fetcher.lookup('zendaya')
+    """
+
+    def __init__(self, client, backend=None):
+        self.client = client
+        self.backend = backend or InstagramBackend()
+        self.bucket = TokenBucket(self.backend.rate, self.backend.burst)
+        self.slots = asyncio.Semaphore(self.backend.concurrency)
+        self.inflight = {}      # handle -> task
+        self.answers = {}       # handle -> (followers, verified)
+        self.lookups = 0
+        self.requests = 0
+        self.errors = 0
+
+    async def _request(self, handle):
+        async with self.slots:
+            self.requests += 1
+            found, error = await fetch(self.client, self.backend, self.bucket,
+                                       self.backend.request([handle]))
+        if error is not None:
+            self.errors += 1
+            return None, None, error
+        followers, verified = found.get(handle, (None, None))
+        self.answers[handle] = (followers, verified)
+        return followers, verified, None
+
+    async def lookup(self, handle):
+        """(followers, verified, error) for one handle; followers is None if missing"""
+        handle = handle.lower()
+        self.lookups += 1
+        if handle in self.answers:
+            return (*self.answers[handle], None)
+        task = self.inflight.get(handle)
+        if task is None:
+            task = asyncio.ensure_future(self._request(handle))
+            self.inflight[handle] = task
+            task.add_done_callback(lambda _: self.inflight.pop(handle, None))
+        # shield: one caller being cancelled must not cancel the shared request
+        return await asyncio.shield(task)
+
+    async def resolve(self, candidates, min_followers=MIN_FOLLOWERS):
+        """
+        First candidate handle with an account, as a scraper result dict
+
+        The result also lists the candidates whose request failed
+        ('failed'), for the browser fallback.
+        """
+        failed = []
+        for handle in candidates:
+            followers, verified, error = await self.lookup(handle)
+            if error is not None:
+                failed.append(handle)
+            elif followers:
+                found = followers >= min_followers
+                return {'handle': f"@{handle}" if found else None, 'followers': followers,
+                        'verified': verified if found else None, 'found': found, 'failed': failed}
+        return {'handle': None, 'followers': None, 'verified': None, 'found': False, 'failed': failed}
+
+
+async def fetch_profiles(celebrity_names, backend=None, min_followers=MIN_FOLLOWERS,
+                         concurrency=CONCURRENCY):
+    """
+    Resolve celebrities concurrently through one coalescing fetcher
+
+    Candidates go through a ProbePlan first, so handles that cannot be
+    usernames are never requested.
+
+    Returns:
+        (results dict {name: {'handle', 'followers', 'verified', 'found',
+         'failed'}}, the ProfileFetcher for its counters)
+    """
+    limits = httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS)
+    slots = asyncio.Semaphore(concurrency)
+    plan = ProbePlan({name: generate_handle_candidates(name) for name in celebrity_names})
+    plan.report()
+    async with httpx.AsyncClient(limits=limits, timeout=TIMEOUT, follow_redirects=True) as client:
+        fetcher = ProfileFetcher(client, backend)
+
+        async def run(name):
+            async with slots:
+                return name, await fetcher.resolve(plan.candidates[name], min_followers)
+
+        results = dict(await asyncio.gather(*(run(name) for name in celebrity_names)))
+    return results, fetcher
+
+
+def browser_fallback(results, min_followers=MIN_FOLLOWERS):
+    """
+    Retry failed handles of unresolved celebrities in headless Chrome
+
+    Updates results in place and returns {name: result} for the
+    celebrities Chrome found.
+    """
+    pending = {name: r['failed'] for name, r in results.items() if not r['found'] and r['failed']}
+    if not pending:
+        return {}
+    from scrape_instagram_selenium import get_follower_count, setup_chrome_driver
+
+    print(f"\nStarting Chrome for {len(pending)} celebrities the JSON endpoint could not resolve...")
+    driver = setup_chrome_driver(headless=True)
+    recovered = {}
+    try:
+        for name, handles in pending.items():
+            for handle in handles:
+                followers, verified = get_follower_count(driver, handle)
+                time.sleep(random.uniform(3, 6))
+                if followers:
+                    found = followers >= min_followers
+                    results[name] = {'handle': f"@{handle}" if found else None, 'followers': followers,
+                                     'verified': verified if found else None, 'found': found, 'failed': []}
+                    if found:
+                        recovered[name] = results[name]
+                    break
+    finally:
+        driver.quit()
+    return recovered
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Instagram followers from the web_profile_info JSON endpoint")
+    parser.add_argument('--test', type=int, metavar='N', help="only N random celebrities")
+    parser.add_argument('--min-followers', type=int, default=MIN_FOLLOWERS)
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY)
+    parser.add_argument('--browser-fallback', action='store_true',
+                        help="retry handles the JSON requests failed on in headless Chrome")
+    parser.add_argument('--fixtures', action='store_true', help="run against a local mock of the endpoint")
+    args = parser.parse_args()
+
+    print("\n" + "=" * 80)
+    print("INSTAGRAM PROFILE FETCHER - web_profile_info JSON (no browser)")
+    print("=" * 80)
+
+    server = None
+    if args.fixtures:
+        import fixture_server
+        from dwts.data import DATA_PATH
+        server, base_url = fixture_server.serve()
+        backend = InstagramBackend(base_url=f"{base_url}/instagram", rate=40, burst=10, concurrency=16)
+        celebrities = sorted(pd.read_csv(DATA_PATH, usecols=['celebrity_name'])['celebrity_name'].unique())
+        print(f"✓ Mock endpoint on {base_url}")
+    else:
+        backend = InstagramBackend()
+        celebrities = load_dwts_celebrities()
+    if args.test:
+        celebrities = random.sample(celebrities, min(args.test, len(celebrities)))
+    print(f"✓ {len(celebrities)} celebrities\n")
+
+    start = time.perf_counter()
+    results, fetcher = asyncio.run(fetch_profiles(celebrities, backend, args.min_followers, args.concurrency))
+    elapsed = time.perf_counter() - start
+    found = sum(r['found'] for r in results.values())
+    print(f"✓ Found {found}/{len(results)} in {elapsed:.1f}s")
+    print(f"  - Candidate lookups: {fetcher.lookups}")
+    print(f"  - HTTP requests:     {fetcher.requests} ({fetcher.lookups - fetcher.requests} coalesced)")
+    print(f"  - Failed requests:   {fetcher.errors}")
+
+    recovered = {}
+    if args.browser_fallback:
+        recovered = browser_fallback(results, args.min_followers)
+        print(f"✓ Chrome found {len(recovered)} more")
+    elif any(not r['found'] and r['failed'] for r in results.values()):
+        print("⚠ Some handles failed; --browser-fallback retries them in Chrome")
+
+    if server is not None:
+        server.shutdown()
+        return
+    json_results = {name: {k: v for k, v in r.items() if k != 'failed'}
+                    for name, r in results.items() if name not in recovered}
+    save_results(json_results, output_file='instagram_followers_free_api.csv')
+    if recovered:
+        from scrape_instagram_selenium import save_results as save_browser_results
+        save_browser_results(recovered)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Queue workers for collecting Instagram followers on several accounts at once
+
+Each worker claims one account (login + proxy) from the shared job queue
+in dwts.jobs, then leases celebrities one at a time until the queue is
+empty. Start several here with --workers, or run this script on other
+machines pointed at the same --db file; a worker that dies leaves its
+celebrity to be picked up when the lease expires.
+
+The accounts file is a CSV with username, password and proxy (proxy may
+be empty). Passwords stay in the file; the queue only stores which worker
+holds which account.
+
+--backend fake replaces Instagram with a stand-in that sleeps --latency
+seconds per celebrity and answers from fixture_server.fake_account, on a
+throwaway queue unless --db is given, for checking that throughput grows
+with the number of workers.
+
+INSTALLATION:
+    pip install instagrapi
+
+USAGE:
+    python queue_worker.py --backend fake --workers 4
+    python queue_worker.py --accounts accounts.csv --workers 3
+    python queue_worker.py --accounts accounts.csv --db /shared/jobs.sqlite --worker-id laptop
+"""
+
+import argparse
+import multiprocessing
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# Results go to the shared profile store in dwts/ (repo root on the path)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from dwts.data import DATA_PATH
+from dwts.jobs import JOB_DB, VISIBILITY, JobQueue
+from instagram_sessions import SessionPool, read_accounts
+
+
+BATCH = 1           # jobs per lease; 1 leaves everything else for idle workers
+IDLE_WAIT = 0.5     # seconds between polls while other workers hold the last jobs
+RATE_LIMIT_WAIT = 60
+MIN_FOLLOWERS = 5000
+
+
+class RateLimited(Exception):
+    pass
+
+
+class FakeBackend:
+    """Stand-in for a logged-in client: fixed latency, counts from fixture_server"""
+
+    def __init__(self, latency=0.2):
+        self.latency = latency
+
+    def lookup(self, celebrity_name):
+        from fixture_server import fake_account
+        time.sleep(self.latency)
+        handle = re.sub(r'[^a-z0-9._]', '', celebrity_name.lower())
+        account = fake_account('instagram', handle)
+        if account is None:
+            return {'handle': None, 'followers': None, 'verified': None, 'found': False}
+        return {'handle': f"@{handle}", 'followers': account[0], 'verified': account[1], 'found': True}
+
+
+class InstagrapiBackend:
+    """
+    Logged-in instagrapi client behind one proxy
+
+    Same rules as collect_instagram_instagrapi_robust.py: handle candidates
+    are tried in order and only a verified account with at least
+    MIN_FOLLOWERS followers counts as found. The session is saved and
+    reused by SessionPool, so restarting a worker does not log in again.
+    """
+
+    def __init__(self, username, password, proxy=None):
+        self.sessions = SessionPool([(username, password, proxy)], wait=False)
+        self.sessions.client()
+
+    def lookup(self, celebrity_name):
+        from instagrapi.exceptions import (
+            ClientThrottledError, PleaseWaitFewMinutes, RateLimitError, UserNotFound)
+        from collect_instagram_instagrapi_robust import generate_handle_candidates
+        for handle in generate_handle_candidates(celebrity_name):
+            try:
+                user = self.sessions.user_info_by_username(handle)
+            except UserNotFound:
+                continue
+            except (PleaseWaitFewMinutes, RateLimitError, ClientThrottledError) as e:
+                raise RateLimited(str(e)) from e
+            finally:
+                time.sleep(random.uniform(0.5, 1.5))
+            if user.is_verified and user.follower_count >= MIN_FOLLOWERS:
+                return {'handle': f"@{handle}", 'followers': user.follower_count,
+                        'verified': True, 'found': True}
+        return {'handle': None, 'followers': None, 'verified': None, 'found': False}
+
+
+def run_worker(worker, db, backend='fake', accounts_path=None, latency=0.2,
+               batch=BATCH, visibility=VISIBILITY):
+    """
+    Lease and process jobs until none are pending
+
+    Returns:
+        number of results this worker stored
+    """
+    queue = JobQueue(db)
+    stored = 0
+    try:
+        if backend == 'instagrapi':
+            accounts = {name: (password, proxy) for name, password, proxy in read_accounts(accounts_path)}
+            session = queue.claim_session(worker, [(name, proxy) for name, (_, proxy) in accounts.items()])
+            if session is None:
+                print(f"[{worker}] ✗ No free account (every session is held by a live worker)")
+                return 0
+            username, proxy = session
+            print(f"[{worker}] Logging in as {username}" + (f" via {proxy}" if proxy else ""))
+            client = InstagrapiBackend(username, accounts[username][0], proxy)
+        else:
+            client = FakeBackend(latency)
+
+        while True:
+            jobs = queue.lease(worker, n=batch, visibility=visibility)
+            if not jobs:
+                if not queue.pending():
+                    break
+                time.sleep(IDLE_WAIT)
+                continue
+            for job in jobs:
+                try:
+                    result = client.lookup(job.celebrity_name)
+                except RateLimited as e:
+                    queue.release(job)
+                    print(f"[{worker}] ⚠ Rate limited ({e}); waiting {RATE_LIMIT_WAIT}s")
+                    time.sleep(RATE_LIMIT_WAIT)
+                    continue
+                except Exception as e:
+                    queue.fail(job, f"{type(e).__name__}: {e}")
+                    continue
+                stored += queue.complete(job, result)
+    finally:
+        queue.release_session(worker)
+        queue.close()
+    return stored
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Collect followers with several queue workers")
+    parser.add_argument('--backend', choices=['instagrapi', 'fake'], default='instagrapi')
+    parser.add_argument('--workers', type=int, default=1, help="worker processes to start here")
+    parser.add_argument('--worker-id', default='worker', help="prefix for worker names (e.g. host name)")
+    parser.add_argument('--accounts', help="CSV with username, password, proxy (instagrapi)")
+    parser.add_argument('--db', help=f"job queue (default: {JOB_DB.name}, or a temporary one for fake)")
+    parser.add_argument('--latency', type=float, default=0.2, help="fake backend seconds per celebrity")
+    parser.add_argument('--batch', type=int, default=BATCH)
+    parser.add_argument('--visibility', type=float, default=VISIBILITY, help="lease seconds")
+    parser.add_argument('--no-enqueue', action='store_true', help="only work on already queued jobs")
+    args = parser.parse_args()
+
+    if args.backend == 'instagrapi' and not args.accounts:
+        parser.error("--accounts is required for the instagrapi backend")
+    db = args.db or (JOB_DB if args.backend == 'instagrapi' else
+                     Path(tempfile.mkdtemp()) / 'jobs.sqlite')
+
+    print("\n" + "=" * 80)
+    print(f"QUEUE WORKERS: {args.workers} x {args.backend}")
+    print("=" * 80)
+
+    with JobQueue(db) as queue:
+        if not args.no_enqueue:
+            names = pd.read_csv(DATA_PATH, usecols=['celebrity_name'])['celebrity_name']
+            added = queue.enqueue(names)
+            print(f"✓ {added} jobs added")
+        print(f"✓ {queue.pending()} jobs pending in {Path(db)}\n")
+
+    start = time.perf_counter()
+    worker_args = [(f"{args.worker_id}-{i}", str(db), args.backend, args.accounts, args.latency,
+                    args.batch, args.visibility) for i in range(args.workers)]
+    with multiprocessing.Pool(args.workers) as pool:
+        stored = pool.starmap(run_worker, worker_args)
+    elapsed = time.perf_counter() - start
+
+    with JobQueue(db) as queue:
+        print(queue.status().to_string(index=False))
+        print(f"\n✓ {sum(stored)} results in {elapsed:.1f}s "
+              f"({sum(stored) / elapsed:.1f}/s), {queue.pending()} still pending")
+        if args.backend == 'instagrapi':
+            from dwts.followers import FollowerStore
+            from dwts.profiles import ProfileStore
+            with ProfileStore(history=FollowerStore()) as store:
+                added = queue.record(store, source='instagrapi')
+            print(f"✓ {added} new observations recorded in {store.path.name}")
+
+
+if __name__ == "__main__":
+    main()
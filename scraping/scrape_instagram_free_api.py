@@ -13,6 +13,13 @@ import httpx
 import time
 import random
 import json
+import sys
+
+# Results go to the shared profile store in dwts/ (repo root on the path)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from dwts.followers import FollowerStore
+from dwts.profiles import ProfileStore
+from probe_plan import ProbePlan
 
 
 def load_dwts_celebrities():
@@ -22,7 +29,7 @@ def load_dwts_celebrities():
         print(f"ERROR: Cannot find {DATA_PATH}")
         return []
     
-    df = pd.read_csv(DATA_PATH)
+    df = pd.read_csv(DATA_PATH, usecols=['celebrity_name'])
     celebrities = sorted(df['celebrity_name'].unique().tolist())
     return celebrities
 
@@ -73,89 +80,95 @@ def generate_handle_candidates(name: str) -> list:
     return unique_candidates
 
 
+class HandleNotFound(Exception):
+    """Every method answered that the handle has no account"""
+
+
 def get_follower_count_instastats(handle: str) -> tuple:
     """
     Use InstaScrape.io API (public data, no auth needed)
     This site aggregates public Instagram data
+
+    Returns (None, None) if the site has no such account; transport errors,
+    other HTTP errors and unreadable responses raise (httpx.HTTPError,
+    ValueError).
     """
-    try:
-        # Try InstaScrape.io API
-        url = f"https://www.instastats.io/api/user/{handle}"
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        
-        response = httpx.get(url, headers=headers, timeout=10, follow_redirects=True)
-        
-        if response.status_code == 200:
-            try:
-                data = response.json()
-                followers = data.get('follower_count') or data.get('followers')
-                is_verified = data.get('is_verified') or data.get('verified')
-                
-                if followers:
-                    return int(followers), bool(is_verified)
-            except:
-                pass
-        
-        return None, None
+    # Try InstaScrape.io API
+    url = f"https://www.instastats.io/api/user/{handle}"
     
-    except Exception as e:
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    }
+    
+    response = httpx.get(url, headers=headers, timeout=10, follow_redirects=True)
+    if response.status_code == 404:
         return None, None
+    response.raise_for_status()
+    
+    data = response.json()
+    followers = data.get('follower_count') or data.get('followers')
+    is_verified = data.get('is_verified') or data.get('verified')
+    
+    if followers:
+        return int(followers), bool(is_verified)
+    return None, None
 
 
 def get_follower_count_igapi(handle: str) -> tuple:
     """
     Use ig-api.xyz (Free public Instagram data API)
+
+    Same contract as get_follower_count_instastats.
     """
-    try:
-        url = f"https://api.instagram.com/api/v1/users/web_profile_info/?username={handle}"
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Accept': 'application/json'
-        }
-        
-        response = httpx.get(url, headers=headers, timeout=10, follow_redirects=True)
-        
-        if response.status_code == 200:
-            try:
-                data = response.json()
-                user_data = data.get('data', {})
-                followers = user_data.get('edge_followed_by', {}).get('count')
-                is_verified = user_data.get('is_verified')
-                
-                if followers:
-                    return followers, is_verified
-            except:
-                pass
-        
-        return None, None
+    url = f"https://api.instagram.com/api/v1/users/web_profile_info/?username={handle}"
+    
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+        'Accept': 'application/json'
+    }
     
-    except Exception as e:
+    response = httpx.get(url, headers=headers, timeout=10, follow_redirects=True)
+    if response.status_code == 404:
         return None, None
+    response.raise_for_status()
+    
+    data = response.json()
+    user_data = data.get('data', {})
+    followers = user_data.get('edge_followed_by', {}).get('count')
+    is_verified = user_data.get('is_verified')
+    
+    if followers:
+        return followers, is_verified
+    return None, None
 
 
 def get_follower_count_all_methods(handle: str) -> tuple:
     """
     Try multiple methods to get follower count
     Falls back if one fails
+
+    Raises HandleNotFound only when every method answered "no account", so
+    the probe plan can store it; if some method failed instead, its error
+    is raised (and the handle is tried again later).
     """
     methods = [
         ("InstaScrape.io", get_follower_count_instastats),
         ("Instagram API", get_follower_count_igapi),
     ]
     
+    error = None
     for method_name, method_func in methods:
         try:
             followers, verified = method_func(handle)
-            if followers:
-                return followers, verified
-        except:
+        except (httpx.HTTPError, ValueError) as e:
+            error = e
             continue
+        if followers:
+            return followers, verified
     
-    return None, None
+    if error is not None:
+        raise error
+    raise HandleNotFound(handle)
 
 
 def scrape_instagram_free_api(celebrity_names, min_followers=5000, test_mode=False, test_count=5):
@@ -191,12 +204,18 @@ def scrape_instagram_free_api(celebrity_names, min_followers=5000, test_mode=Fal
     followers_data = {}
     found_count = 0
     not_found_count = 0
+    failed_count = 0
+    
+    # Plan the probes for all celebrities at once: each handle is looked up once
+    plan = ProbePlan({name: generate_handle_candidates(name) for name in celebrities_to_search})
+    plan.report()
+    print()
     
     for idx, celebrity_name in enumerate(celebrities_to_search, 1):
         print(f"[{idx:3d}/{len(celebrities_to_search)}] {celebrity_name:35s}", end=" | ", flush=True)
         
-        # Generate multiple handle candidates
-        handle_candidates = generate_handle_candidates(celebrity_name)
+        # Planned handle candidates
+        handle_candidates = plan.candidates[celebrity_name]
         
         # Try each handle
         followers_count = None
@@ -204,12 +223,22 @@ def scrape_instagram_free_api(celebrity_names, min_followers=5000, test_mode=Fal
         found_handle = None
         
         for handle in handle_candidates:
-            followers_count, is_verified = get_follower_count_all_methods(handle)
+            cached = handle in plan
+            try:
+                followers_count, is_verified = plan.probe(
+                    handle, get_follower_count_all_methods, answers=(HandleNotFound,))
+            except HandleNotFound:
+                followers_count, is_verified = None, None
+            except (httpx.HTTPError, ValueError):
+                # Not an answer: the plan keeps the handle for a later probe
+                followers_count, is_verified = None, None
+                failed_count += 1
             if followers_count:
                 found_handle = handle
                 break
             # Small delay between handle attempts
-            time.sleep(0.2)
+            if not cached:
+                time.sleep(0.2)
         
         # Check if meets threshold
         if followers_count and followers_count >= min_followers:
@@ -245,8 +274,11 @@ def scrape_instagram_free_api(celebrity_names, min_followers=5000, test_mode=Fal
     print(f"Total searched: {len(celebrities_to_search)}")
     print(f"Found: {found_count}")
     print(f"Not found: {not_found_count}")
+    if failed_count:
+        print(f"Failed lookups (network/HTTP errors, not counted as missing): {failed_count}")
     if celebrities_to_search:
         print(f"Success rate: {found_count/len(celebrities_to_search)*100:.1f}%")
+    print(f"Probes: {plan.summary()}")
     
     if test_mode:
         print(f"\n⚠ TEST MODE - Tested {test_count} random celebrities")
@@ -270,6 +302,9 @@ def save_results(followers_data, output_file='instagram_followers_free_api.csv')
     df = pd.DataFrame(records)
     df.to_csv(output_file, index=False)
     print(f"✓ Results saved to: {output_file}")
+    with ProfileStore(history=FollowerStore()) as store:
+        added = store.record(followers_data, source='free_api')
+    print(f"✓ {added} new observations recorded in {store.path.name}")
     return df
 
 
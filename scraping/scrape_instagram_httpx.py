@@ -14,6 +14,12 @@ import random
 import json
 import re
 from typing import Dict, Tuple, Optional
+import sys
+
+# Results go to the shared profile store in dwts/ (repo root on the path)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from dwts.followers import FollowerStore
+from dwts.profiles import ProfileStore
 
 
 def load_dwts_celebrities():
@@ -23,7 +29,7 @@ def load_dwts_celebrities():
         print(f"ERROR: Cannot find {DATA_PATH}")
         return []
     
-    df = pd.read_csv(DATA_PATH)
+    df = pd.read_csv(DATA_PATH, usecols=['celebrity_name'])
     celebrities = sorted(df['celebrity_name'].unique().tolist())
     return celebrities
 
@@ -222,6 +228,9 @@ def save_results(followers_data, output_file='instagram_followers_httpx.csv'):
     df = pd.DataFrame(records)
     df.to_csv(output_file, index=False)
     print(f"✓ Results saved to: {output_file}")
+    with ProfileStore(history=FollowerStore()) as store:
+        added = store.record(followers_data, source='httpx')
+    print(f"✓ {added} new observations recorded in {store.path.name}")
     return df
 
 
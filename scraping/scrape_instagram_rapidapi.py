@@ -20,6 +20,12 @@ from pathlib import Path
 import requests
 import time
 import random
+import sys
+
+# Results go to the shared profile store in dwts/ (repo root on the path)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from dwts.followers import FollowerStore
+from dwts.profiles import ProfileStore
 
 
 def load_dwts_celebrities():
@@ -29,7 +35,7 @@ def load_dwts_celebrities():
         print(f"ERROR: Cannot find {DATA_PATH}")
         return []
     
-    df = pd.read_csv(DATA_PATH)
+    df = pd.read_csv(DATA_PATH, usecols=['celebrity_name'])
     celebrities = sorted(df['celebrity_name'].unique().tolist())
     return celebrities
 
@@ -191,3 +197,6 @@ if __name__ == "__main__":
     else:
         celebrities = load_dwts_celebrities()
         results = scrape_with_rapidapi(celebrities, api_key=api_key, test_mode=True, test_count=5)
+        with ProfileStore(history=FollowerStore()) as store:
+            added = store.record(results, source='rapidapi')
+        print(f"✓ {added} new observations recorded in {store.path.name}")
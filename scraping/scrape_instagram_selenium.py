@@ -6,6 +6,10 @@ INSTALLATION REQUIRED:
     pip install selenium webdriver-manager
 
 This approach is harder for Instagram to detect because it uses a real browser.
+
+For a normal run prefer profile_fetcher.py, which reads the same numbers from
+the web_profile_info JSON endpoint without a browser and only starts Chrome
+(--browser-fallback) for handles that endpoint could not answer.
 """
 
 import pandas as pd
@@ -20,6 +24,12 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
+import sys
+
+# Results go to the shared profile store in dwts/ (repo root on the path)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from dwts.followers import FollowerStore
+from dwts.profiles import ProfileStore
 
 
 def load_dwts_celebrities():
@@ -29,7 +39,7 @@ def load_dwts_celebrities():
         print(f"ERROR: Cannot find {DATA_PATH}")
         return []
     
-    df = pd.read_csv(DATA_PATH)
+    df = pd.read_csv(DATA_PATH, usecols=['celebrity_name'])
     celebrities = sorted(df['celebrity_name'].unique().tolist())
     return celebrities
 
@@ -280,6 +290,9 @@ def save_results(followers_data, output_file='instagram_followers_scraped.csv'):
     df = pd.DataFrame(records)
     df.to_csv(output_file, index=False)
     print(f"✓ Results saved to: {output_file}")
+    with ProfileStore(history=FollowerStore()) as store:
+        added = store.record(followers_data, source='selenium')
+    print(f"✓ {added} new observations recorded in {store.path.name}")
     return df
 
 
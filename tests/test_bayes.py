@@ -0,0 +1,62 @@
+"""
+dwts.bayes.FanVoteModel gradients against finite differences
+
+Run with: python -m pytest tests
+"""
+
+import numpy as np
+import pytest
+
+from dwts.bayes import FanVoteModel
+
+
+# Rank rule (1), percent rule (5) and the judges' save (28)
+SEASONS = [1, 5, 28]
+EPS = 1e-6
+
+
+@pytest.fixture(scope='module')
+def model():
+    return FanVoteModel.from_data(seasons=SEASONS)
+
+
+@pytest.fixture(scope='module')
+def q(model):
+    rng = np.random.default_rng(0)
+    return 0.5 * rng.standard_normal((2, model.n_params))
+
+
+def numeric_gradient(model, q, index):
+    step = np.zeros_like(q)
+    step[:, index] = EPS
+    return (model.log_prob_grad(q + step)[0] - model.log_prob_grad(q - step)[0]) / (2 * EPS)
+
+
+def test_gradient_matches_finite_differences(model, q):
+    _, grad = model.log_prob_grad(q)
+    assert grad.shape == q.shape
+    rng = np.random.default_rng(1)
+    # Small blocks in full, eight entries of each larger one
+    starts = np.cumsum([0] + [size for _, size in model.layout])
+    for (name, size), start in zip(model.layout, starts):
+        picks = np.arange(size) if size <= 8 else rng.choice(size, 8, replace=False)
+        for i in start + picks:
+            np.testing.assert_allclose(grad[:, i], numeric_gradient(model, q, i),
+                                       rtol=1e-4, atol=1e-6, err_msg=f"{name}[{i - start}]")
+
+
+def test_directional_derivative(model, q):
+    rng = np.random.default_rng(2)
+    v = rng.standard_normal(q.shape)
+    v /= np.linalg.norm(v, axis=1, keepdims=True)
+    _, grad = model.log_prob_grad(q)
+    numeric = (model.log_prob_grad(q + EPS * v)[0] - model.log_prob_grad(q - EPS * v)[0]) / (2 * EPS)
+    np.testing.assert_allclose((grad * v).sum(axis=1), numeric, rtol=1e-4)
+
+
+def test_fan_shares_sum_to_one_each_week(model, q):
+    shares = model.fan_shares(q)
+    assert (shares > 0).all()
+    weeks = model.keys.groupby(['season', 'week'], sort=False).ngroup().to_numpy()
+    for chain in shares:
+        np.testing.assert_allclose(np.bincount(weeks, weights=chain), 1)
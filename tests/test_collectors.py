@@ -0,0 +1,116 @@
+"""
+collectors.py against the local fixture APIs (scraping/fixture_server.py)
+
+Run with: python -m pytest tests
+"""
+
+import asyncio
+import sys
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+# The scraping scripts import each other by module name
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scraping'))
+import fixture_server
+from collectors import BACKENDS, InstagramBackend, XBackend, collect, retry_after
+
+
+HANDLES = [f"dancer{i}" for i in range(40)]
+
+
+@pytest.fixture
+def fixtures():
+    servers = []
+
+    def start(**kwargs):
+        server, base_url = fixture_server.serve(**kwargs)
+        servers.append(server)
+        return server, base_url
+
+    yield start
+    for server in servers:
+        server.shutdown()
+
+
+def backend(platform, base_url, **kwargs):
+    credentials = {'token': 'fixture'} if platform == 'x' else {'api_key': 'fixture'} if platform == 'youtube' else {}
+    limits = {'rate': 200, 'burst': 50, 'concurrency': 16}
+    return BACKENDS[platform](base_url=f"{base_url}/{platform}", **{**limits, **credentials, **kwargs})
+
+
+def test_parses_every_platform(fixtures):
+    _, base_url = fixtures(latency=0)
+    backends = [backend(p, base_url) for p in sorted(BACKENDS)]
+    results, _ = asyncio.run(collect(HANDLES, backends))
+
+    assert len(results) == len(HANDLES) * len(BACKENDS)
+    assert results['error'].isna().all()
+    for row in results.itertuples():
+        account = fixture_server.fake_account(row.platform, row.handle)
+        assert row.found == (account is not None)
+        if account is not None:
+            assert row.followers == account[0]
+            assert bool(row.verified) == account[1] or row.platform == 'youtube'
+
+
+def test_x_header_set_at_construction():
+    x = XBackend(token='secret')
+    assert x.headers['Authorization'] == 'Bearer secret'
+    x.request(['a'])
+    assert x.headers == {'Authorization': 'Bearer secret'}
+
+
+def test_retries_after_429(fixtures):
+    server, base_url = fixtures(latency=0, rate_limits={'instagram': 10})
+    instagram = backend('instagram', base_url, rate=100, burst=100)
+    results, _ = asyncio.run(collect(HANDLES, [instagram]))
+
+    served = server.RequestHandlerClass.requests_served['instagram']
+    assert served > len(HANDLES)        # some requests were answered 429 and retried
+    assert results['error'].isna().all()
+    assert results['found'].sum() == sum(fixture_server.fake_account('instagram', h) is not None
+                                         for h in HANDLES)
+
+
+def test_retry_after_forms():
+    assert retry_after('3', 1) == 3
+    assert retry_after(None, 2) == 2
+    assert retry_after('soon', 2) == 2
+    later = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert 25 < retry_after(format_datetime(later, usegmt=True), 1) <= 30
+    earlier = datetime.now(timezone.utc) - timedelta(seconds=30)
+    assert retry_after(format_datetime(earlier, usegmt=True), 1) == 0
+
+
+def test_concurrency_speedup(fixtures):
+    _, base_url = fixtures(latency=0.05, rate_limits={'instagram': 1000})
+
+    def timed(concurrency):
+        instagram = InstagramBackend(base_url=f"{base_url}/instagram", rate=1000, burst=1000,
+                                     concurrency=concurrency)
+        start = time.perf_counter()
+        asyncio.run(collect(HANDLES, [instagram]))
+        return time.perf_counter() - start
+
+    sequential, concurrent = timed(1), timed(16)
+    assert sequential > 40 * 0.05
+    assert concurrent < sequential / 4
+
+
+def test_platforms_run_side_by_side(fixtures):
+    _, base_url = fixtures(latency=0.05, rate_limits=dict.fromkeys(BACKENDS, 1000))
+
+    def timed(platforms):
+        backends = [backend(p, base_url, rate=40, burst=10, concurrency=4) for p in platforms]
+        start = time.perf_counter()
+        asyncio.run(collect(HANDLES, backends))
+        return time.perf_counter() - start
+
+    alone = {p: timed([p]) for p in sorted(BACKENDS)}
+    together = timed(sorted(BACKENDS))
+    assert together < 1.5 * max(alone.values())
+    assert together < sum(alone.values()) / 2
@@ -0,0 +1,103 @@
+"""
+dwts.combine ranks, shares and bottom cells against a pandas groupby reference
+
+Run with: python -m pytest tests
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dwts.combine import combine, judges_save, segmented_rank, worst_in_week
+
+
+def random_weeks(seed, n_weeks=60):
+    """Weeks of 1-16 couples with integer-ish scores (many ties) and a few NaN"""
+    rng = np.random.default_rng(seed)
+    sizes = rng.integers(1, 17, n_weeks)
+    offsets = np.r_[0, np.cumsum(sizes)]
+    judge = rng.integers(3, 31, offsets[-1]).astype(float)
+    fan = rng.integers(0, 5, offsets[-1]) / 4 + 0.01
+    judge[rng.random(offsets[-1]) < 0.05] = np.nan
+    rules = np.where(rng.random(n_weeks) < 0.5, 'rank', 'percent')
+    return offsets, judge, fan, rules
+
+
+def groupby_rank(values, offsets):
+    group = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    return (pd.Series(values).groupby(group)
+            .rank(method='min', ascending=False, na_option='bottom').to_numpy())
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_segmented_rank_matches_groupby(seed):
+    offsets, judge, fan, _ = random_weeks(seed)
+    np.testing.assert_array_equal(segmented_rank(judge, offsets), groupby_rank(judge, offsets))
+    np.testing.assert_array_equal(segmented_rank(fan, offsets), groupby_rank(fan, offsets))
+
+
+def test_segmented_rank_draws_rank_each_row():
+    offsets, _, fan, _ = random_weeks(0)
+    rng = np.random.default_rng(1)
+    draws = fan * rng.integers(1, 3, (4, len(fan)))
+    ranks = segmented_rank(draws, offsets)
+    assert ranks.shape == draws.shape
+    for row, expected in zip(ranks, draws):
+        np.testing.assert_array_equal(row, groupby_rank(expected, offsets))
+
+
+def test_combine_matches_groupby():
+    offsets, judge, fan, rules = random_weeks(2)
+    judge = np.nan_to_num(judge, nan=10.0)
+    scores = combine(judge, fan, offsets, rules)
+
+    group = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    frame = pd.DataFrame({'week': group, 'judge': judge, 'fan': fan, 'rule': rules[group]})
+    by_week = frame.groupby('week')
+    judge_rank = by_week['judge'].rank(method='min', ascending=False)
+    fan_rank = by_week['fan'].rank(method='min', ascending=False)
+    judge_percent = frame['judge'] / by_week['judge'].transform('sum')
+    fan_percent = frame['fan'] / by_week['fan'].transform('sum')
+    combined = np.where(frame['rule'] == 'rank', judge_rank + fan_rank, judge_percent + fan_percent)
+
+    np.testing.assert_array_equal(scores.judge_rank, judge_rank)
+    np.testing.assert_array_equal(scores.fan_rank, fan_rank)
+    np.testing.assert_allclose(scores.judge_percent, judge_percent)
+    np.testing.assert_allclose(scores.fan_percent, fan_percent)
+    np.testing.assert_allclose(scores.combined, combined)
+
+
+def test_worst_in_week_full_ties_give_distinct_cells():
+    offsets = np.array([0, 3, 6])
+    judge = np.full(6, 24.0)
+    fan = np.full(6, 1 / 3)
+    scores = combine(judge, fan, offsets, ['rank', 'percent'])
+    np.testing.assert_array_equal(worst_in_week(scores, offsets, k=2), [[0, 1], [3, 4]])
+    np.testing.assert_array_equal(worst_in_week(scores, offsets, k=3), [[0, 1, 2], [3, 4, 5]])
+
+
+def test_worst_in_week_breaks_ties_on_fans():
+    offsets = np.array([0, 3, 6])
+    judge = np.array([30.0, 20.0, 25.0, 20.0, 30.0, 25.0])
+    # Rank week: combined 4, 4, 4 so fan rank decides; percent week: 0.77, 0.60, 0.63
+    fan = np.array([0.1, 0.6, 0.3, 0.5, 0.2, 0.3])
+    scores = combine(judge, fan, offsets, ['rank', 'percent'])
+    np.testing.assert_array_equal(worst_in_week(scores, offsets, k=2), [[0, 2], [4, 5]])
+
+
+def test_worst_in_week_short_weeks_pad_with_minus_one():
+    offsets = np.array([0, 2, 3])
+    scores = combine(np.array([20.0, 20.0, 20.0]), np.array([0.5, 0.5, 1.0]), offsets, ['rank', 'rank'])
+    np.testing.assert_array_equal(worst_in_week(scores, offsets, k=3), [[0, 1, -1], [2, -1, -1]])
+
+
+def test_judges_save_sends_home_the_lower_judge_total():
+    rng = np.random.default_rng(0)
+    judge = np.array([20.0, 25.0, 25.0])
+    fan = np.array([0.2, 0.3, 0.5])
+    assert judges_save(judge, fan, 0, 1, rng) == 0
+    # Judge tie -> smaller fan share goes
+    assert judges_save(judge, fan, 1, 2, rng) == 1
+    # Tie on both -> either, at random
+    outs = {int(judges_save(judge, np.full(3, 1 / 3), 1, 2, rng)) for _ in range(50)}
+    assert outs == {1, 2}
@@ -0,0 +1,64 @@
+"""
+dwts.estimation.EstimateStore re-estimates only what an edit touches
+
+Run with: python -m pytest tests
+"""
+
+import pandas as pd
+import pytest
+
+from dwts.data import DATA_PATH, load_dwts_data
+from dwts.estimation import EstimateStore
+
+
+SEASONS = [3, 4, 5]
+EDIT_SEASON, EDIT_WEEK = 4, 3
+
+
+@pytest.fixture(scope='module')
+def data():
+    df = load_dwts_data(DATA_PATH)
+    return df[df['season'].isin(SEASONS)].reset_index(drop=True)
+
+
+@pytest.fixture
+def store(tmp_path, data):
+    store = EstimateStore(tmp_path)
+    assert store.update(data) == {season: 1 for season in SEASONS}
+    return store
+
+
+def season_files(store):
+    return {season: store._path(season).read_bytes() for season in SEASONS}
+
+
+def test_unchanged_data_is_reused(store, data):
+    before = season_files(store)
+    assert store.update(data) == {}
+    assert season_files(store) == before
+
+
+def test_edit_re_estimates_only_its_season_from_its_week(store, data):
+    before = season_files(store)
+    old = store.load([EDIT_SEASON])
+
+    edited = data.copy()
+    column = f"week{EDIT_WEEK}_judge1_score"
+    row = edited.index[(edited['season'] == EDIT_SEASON) & (edited[column] > 1)][0]
+    edited.loc[row, column] -= 1
+    assert store.update(edited) == {EDIT_SEASON: EDIT_WEEK}
+
+    after = season_files(store)
+    for season in SEASONS:
+        if season != EDIT_SEASON:
+            assert after[season] == before[season]
+    assert after[EDIT_SEASON] != before[EDIT_SEASON]
+
+    new = store.load([EDIT_SEASON])
+    earlier = old['week'] < EDIT_WEEK
+    pd.testing.assert_frame_equal(new[earlier], old[earlier])
+    assert not new.loc[new['week'] == EDIT_WEEK, 'fan_share'].equals(
+        old.loc[old['week'] == EDIT_WEEK, 'fan_share'])
+
+    # The edit is now the stored state
+    assert store.update(edited) == {}
@@ -0,0 +1,69 @@
+"""
+dwts.evaluation folds never see the held-out seasons while training
+
+Run with: python -m pytest tests
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dwts.evaluation import (
+    FEATURE_SETS, add_celeb_appearances, build_contestant_table, build_fold, season_folds,
+)
+
+
+FEATURES = FEATURE_SETS['judge+pro+popularity']
+APPEARANCES = FEATURES.index('celeb_appearances')
+TEST_SEASONS = [5, 12]
+
+
+@pytest.fixture(scope='module')
+def table():
+    return build_contestant_table()
+
+
+def load_fold(table, tmp_path):
+    fold = np.load(build_fold(table, TEST_SEASONS, FEATURES, cache_dir=tmp_path))
+    return {name: fold[name] for name in fold.files}
+
+
+@pytest.mark.parametrize('scheme', ['loso', 'group_kfold'])
+def test_every_season_is_held_out_once(table, scheme):
+    folds = season_folds(table['season'], scheme)
+    held_out = [s for fold in folds for s in fold]
+    assert sorted(held_out) == sorted(table['season'].unique())
+
+
+def test_celeb_appearances_count_training_seasons_only():
+    rows = pd.DataFrame({
+        'celebrity_name': ['Returning Star', 'Returning Star', 'Returning Star', 'Newcomer'],
+        'season': [1, 2, 3, 3],
+    })
+    train, test = rows[rows['season'] < 3], rows[rows['season'] == 3]
+    assert add_celeb_appearances(train, train, held_out=False)['celeb_appearances'].tolist() == [2, 2]
+    # The test season counts once, as the row's own season
+    assert add_celeb_appearances(test, train, held_out=True)['celeb_appearances'].tolist() == [3, 1]
+
+
+def test_training_matrix_ignores_test_season_rows(table, tmp_path):
+    before = load_fold(table, tmp_path)
+
+    # Rewrite the held-out seasons: every test row becomes a returning
+    # training celebrity with a new pro, score and placement
+    changed = table.copy()
+    is_test = changed['season'].isin(TEST_SEASONS)
+    returning = table.loc[~is_test, 'celebrity_name'].value_counts().index[0]
+    changed.loc[is_test, 'celebrity_name'] = returning
+    changed.loc[is_test, 'ballroom_partner'] = table.loc[~is_test, 'ballroom_partner'].iat[0]
+    changed.loc[is_test, 'judge_score'] = 10.0
+    changed.loc[is_test, 'placement'] = 1
+    after = load_fold(changed, tmp_path)
+
+    for name in ('X_train', 'y_train'):
+        np.testing.assert_array_equal(after[name], before[name])
+    assert set(after['test_seasons']) == set(TEST_SEASONS)
+
+    # Test rows see the training count plus their own season, never each other
+    train_count = (table.loc[~is_test, 'celebrity_name'] == returning).sum()
+    assert (after['X_test'][:, APPEARANCES] == train_count + 1).all()
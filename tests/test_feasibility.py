@@ -0,0 +1,62 @@
+"""
+dwts.feasibility bounds contain the sequential estimates
+
+Run with: python -m pytest tests
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dwts.combine import segmented_rank
+from dwts.data import DATA_PATH, load_dwts_data
+from dwts.estimation import estimate_season
+from dwts.feasibility import TIE_MARGIN, fan_vote_bounds, percent_bounds, week_problems
+from dwts.reshape import reshape_long
+
+
+# Rank rule (1), percent rule (3, 4) and the judges' save (28)
+SEASONS = [1, 3, 4, 28]
+KEYS = ['season', 'week', 'celebrity_name']
+
+
+@pytest.fixture(scope='module')
+def bounded():
+    long = reshape_long(load_dwts_data(DATA_PATH), report=False)
+    long = long[long['season'].isin(SEASONS)]
+    problems = week_problems(long)
+    estimates = pd.concat([estimate_season([p for p in problems if p['season'] == s]) for s in SEASONS])
+    bounds = fan_vote_bounds(long)
+    out = estimates.merge(bounds, on=KEYS, suffixes=('', '_bound'), validate='one_to_one')
+    assert len(out) == len(estimates) == len(bounds)
+    out = out.sort_values(['season', 'week'], kind='stable').reset_index(drop=True)
+    offsets = np.r_[0, np.cumsum(out.groupby(['season', 'week'], sort=True).size().to_numpy())]
+    out['fan_rank'] = segmented_rank(out['fan_share'].to_numpy(), offsets)
+    return out
+
+
+def test_every_week_is_feasible(bounded):
+    assert set(bounded['status_bound']) <= {'ok', 'unconstrained'}
+    assert (bounded['status'] == bounded['status_bound']).all()
+
+
+def test_shares_lie_within_the_bounds(bounded):
+    tol = 1e-6
+    assert (bounded['fan_share'] >= bounded['fan_share_min'] - tol).all()
+    assert (bounded['fan_share'] <= bounded['fan_share_max'] + tol).all()
+    assert (bounded['fan_share_min'] <= bounded['fan_share_max']).all()
+
+
+def test_rank_weeks_fan_ranks_lie_within_the_bounds(bounded):
+    rank = bounded[bounded['rule'] == 'rank']
+    assert len(rank) > 0
+    assert rank['fan_rank'].between(rank['fan_rank_min'], rank['fan_rank_max']).all()
+
+
+def test_percent_bounds_of_a_small_week():
+    # Judge shares 0.5, 0.3, 0.2 and couple 2 went home, so it trails both:
+    # at most f2 = (1 + 0.5 - 0.2 + 0.3 - 0.2 - 2 * margin) / 3 of the votes
+    lo, hi, status = percent_bounds(np.array([50.0, 30.0, 20.0]), [(2, 0), (2, 1)])
+    assert status == 'ok'
+    np.testing.assert_allclose(lo, [0, 0, 0], atol=1e-9)
+    np.testing.assert_allclose(hi, [1, 1, (1.4 - 2 * TIE_MARGIN) / 3], atol=1e-9)
@@ -0,0 +1,135 @@
+"""
+dwts.jobs.JobQueue leases, retries and sessions on a throwaway database
+
+Run with: python -m pytest tests
+"""
+
+import multiprocessing
+import time
+
+import pytest
+
+from dwts.jobs import JobQueue
+
+
+NAMES = [f"Celebrity {i}" for i in range(40)]
+VISIBILITY = 0.05
+
+
+@pytest.fixture
+def queue(tmp_path):
+    with JobQueue(tmp_path / 'jobs.sqlite') as queue:
+        yield queue
+
+
+def expire():
+    time.sleep(2 * VISIBILITY)
+
+
+def test_enqueue_once(queue):
+    assert queue.enqueue(NAMES) == len(NAMES)
+    assert queue.enqueue(NAMES[:5] + ['Celebrity 0 ']) == 0
+    assert queue.pending() == len(NAMES)
+
+
+def test_expired_lease_is_leased_again(queue):
+    queue.enqueue(['Zendaya'])
+    first, = queue.lease('w1', visibility=VISIBILITY)
+    assert queue.lease('w2') == []          # still held by w1
+    expire()
+    second, = queue.lease('w2')
+    assert second.job_id == first.job_id
+    assert second.attempts == 2
+    assert second.token != first.token
+
+
+def test_complete_needs_the_current_lease(queue):
+    queue.enqueue(['Zendaya'])
+    first, = queue.lease('w1', visibility=VISIBILITY)
+    expire()
+    second, = queue.lease('w2')
+    assert not queue.complete(first, {'followers': 1})
+    assert not queue.extend(first)
+    assert queue.complete(second, {'followers': 2})
+    assert not queue.complete(second, {'followers': 3})
+    assert queue.results() == {'Zendaya': {'followers': 2}}
+    assert queue.pending() == 0
+
+
+def test_expired_leases_fail_after_max_attempts(tmp_path):
+    with JobQueue(tmp_path / 'jobs.sqlite', max_attempts=2) as queue:
+        queue.enqueue(['Zendaya'])
+        for attempt in (1, 2):
+            job, = queue.lease('w1', visibility=VISIBILITY)
+            assert job.attempts == attempt
+            expire()
+        assert queue.lease('w1') == []
+        assert queue.pending() == 0
+        assert queue.status()['status'].tolist() == ['failed']
+
+
+def test_fail_retries_until_max_attempts(tmp_path):
+    with JobQueue(tmp_path / 'jobs.sqlite', max_attempts=2) as queue:
+        queue.enqueue(['Zendaya'])
+        job, = queue.lease('w1')
+        assert queue.fail(job, 'timeout')
+        job, = queue.lease('w1')
+        assert job.attempts == 2
+        assert queue.fail(job, 'timeout')
+        assert queue.lease('w1') == []
+        assert queue.status()['status'].tolist() == ['failed']
+
+
+def test_release_does_not_use_an_attempt(tmp_path):
+    with JobQueue(tmp_path / 'jobs.sqlite', max_attempts=1) as queue:
+        queue.enqueue(['Zendaya'])
+        for _ in range(3):
+            job, = queue.lease('w1')
+            assert job.attempts == 1
+            assert queue.release(job)
+        assert not queue.release(job)
+        assert queue.pending() == 1
+
+
+def test_sessions_are_claimed_exclusively(queue):
+    sessions = [('account1', 'proxy1'), ('account2', 'proxy2')]
+    assert queue.claim_session('w1', sessions) == sessions[0]
+    assert queue.claim_session('w1', sessions) == sessions[0]      # re-claiming its own
+    assert queue.claim_session('w2', sessions) == sessions[1]
+    assert queue.claim_session('w3', sessions) is None
+    queue.release_session('w1')
+    assert queue.claim_session('w3', sessions) == sessions[0]
+
+
+def _work(path, worker):
+    """Lease and complete jobs until none are left"""
+    with JobQueue(path) as queue:
+        while queue.pending():
+            for job in queue.lease(worker, n=3):
+                time.sleep(0.005)
+                queue.complete(job, {'worker': worker})
+            time.sleep(0.01)
+
+
+def test_worker_processes_finish_every_job_once(tmp_path):
+    path = tmp_path / 'jobs.sqlite'
+    with JobQueue(path) as queue:
+        queue.enqueue(NAMES)
+        # A worker that leases three jobs and dies
+        lost = queue.lease('dead', n=3, visibility=0.5)
+    workers = [multiprocessing.Process(target=_work, args=(path, f"w{i}")) for i in range(4)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join(timeout=60)
+        assert w.exitcode == 0
+
+    with JobQueue(path) as queue:
+        results = queue.results()
+        status = queue.status()
+    assert sorted(results) == sorted(NAMES)
+    assert {results[job.celebrity_name]['worker'] for job in lost} <= {f"w{i}" for i in range(4)}
+    # Every job done once; only the dead worker's jobs needed a second lease
+    assert status['status'].tolist() == ['done'] * len(status)
+    assert status['attempts'].sum() == len(NAMES) + len(lost)
+    assert status['worker'].nunique() > 1
@@ -0,0 +1,75 @@
+"""
+dwts.particles resampling, elimination likelihood and SeasonFilter weeks
+
+Run with: python -m pytest tests
+"""
+
+import numpy as np
+import pytest
+
+from dwts.combine import combine
+from dwts.particles import SeasonFilter, elimination_loglik, systematic_resample
+
+
+NAMES = ['Couple A', 'Couple B', 'Couple C', 'Couple D']
+
+
+def test_systematic_resample_counts_follow_the_weights():
+    rng = np.random.default_rng(0)
+    weights = rng.random(50)
+    weights /= weights.sum()
+    for _ in range(20):
+        keep = systematic_resample(weights, rng)
+        assert len(keep) == len(weights)
+        counts = np.bincount(keep, minlength=len(weights))
+        # Systematic resampling keeps each count within one of n * w
+        assert (np.abs(counts - len(weights) * weights) < 1).all()
+
+
+def test_systematic_resample_degenerate_weights():
+    rng = np.random.default_rng(0)
+    assert systematic_resample(np.eye(1, 10, 7)[0], rng).tolist() == [7] * 10
+    np.testing.assert_array_equal(systematic_resample(np.full(10, 0.1), rng), np.arange(10))
+
+
+def week_scores(rule, fan):
+    """Combined scores of one four-couple week with equal judge totals"""
+    fan = np.asarray(fan, dtype=np.float64)
+    return combine(np.full(fan.shape[1], 24.0), fan, [0, fan.shape[1]], [rule])
+
+
+@pytest.mark.parametrize('rule', ['percent', 'rank'])
+def test_elimination_favours_the_couple_with_fewer_votes(rule):
+    # Particle 0 gives couple 0 the fewest votes, particle 1 the most
+    scores = week_scores(rule, [[0.1, 0.2, 0.3, 0.4], [0.4, 0.3, 0.2, 0.1]])
+    eliminated = np.array([True, False, False, False])
+    plain = elimination_loglik(scores, eliminated)
+    saved = elimination_loglik(scores, eliminated, bottom_two=True)
+    assert np.isfinite(plain).all() and np.isfinite(saved).all()
+    assert (plain < 0).all()
+    assert plain[0] > plain[1]
+    # Being in the bottom two is likelier than being the bottom one
+    assert (saved >= plain).all()
+    assert (saved <= 0).all()
+
+
+def test_elimination_loglik_sums_over_double_eliminations():
+    scores = week_scores('percent', [[0.1, 0.15, 0.35, 0.4]])
+    both = elimination_loglik(scores, np.array([True, True, False, False]))
+    first = elimination_loglik(scores, np.array([True, False, False, False]))
+    second = elimination_loglik(scores, np.array([False, True, False, False]))
+    np.testing.assert_allclose(both, first + second)
+
+
+def test_filter_weeks_must_move_forward():
+    filt = SeasonFilter(NAMES, season=5, n_particles=1000)
+    judge = dict(zip(NAMES, [24, 21, 18, 27]))
+    filt.update(1, judge, eliminated=['Couple C'])
+    del judge['Couple C']
+    with pytest.raises(ValueError):
+        filt.update(1, judge)
+    rows = filt.update(3, judge, eliminated=['Couple B'])
+    assert {row['week'] for row in rows} == {3}
+    assert filt.week == 3
+    np.testing.assert_allclose(filt.weights().sum(), 1)
+    assert 0 < filt.ess() <= filt.n_particles